@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+import secrets
 
 from app.models.user import User
-from app.models.question import Question
 from app.schemas.code import (
     CodeSubmissionRequest,
     CodeSubmissionResponse,
     SubmissionHistory
 )
 from app.models.code_submission import CodeSubmission
-from app.services.code_service import CodeExecutionService
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from app.services.code_service import SUBMISSION_ORDER, CodeExecutionService
+from app.services.judge_queue import judge_queue
+from app.services.question_cache import question_cache
+from app.services.judge_events import progress_stream
+from app.services.judge0_callbacks import judge0_callbacks, callbacks_enabled, decode_callback_payload
+from app.core.config import settings
 from app.middleware.mock_auth import mock_auth_service as dev_auth_service
 from beanie import PydanticObjectId
 
@@ -22,13 +29,12 @@ from app.schemas.code import CodeSubmissionRequest  # Add this import at the top
 @router.post("/submit", response_model=CodeSubmissionResponse)
 async def submit_code(
     submission: CodeSubmissionRequest,  # Use the request schema
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(dev_auth_service.get_current_user)
 ):
     """Submit code for execution"""
     try:
         # Validate question exists
-        question = await Question.get(PydanticObjectId(submission.question_id))
+        question = await question_cache.get(PydanticObjectId(submission.question_id))
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
 
@@ -37,13 +43,15 @@ async def submit_code(
             user_id=str(current_user.id),
             question_id=submission.question_id,
             language=submission.language,
-            code=submission.code
+            code=submission.code,
+            samples_only=submission.samples_only
         )
         
-        # Execute code in background
-        background_tasks.add_task(
-            code_service.execute_submission,
-            submission_id=submission_id
+        # Hand the submission to the judge workers
+        await judge_queue.enqueue(
+            submission_id,
+            user_id=str(current_user.id),
+            priority_class="interactive" if submission.samples_only else "submit"
         )
         
         return {
@@ -78,6 +86,12 @@ async def get_submission_status(
     
     # Handle both DBRef and ObjectId cases for question field
     question_id = str(result.question.id if hasattr(result.question, 'id') else result.question)
+
+    message = f"Submission status: {result.status}"
+    if result.stopped_after:
+        message += f", stopped after test {result.stopped_after}"
+    if result.compile_error:
+        message += ", compilation error"
     
     return {
         "submission_id": str(result.id),
@@ -86,28 +100,55 @@ async def get_submission_status(
         "language": result.language,
         "code": result.code,
         "status": result.status,
-        "message": f"Submission status: {result.status}",
+        "message": message,
         "results": result.results or [],
         "total_passed": result.total_passed,
         "total_tests": result.total_tests,
         "execution_time": result.execution_time,
         "memory_used": result.memory_used,
+        "stopped_after": result.stopped_after,
+        "compile_error": result.compile_error,
         "error": result.status == "error",
         "success": result.status == "completed",
         "submitted_at": result.submitted_at
     }
 
-@router.get("/history", response_model=List[SubmissionHistory])
-async def get_submission_history(
-    question_id: str = None,
+@router.get("/stream/{submission_id}")
+async def stream_submission(
+    submission_id: str,
     current_user: User = Depends(dev_auth_service.get_current_user)
 ):
-    """Get submission history for the current user"""
-    submissions = await code_service.get_user_submissions(
-        user_id=str(current_user.id),
-        question_id=question_id
+    """Stream judging progress as Server-Sent Events: ``status`` on each
+    status change, ``result`` per finished test case, then one ``verdict``"""
+    result = await CodeSubmission.get(PydanticObjectId(submission_id))
+    if not result:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    user_id = str(result.user.id if hasattr(result.user, 'id') else result.user)
+    if user_id != str(current_user.id) and current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return StreamingResponse(
+        progress_stream(submission_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    
+
+def submission_page_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """Keyset of the previous page's last submission, from a cursor"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, SUBMISSION_ORDER)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def submission_history(submissions: List[CodeSubmission], limit: int, response: Response) -> List[Dict[str, Any]]:
+    """Submissions in the SubmissionHistory shape, with the next page's cursor in a header"""
+    cursor = next_cursor(submissions, limit, SUBMISSION_ORDER)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
     # Format submissions to match SubmissionHistory schema
     return [{
         "_id": str(sub.id),
@@ -120,25 +161,90 @@ async def get_submission_history(
         "submitted_at": sub.submitted_at
     } for sub in submissions]
 
+@router.get("/history", response_model=List[SubmissionHistory])
+async def get_submission_history(
+    response: Response,
+    question_id: str = None,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Next page, from the {NEXT_CURSOR_HEADER} header"),
+    current_user: User = Depends(dev_auth_service.get_current_user)
+):
+    """Get submission history for the current user, newest first"""
+    submissions = await code_service.get_user_submissions(
+        user_id=str(current_user.id),
+        question_id=question_id,
+        limit=limit,
+        after=submission_page_cursor(cursor)
+    )
+    return submission_history(submissions, limit, response)
+
 @router.get("/submissions/{question_id}", response_model=List[SubmissionHistory])
 async def get_question_submissions(
     question_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Next page, from the {NEXT_CURSOR_HEADER} header"),
     current_user: User = Depends(dev_auth_service.get_current_user)
 ):
-    """Get all submissions for a specific question (admin only)"""
+    """Get all submissions for a specific question, newest first (admin only)"""
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    submissions = await code_service.get_question_submissions(question_id)
-    
-    # Format submissions to match SubmissionHistory schema
-    return [{
-        "_id": str(sub.id),
-        "user": str(sub.user.id if hasattr(sub.user, 'id') else sub.user),
-        "question_id": str(sub.question.id if hasattr(sub.question, 'id') else sub.question),
-        "language": sub.language,
-        "code": sub.code,
-        "status": sub.status,
-        "results": sub.results or [],
-        "submitted_at": sub.submitted_at
-    } for sub in submissions]
+    submissions = await code_service.get_question_submissions(
+        question_id,
+        limit=limit,
+        after=submission_page_cursor(cursor)
+    )
+    return submission_history(submissions, limit, response)
+
+@router.post("/rejudge/{submission_id}")
+async def rejudge_submission(
+    submission_id: str,
+    current_user: User = Depends(dev_auth_service.get_current_user)
+):
+    """Judge a submission again, behind learners' runs and submits (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    submission = await CodeSubmission.get(PydanticObjectId(submission_id))
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    reset = await CodeSubmission.get_motor_collection().update_one(
+        {"_id": submission.id, "status": {"$in": ["completed", "error"]}},
+        {"$set": {"status": "pending", "results": []}}
+    )
+    if not reset.matched_count:
+        raise HTTPException(status_code=409, detail="Submission is still being judged")
+    user_id = str(submission.user.id if hasattr(submission.user, 'id') else submission.user)
+    await judge_queue.enqueue(submission_id, user_id=user_id, priority_class="rejudge")
+    return {"message": "Submission queued for rejudging"}
+
+@router.get("/queue/stats")
+async def get_queue_stats(
+    minutes: int = 15,
+    current_user: User = Depends(dev_auth_service.get_current_user)
+):
+    """Queue depth and queue-wait percentiles per priority class (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    since = datetime.utcnow() - timedelta(minutes=minutes)
+    return {
+        "window_minutes": minutes,
+        "classes": await judge_queue.stats(since)
+    }
+
+@router.put("/judge0/callback", include_in_schema=False)
+async def judge0_callback(payload: Dict[str, Any], secret: str = ""):
+    """Receive a finished submission from Judge0 (internal)"""
+    if not callbacks_enabled():
+        raise HTTPException(status_code=404, detail="Not found")
+    if not secrets.compare_digest(secret, settings.JUDGE0_CALLBACK_SECRET):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if "token" not in payload:
+        raise HTTPException(status_code=400, detail="Missing token")
+
+    # Waiters in other processes get their result from the polling fallback
+    judge0_callbacks.resolve(payload["token"], decode_callback_payload(payload))
+    return {"message": "Callback received"}
@@ -1,17 +1,51 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from beanie import PydanticObjectId
+from bson import ObjectId
+from pymongo import ASCENDING
 import logging
 
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_filter, next_cursor
 from app.models.user import User
 from app.models.question import Question
-from app.schemas.question import QuestionCreate, QuestionUpdate
+from app.schemas.question import QuestionCreate, QuestionFacets, QuestionSearchHit, QuestionSummary, QuestionUpdate
+from app.services.blob_store import externalize_test_case
+from app.services.question_cache import question_cache
+from app.services.question_counters import question_counters
+from app.services.question_facets import question_facets
+from app.services.question_search import question_search
 from app.middleware.mock_auth import mock_auth_service as auth_service
 
 router = APIRouter()
 auth_service = auth_service
 logger = logging.getLogger(__name__)
 
+# Question pages are in _id order, which the listing indexes end in
+QUESTION_ORDER = [("_id", ASCENDING)]
+
+# Sparse fieldset, e.g. ?fields=title,level,topics
+FIELDS_QUERY = Query(None, description="Comma-separated question fields to return (sparse fieldset)")
+
+def fields_projection(fields: str) -> Dict[str, int]:
+    """MongoDB projection for a ``fields`` parameter; the id is always included"""
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in Question.__fields__]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    projection = {Question.__fields__[name].alias: 1 for name in names}
+    projection["_id"] = 1
+    return projection
+
+def sparse_response(content: Any, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    """Projected raw documents as JSON, bypassing the full response model"""
+    return JSONResponse(jsonable_encoder(content, custom_encoder={ObjectId: str}), headers=headers)
+
+def next_page_headers(questions: List[Any], limit: int) -> Dict[str, str]:
+    cursor = next_cursor(questions, limit, QUESTION_ORDER)
+    return {NEXT_CURSOR_HEADER: cursor} if cursor else {}
+
 @router.post("", response_model=Question)
 async def create_question(
     question: QuestionCreate,
@@ -29,6 +63,9 @@ async def create_question(
     if existing:
         raise HTTPException(status_code=400, detail="Question with this title already exists")
     
+    # Large inputs and outputs go to the test data store, keeping the document small
+    question.test_cases = [await externalize_test_case(tc) for tc in question.test_cases]
+
     db_question = Question(
         **question.dict(),
         title_slug=title_slug,
@@ -37,17 +74,26 @@ async def create_question(
         dislikes=0
     )
     await db_question.insert()
+    question_cache.invalidate(slug=title_slug)
+    question_search.upsert(db_question)
+    question_facets.invalidate()
     return db_question
 
-@router.get("", response_model=List[Question])
+@router.get("", response_model=List[QuestionSummary])
 async def list_questions(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Offset paging, kept for compatibility; prefer cursor"),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Next page, from the {NEXT_CURSOR_HEADER} header"),
     difficulty: Optional[str] = Query(None, pattern="^(easy|medium|hard)$"),
     topics: Optional[List[str]] = Query(None),
-    companies: Optional[List[str]] = Query(None)
+    companies: Optional[List[str]] = Query(None),
+    fields: Optional[str] = FIELDS_QUERY
 ):
-    """List questions with filters"""
+    """List question summaries with filters, or just ``fields`` of each question.
+
+    Full pages carry the cursor of the next page in the X-Next-Cursor header.
+    """
     try:
         logger.info(f"Listing questions with filters: difficulty={difficulty}, topics={topics}, companies={companies}")
         query = {}
@@ -58,21 +104,82 @@ async def list_questions(
             query["topics"] = {"$all": topics}
         if companies:
             query["companies"] = {"$all": companies}
+        if cursor:
+            try:
+                query.update(keyset_filter(QUESTION_ORDER, decode_cursor(cursor, QUESTION_ORDER)))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            skip = 0
             
         logger.info(f"MongoDB query: {query}")
-        questions = await Question.find(query).skip(skip).limit(limit).to_list()
+        if fields:
+            documents = await Question.get_motor_collection().find(
+                query, fields_projection(fields)
+            ).sort(QUESTION_ORDER).skip(skip).limit(limit).to_list(None)
+            logger.info(f"Found {len(documents)} questions")
+            return sparse_response(documents, next_page_headers(documents, limit))
+
+        # Only the summary fields leave the database
+        questions = await Question.find(
+            query, projection_model=QuestionSummary
+        ).sort(QUESTION_ORDER).skip(skip).limit(limit).to_list()
         logger.info(f"Found {len(questions)} questions")
+        response.headers.update(next_page_headers(questions, limit))
         return questions
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         logger.error(f"Error listing questions: {str(e)}\nTraceback: {error_details}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.get("/search", response_model=List[QuestionSearchHit])
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Search question titles, content, topics and companies, best matches first.
+
+    Words match as prefixes too; matches are highlighted with <mark>.
+    """
+    await question_search.ensure_current()
+    return question_search.search(q, limit)
+
+@router.get("/facets", response_model=QuestionFacets)
+async def get_question_facets(
+    difficulty: Optional[str] = Query(None, pattern="^(easy|medium|hard)$"),
+    topics: Optional[List[str]] = Query(None),
+    companies: Optional[List[str]] = Query(None)
+):
+    """Question counts per level, topic and company under the list filters.
+
+    Level counts ignore the difficulty filter, so every level can be offered.
+    """
+    return await question_facets.counts(difficulty, topics, companies)
+
+@router.get("/cache/stats")
+async def get_question_cache_stats(
+    current_user: User = Depends(auth_service.get_current_user)
+):
+    """Question cache size and hit/miss counters of this process (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return question_cache.stats()
+
 @router.get("/by-slug/{slug}", response_model=Question)
-async def get_question_by_slug(slug: str = Path(..., title="Question slug")):
+async def get_question_by_slug(
+    slug: str = Path(..., title="Question slug"),
+    fields: Optional[str] = FIELDS_QUERY
+):
     """Get a question by slug"""
-    question = await Question.find_one({"title_slug": slug})
+    if fields:
+        document = await Question.get_motor_collection().find_one({"title_slug": slug}, fields_projection(fields))
+        if not document:
+            raise HTTPException(status_code=404, detail="Question not found")
+        return sparse_response(document)
+
+    question = await question_cache.get_by_slug(slug)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     return question
@@ -83,13 +190,8 @@ async def like_question(
     current_user: User = Depends(auth_service.get_current_user)
 ):
     """Like a question"""
-    question = await Question.get(id)
-    if not question:
+    if not await question_counters.increment(str(id), "likes"):
         raise HTTPException(status_code=404, detail="Question not found")
-        
-    # Update likes count
-    question.likes += 1
-    await question.save()
     
     return {"message": "Question liked successfully"}
 
@@ -99,21 +201,25 @@ async def dislike_question(
     current_user: User = Depends(auth_service.get_current_user)
 ):
     """Dislike a question"""
-    question = await Question.get(id)
-    if not question:
+    if not await question_counters.increment(str(id), "dislikes"):
         raise HTTPException(status_code=404, detail="Question not found")
-        
-    # Update dislikes count
-    question.dislikes += 1
-    await question.save()
     
     return {"message": "Question disliked successfully"}
 
 @router.get("/{question_id}", response_model=Question)
-async def get_question(question_id: str):
+async def get_question(question_id: str, fields: Optional[str] = FIELDS_QUERY):
     """Get a specific question by ID"""
+    projection = fields_projection(fields) if fields else None
     try:
-        question = await Question.get(PydanticObjectId(question_id))
+        if projection:
+            document = await Question.get_motor_collection().find_one(
+                {"_id": PydanticObjectId(question_id)}, projection
+            )
+            if not document:
+                raise HTTPException(status_code=404, detail="Question not found")
+            return sparse_response(document)
+
+        question = await question_cache.get(PydanticObjectId(question_id))
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
         return question
@@ -134,7 +240,12 @@ async def update_question(
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
+    if "test_cases" in question_update.__fields_set__:
+        question_update.test_cases = [await externalize_test_case(tc) for tc in question_update.test_cases]
     await question.update({"$set": question_update.dict(exclude_unset=True)})
+    question_cache.invalidate(question.id, question.title_slug)
+    question_search.upsert(question)
+    question_facets.invalidate()
     return question
 
 @router.delete("/{question_id}")
@@ -151,4 +262,7 @@ async def delete_question(
         raise HTTPException(status_code=404, detail="Question not found")
     
     await question.delete()
+    question_cache.invalidate(question.id, question.title_slug)
+    question_search.remove(question.id)
+    question_facets.invalidate()
     return {"message": "Question deleted successfully"}
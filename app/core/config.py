@@ -2,6 +2,7 @@ from typing import List
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
+import tempfile
 
 load_dotenv()
 
@@ -35,5 +36,57 @@ class Settings(BaseModel):
     
     # Judge0 settings
     JUDGE0_API_KEY: str = os.getenv("JUDGE0_API_KEY", "771827a322msh39a37aa37d0d1c3p17e72cjsnb2b513e2b510")
+    JUDGE0_API_URL: str = os.getenv("JUDGE0_API_URL", "https://judge0-ce.p.rapidapi.com")
+    JUDGE0_API_HOST: str = os.getenv("JUDGE0_API_HOST", "judge0-ce.p.rapidapi.com")
+    JUDGE0_TIMEOUT_SECONDS: float = float(os.getenv("JUDGE0_TIMEOUT_SECONDS") or 10)
+    JUDGE0_MAX_CONNECTIONS: int = int(os.getenv("JUDGE0_MAX_CONNECTIONS") or 100)
+    JUDGE0_POLL_INTERVAL_SECONDS: float = float(os.getenv("JUDGE0_POLL_INTERVAL_SECONDS") or 0.5)
+    JUDGE0_MAX_POLL_ATTEMPTS: int = int(os.getenv("JUDGE0_MAX_POLL_ATTEMPTS") or 60)
+    JUDGE0_BATCH_SIZE: int = int(os.getenv("JUDGE0_BATCH_SIZE") or 20)  # Judge0 default max
+    # Public URL of PUT /api/v1/code/judge0/callback; callbacks stay off unless it and the secret are set
+    JUDGE0_CALLBACK_URL: str = os.getenv("JUDGE0_CALLBACK_URL", "")
+    JUDGE0_CALLBACK_SECRET: str = os.getenv("JUDGE0_CALLBACK_SECRET", "")
+    JUDGE0_CALLBACK_TIMEOUT_SECONDS: float = float(os.getenv("JUDGE0_CALLBACK_TIMEOUT_SECONDS") or 30)
+    JUDGE0_CENTRAL_POLLER: bool = os.getenv("JUDGE0_CENTRAL_POLLER", "True").lower() == "true"
+    JUDGE0_POLLER_MIN_INTERVAL_SECONDS: float = float(os.getenv("JUDGE0_POLLER_MIN_INTERVAL_SECONDS") or 0.25)
+    JUDGE0_POLLER_MAX_INTERVAL_SECONDS: float = float(os.getenv("JUDGE0_POLLER_MAX_INTERVAL_SECONDS") or 4)
+    JUDGE0_POLLER_BACKOFF: float = float(os.getenv("JUDGE0_POLLER_BACKOFF") or 1.5)
+    EXECUTION_BACKEND: str = os.getenv("EXECUTION_BACKEND", "judge0")  # judge0, local
+    LOCAL_EXECUTION_MAX_PARALLEL: int = int(os.getenv("LOCAL_EXECUTION_MAX_PARALLEL") or 0)  # 0 = CPU count
+    LOCAL_EXECUTION_OUTPUT_LIMIT: int = int(os.getenv("LOCAL_EXECUTION_OUTPUT_LIMIT") or 1024 * 1024)  # bytes
+    LOCAL_WORKER_POOL_SIZE: int = int(os.getenv("LOCAL_WORKER_POOL_SIZE") or 2)  # 0 disables warm workers
+    LOCAL_WORKER_MAX_JOBS: int = int(os.getenv("LOCAL_WORKER_MAX_JOBS") or 100)
+    COMPILE_CACHE_DIR: str = os.getenv("COMPILE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "algotutor-builds")
+    COMPILE_CACHE_MAX_BYTES: int = int(os.getenv("COMPILE_CACHE_MAX_BYTES") or 512 * 1024 * 1024)
+    CHECKER_OFFLOAD_BYTES: int = int(os.getenv("CHECKER_OFFLOAD_BYTES") or 256 * 1024)  # Larger outputs are checked in a process pool
+    CHECKER_PROCESSES: int = int(os.getenv("CHECKER_PROCESSES") or 2)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "True").lower() == "true"
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES") or 10000)  # In-memory tier
+    RESULT_CACHE_TTL_SECONDS: int = int(os.getenv("RESULT_CACHE_TTL_SECONDS") or 7 * 24 * 3600)
+    QUESTION_CACHE_MAX_ENTRIES: int = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES") or 1000)
+    QUESTION_CACHE_TTL_SECONDS: float = float(os.getenv("QUESTION_CACHE_TTL_SECONDS") or 60)  # Bounds staleness across processes
+    QUESTION_SEARCH_REFRESH_SECONDS: float = float(os.getenv("QUESTION_SEARCH_REFRESH_SECONDS") or 300)  # Full rebuilds pick up other processes' writes
+    QUESTION_FACETS_TTL_SECONDS: float = float(os.getenv("QUESTION_FACETS_TTL_SECONDS") or 60)
+    QUESTION_COUNTERS_WRITE_BEHIND: bool = os.getenv("QUESTION_COUNTERS_WRITE_BEHIND", "False").lower() == "true"  # Buffer like/dislike increments
+    QUESTION_COUNTERS_FLUSH_SECONDS: float = float(os.getenv("QUESTION_COUNTERS_FLUSH_SECONDS") or 0.25)
+    RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS") or 200000)  # Least recently seen are dropped beyond this
+    RATE_LIMIT_STORE: str = os.getenv("RATE_LIMIT_STORE", "memory")  # memory (per process), mongodb (shared)
+    RATE_LIMIT_LEASE_SIZE: int = int(os.getenv("RATE_LIMIT_LEASE_SIZE") or 10)  # Requests taken from the shared store at a time
+    TEST_DATA_STORE: str = os.getenv("TEST_DATA_STORE", "gridfs")  # gridfs, local
+    TEST_DATA_DIR: str = os.getenv("TEST_DATA_DIR") or os.path.join(tempfile.gettempdir(), "algotutor-test-data")
+    TEST_DATA_INLINE_MAX_BYTES: int = int(os.getenv("TEST_DATA_INLINE_MAX_BYTES") or 4096)  # Larger payloads go to the store
+    TEST_DATA_CACHE_BYTES: int = int(os.getenv("TEST_DATA_CACHE_BYTES") or 64 * 1024 * 1024)  # Per-process cache of fetched payloads
+    JUDGE_EXECUTION_MODE: str = os.getenv("JUDGE_EXECUTION_MODE", "batch")  # batch, concurrent, sequential
+    JUDGE_MAX_CONCURRENCY: int = int(os.getenv("JUDGE_MAX_CONCURRENCY") or 32)
+    JUDGE_MAX_CONCURRENCY_PER_SUBMISSION: int = int(os.getenv("JUDGE_MAX_CONCURRENCY_PER_SUBMISSION") or 4)
+    JUDGE_FAIL_FAST: bool = os.getenv("JUDGE_FAIL_FAST", "False").lower() == "true"
+    JUDGE_EMBEDDED_WORKER: bool = os.getenv("JUDGE_EMBEDDED_WORKER", "True").lower() == "true"  # Judge inside the API process
+    JUDGE_WORKER_CONCURRENCY: int = int(os.getenv("JUDGE_WORKER_CONCURRENCY") or 4)  # Submissions per worker
+    JUDGE_QUEUE_POLL_SECONDS: float = float(os.getenv("JUDGE_QUEUE_POLL_SECONDS") or 1)
+    JUDGE_QUEUE_LEASE_SECONDS: float = float(os.getenv("JUDGE_QUEUE_LEASE_SECONDS") or 60)
+    JUDGE_QUEUE_HEARTBEAT_SECONDS: float = float(os.getenv("JUDGE_QUEUE_HEARTBEAT_SECONDS") or 15)
+    JUDGE_QUEUE_MAX_ATTEMPTS: int = int(os.getenv("JUDGE_QUEUE_MAX_ATTEMPTS") or 3)
+    JUDGE_STREAM_POLL_SECONDS: float = float(os.getenv("JUDGE_STREAM_POLL_SECONDS") or 2)  # Progress stream DB re-reads
+    JUDGE_QUEUE_RETRY_DELAY_SECONDS: float = float(os.getenv("JUDGE_QUEUE_RETRY_DELAY_SECONDS") or 5)
 
 settings = Settings()
@@ -3,10 +3,14 @@ from beanie import init_beanie
 import logging
 
 from app.core.config import settings
+from app.core.indexes import start_index_reconciliation
 from app.models.user import User
 from app.models.question import Question
 from app.models.code_submission import CodeSubmission
 from app.models.test_result import TestResult
+from app.models.cached_result import CachedResult
+from app.models.judge_job import JudgeJob
+from app.models.rate_limit_bucket import RateLimitBucket
 
 logger = logging.getLogger(__name__)
 
@@ -22,16 +26,23 @@ async def init_db():
         
         # Initialize beanie with the MongoDB client and document models
         logger.info(f"Initializing Beanie with database: {settings.DATABASE_NAME}")
+        document_models = [
+            User,
+            Question,
+            CodeSubmission,
+            TestResult,
+            CachedResult,
+            JudgeJob,
+            RateLimitBucket,
+        ]
         await init_beanie(
             database=client[settings.DATABASE_NAME],
-            document_models=[
-                User,
-                Question,
-                CodeSubmission,
-                TestResult,
-            ]
+            document_models=document_models
         )
         logger.info("Successfully initialized Beanie")
+
+        # Build missing indexes and report drift while the app starts serving
+        start_index_reconciliation(document_models)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+# Options that make two indexes on the same keys different indexes
+INDEX_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+_reconcile_task: Optional[asyncio.Task] = None
+
+
+def _as_index_model(index: Any) -> IndexModel:
+    """Normalize the index forms Beanie accepts in ``Settings.indexes``"""
+    if isinstance(index, IndexModel):
+        return index
+    if isinstance(index, str):
+        return IndexModel([(index, ASCENDING)])
+    return IndexModel(index)
+
+
+def declared_indexes(model: Type[Document]) -> List[IndexModel]:
+    """Every index a model declares: ``Indexed`` fields, ``Settings.indexes``
+    and ``Settings.background_indexes``"""
+    indexes = [
+        IndexModel([(field.alias, field.type_._indexed[0])], **field.type_._indexed[1])
+        for field in model.__fields__.values()
+        if getattr(field.type_, "_indexed", None)
+    ]
+    model_settings = getattr(model, "Settings", None)
+    indexes += [_as_index_model(index) for index in getattr(model_settings, "indexes", None) or []]
+    indexes += getattr(model_settings, "background_indexes", None) or []
+    return indexes
+
+
+def _index_key(spec: Dict[str, Any]) -> Tuple:
+    return tuple((field, direction) for field, direction in dict(spec["key"]).items())
+
+
+def _index_options(spec: Dict[str, Any]) -> Dict[str, Any]:
+    return {option: spec[option] for option in INDEX_OPTIONS if spec.get(option) not in (None, False)}
+
+
+def index_drift(declared: List[IndexModel], existing: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """How a collection's indexes (``index_information()``) differ from the declared ones.
+
+    ``missing`` are declared but absent, ``changed`` exist on the same keys
+    with other options, and ``extra`` exist without being declared.
+    """
+    existing_by_key = {
+        _index_key(spec): (name, spec)
+        for name, spec in existing.items()
+        if name != "_id_"
+    }
+    drift = {"missing": [], "changed": [], "extra": []}
+    for index in declared:
+        spec = index.document
+        found = existing_by_key.pop(_index_key(spec), None)
+        if found is None:
+            drift["missing"].append(spec["name"])
+        elif _index_options(found[1]) != _index_options(spec):
+            drift["changed"].append(found[0])
+    drift["extra"] = [name for name, _ in existing_by_key.values()]
+    return drift
+
+
+async def reconcile_indexes(models: List[Type[Document]]) -> Dict[str, Dict[str, List[str]]]:
+    """Create missing declared indexes and log any other drift, per collection.
+
+    Changed and extra indexes are only reported: fixing them means
+    dropping an index, which is left to a deliberate migration.
+    """
+    report = {}
+    for model in models:
+        collection = model.get_motor_collection()
+        declared = declared_indexes(model)
+        drift = index_drift(declared, await collection.index_information())
+        report[collection.name] = drift
+
+        missing = [index for index in declared if index.document["name"] in drift["missing"]]
+        if missing:
+            logger.info(f"Creating indexes on {collection.name}: {', '.join(drift['missing'])}")
+            try:
+                await collection.create_indexes(missing)
+            except Exception as e:
+                logger.error(f"Failed to create indexes on {collection.name}: {str(e)}")
+        if drift["changed"]:
+            logger.warning(f"Indexes on {collection.name} differ from their declaration: {', '.join(drift['changed'])}")
+        if drift["extra"]:
+            logger.warning(f"Undeclared indexes on {collection.name}: {', '.join(drift['extra'])}")
+    return report
+
+
+def start_index_reconciliation(models: List[Type[Document]]) -> asyncio.Task:
+    """Reconcile indexes without holding up startup"""
+    global _reconcile_task
+    _reconcile_task = asyncio.create_task(reconcile_indexes(models))
+    return _reconcile_task
@@ -0,0 +1,51 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import json_util
+from pymongo import ASCENDING
+
+# Clients read the cursor of the next page from this response header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+Sort = Sequence[Tuple[str, int]]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor holding the sort key values of the last item of a page"""
+    return base64.urlsafe_b64encode(json_util.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Sort) -> List[Any]:
+    """Sort key values from a cursor; ValueError if it is not one of ours for ``sort``"""
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_filter(sort: Sort, values: Sequence[Any]) -> Dict[str, Any]:
+    """Query for the items after ``values`` in ``sort`` order.
+
+    ``sort`` must end in a unique field (``_id``) so every item has exactly
+    one position; pages then stay stable under concurrent inserts and cost
+    one index seek however deep they are.
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {earlier: value for (earlier, _), value in zip(sort[:i], values)}
+        clause[field] = {"$gt" if direction == ASCENDING else "$lt": values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def next_cursor(items: Sequence[Any], limit: int, sort: Sort) -> Optional[str]:
+    """Cursor after the last of ``items``, or None if the page was not full"""
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    get = last.get if isinstance(last, dict) else lambda field: getattr(last, "id" if field == "_id" else field)
+    return encode_cursor([get(field) for field, _ in sort])
@@ -6,6 +6,12 @@ from app.core.config import settings
 from app.middleware.logging import RequestLoggingMiddleware
 from app.middleware.rate_limit import RateLimiter
 from app.core.database import init_db
+from app.services.judge0_client import judge0_client
+from app.services.execution import get_execution_backend
+from app.services.judge_worker import JudgeWorker
+from app.services.execution.checker import shutdown_checker_pool
+from app.services.question_counters import question_counters
+import asyncio
 import logging
 
 # Create FastAPI app
@@ -53,6 +59,47 @@ async def start_database():
         # Don't raise the error - let the app start anyway
         # Cloud Run will restart if the health check fails
 
+@app.on_event("startup")
+async def start_judge0_client():
+    await judge0_client.start()
+
+@app.on_event("startup")
+async def start_execution_backend():
+    await get_execution_backend().start()
+
+@app.on_event("startup")
+async def start_embedded_worker():
+    # Judge in this process unless dedicated workers (python -m app.worker) run
+    if settings.JUDGE_EMBEDDED_WORKER:
+        app.state.judge_worker = JudgeWorker()
+        app.state.judge_worker_task = asyncio.create_task(app.state.judge_worker.run())
+
+@app.on_event("startup")
+async def start_question_counters():
+    question_counters.start()
+
+@app.on_event("shutdown")
+async def flush_question_counters():
+    await question_counters.stop()
+
+@app.on_event("shutdown")
+async def stop_embedded_worker():
+    if getattr(app.state, "judge_worker", None) is not None:
+        await app.state.judge_worker.stop()
+        await app.state.judge_worker_task
+
+@app.on_event("shutdown")
+async def close_execution_backend():
+    await get_execution_backend().close()
+
+@app.on_event("shutdown")
+async def close_judge0_client():
+    await judge0_client.close()
+
+@app.on_event("shutdown")
+async def close_checker_pool():
+    shutdown_checker_pool()
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
@@ -1,22 +1,109 @@
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+from datetime import datetime
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+import math
 import time
 import logging
 
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.middleware.rate_limit_store import SharedRateLimiter
+
+UNLIMITED_PATHS = {"/health", f"{settings.API_V1_STR}/code/judge0/callback"}
+
+class ClientWindow:
+    """Request counts of one client in the current and the previous fixed window"""
+    __slots__ = ("window", "previous", "current")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.previous = 0
+        self.current = 0
+
+    def roll(self, window: int):
+        """Move on to ``window``; after a gap of a whole window nothing carries over"""
+        self.previous = self.current if self.window == window - 1 else 0
+        self.current = 0
+        self.window = window
+
+def evict_idle(records: "OrderedDict[str, Any]", window: int, max_clients: int):
+    """Drop least-recently-seen records that are idle for over a window, or
+    beyond ``max_clients``. Each record is evicted at most once, so this is
+    O(1) amortized."""
+    while records:
+        oldest = next(iter(records.values()))
+        if oldest.window >= window - 1 and len(records) <= max_clients:
+            break
+        records.popitem(last=False)
+
+class SlidingWindowCounter:
+    """Sliding-window-counter rate limiting in constant time and bounded memory.
+
+    A client's rate over the last ``window_seconds`` is estimated from two
+    counts: the previous fixed window's, weighted by how much of it the
+    sliding window still covers, plus the current window's. Each request
+    does constant work on a fixed-size record.
+
+    Records are kept in least-recently-seen order. Clients idle for more
+    than a window are dropped as they reach the front. Past
+    ``max_clients`` the least recently seen are dropped, which resets
+    their counts.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, max_clients: Optional[int] = None):
+        self.window_seconds = window_seconds
+        self.max_clients = max_clients or settings.RATE_LIMIT_MAX_CLIENTS
+        self.clients: "OrderedDict[str, ClientWindow]" = OrderedDict()
+
+    def acquire(self, client_id: str, now: float, limit: int) -> Tuple[bool, float]:
+        """Count a request if the client is under ``limit``.
+
+        Returns whether it was allowed and the estimated requests in the
+        window before it.
+        """
+        window = int(now // self.window_seconds)
+        record = self.clients.get(client_id)
+        if record is None:
+            record = self.clients[client_id] = ClientWindow(window)
+        else:
+            self.clients.move_to_end(client_id)
+            if record.window != window:
+                record.roll(window)
+
+        elapsed = now / self.window_seconds - window
+        estimate = record.previous * (1 - elapsed) + record.current
+        allowed = estimate < limit
+        if allowed:
+            record.current += 1
+        evict_idle(self.clients, window, self.max_clients)
+        return allowed, estimate
+
+    def reset_at(self, now: float) -> float:
+        """When the current fixed window ends"""
+        return (int(now // self.window_seconds) + 1) * self.window_seconds
+
 class RateLimiter(BaseHTTPMiddleware):
     def __init__(
         self,
         app,
         requests_per_minute: int = 60,
-        burst_limit: int = 100
+        burst_limit: int = 100,
+        max_clients: Optional[int] = None,
+        shared: Optional["SharedRateLimiter"] = None
     ):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
         self.burst_limit = burst_limit
-        self.clients: Dict[str, list] = {}
+        self.counter = SlidingWindowCounter(60.0, max_clients)
+        if shared is None:
+            from app.middleware.rate_limit_store import get_shared_rate_limiter
+            shared = get_shared_rate_limiter(60.0)
+        # Counts shared across processes when configured, else per process
+        self.shared = shared
 
     def _get_client_identifier(self, request: Request) -> str:
         # Use forwarded IP if behind proxy, else remote address
@@ -25,87 +112,75 @@ class RateLimiter(BaseHTTPMiddleware):
             return forwarded.split(",")[0].strip()
         return request.client.host if request.client else "unknown"
 
-    def _cleanup_old_requests(self, client_id: str):
-        """Remove requests older than 1 minute"""
-        if client_id in self.clients:
-            current_time = time.time()
-            self.clients[client_id] = [
-                req_time for req_time in self.clients[client_id]
-                if current_time - req_time < 60
-            ]
-
     async def dispatch(self, request: Request, call_next):
         client_id = None
         current_time = None
-        
+        remaining = self.requests_per_minute
+
         try:
-            # Skip rate limiting for health check and OPTIONS requests
-            if request.url.path == "/health" or request.method == "OPTIONS":
+            # Skip rate limiting for health checks, Judge0 callbacks (all from
+            # one IP) and OPTIONS requests
+            if request.url.path in UNLIMITED_PATHS or request.method == "OPTIONS":
                 return await call_next(request)
 
             client_id = self._get_client_identifier(request)
             current_time = time.time()
 
-            # Initialize client's request history if needed
-            if client_id not in self.clients:
-                self.clients[client_id] = []
-
-            # Clean up old requests
-            self._cleanup_old_requests(client_id)
+            limit = min(self.requests_per_minute, self.burst_limit)
+            if self.shared is not None:
+                allowed, requests_last_minute = await self.shared.acquire(client_id, current_time, limit)
+            else:
+                allowed, requests_last_minute = self.counter.acquire(client_id, current_time, limit)
+            remaining = self.requests_per_minute - math.ceil(requests_last_minute) - int(allowed)
 
             # Check burst limit
-            if len(self.clients[client_id]) >= self.burst_limit:
+            if requests_last_minute >= self.burst_limit:
                 response = JSONResponse(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     content={"detail": "Burst rate limit exceeded"}
                 )
-                self._add_rate_limit_headers(response, client_id, current_time)
+                self._add_rate_limit_headers(response, remaining, current_time)
                 return response
 
             # Check rate limit
-            requests_last_minute = len(self.clients[client_id])
-            if requests_last_minute >= self.requests_per_minute:
+            if not allowed:
                 response = JSONResponse(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     content={"detail": "Rate limit exceeded"}
                 )
-                self._add_rate_limit_headers(response, client_id, current_time)
+                self._add_rate_limit_headers(response, remaining, current_time)
                 return response
 
-            # Add current request
-            self.clients[client_id].append(current_time)
-            
             # Call next middleware/route handler
             response = await call_next(request)
-            
+
             # Add rate limit headers to successful response
-            self._add_rate_limit_headers(response, client_id, current_time)
+            self._add_rate_limit_headers(response, remaining, current_time)
             return response
-            
+
         except Exception as e:
             logging.error(f"Rate limiter error: {str(e)}")
             response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": "Internal server error"}
             )
-            
+
             # Only add rate limit headers if we have the necessary info
             if client_id and current_time:
                 try:
-                    self._add_rate_limit_headers(response, client_id, current_time)
+                    self._add_rate_limit_headers(response, remaining, current_time)
                 except Exception as header_error:
                     logging.error(f"Failed to add rate limit headers: {str(header_error)}")
-                    
+
             return response
 
-    def _add_rate_limit_headers(self, response, client_id: str, current_time: float):
+    def _add_rate_limit_headers(self, response, remaining: int, current_time: float):
         """Helper method to add rate limit headers to a response"""
         try:
-            remaining = max(0, self.requests_per_minute - len(self.clients.get(client_id, [])))
-            reset_time = datetime.fromtimestamp(current_time + 60)
-            
+            reset_time = datetime.fromtimestamp(self.counter.reset_at(current_time))
+
             response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
+            response.headers["X-RateLimit-Remaining"] = str(max(0, remaining))
             response.headers["X-RateLimit-Reset"] = reset_time.isoformat()
         except Exception as e:
             logging.error(f"Error adding rate limit headers: {str(e)}")
@@ -0,0 +1,158 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+import logging
+import math
+
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.middleware.rate_limit import SlidingWindowCounter, evict_idle
+from app.models.rate_limit_bucket import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+class RateLimitStore(ABC):
+    """Request counts per client and fixed window, shared by every limiter using the store"""
+
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    async def add(self, key: str, window: int, amount: int, with_previous: bool = False) -> Tuple[int, int]:
+        """Add ``amount`` (possibly negative) to the count of ``key`` in ``window``.
+
+        Returns the previous window's count, or 0 unless ``with_previous``,
+        and the current window's count after the addition.
+        """
+
+class MemoryRateLimitStore(RateLimitStore):
+    """In-process counts, for tests and single-process runs"""
+
+    def __init__(self, window_seconds: float = 60.0):
+        super().__init__(window_seconds)
+        self.counts: Dict[Tuple[str, int], int] = {}
+
+    async def add(self, key: str, window: int, amount: int, with_previous: bool = False) -> Tuple[int, int]:
+        count = self.counts[(key, window)] = self.counts.get((key, window), 0) + amount
+        # Only the current and the previous window are ever read
+        self.counts.pop((key, window - 2), None)
+        previous = self.counts.get((key, window - 1), 0) if with_previous else 0
+        return previous, count
+
+class MongoRateLimitStore(RateLimitStore):
+    """Counts in one ``RateLimitBucket`` per client and window.
+
+    Additions are a single atomic ``$inc`` with upsert, so concurrent
+    processes never lose counts. Buckets expire through a TTL index once
+    they can no longer affect a sliding window.
+    """
+
+    async def add(self, key: str, window: int, amount: int, with_previous: bool = False) -> Tuple[int, int]:
+        collection = RateLimitBucket.get_motor_collection()
+        window_start = datetime.utcfromtimestamp(window * self.window_seconds)
+        bucket = await collection.find_one_and_update(
+            {"_id": f"{key}:{window}"},
+            {
+                "$inc": {"requests": amount},
+                "$setOnInsert": {"expires_at": window_start + timedelta(seconds=2 * self.window_seconds)}
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        previous = 0
+        if with_previous:
+            previous_bucket = await collection.find_one({"_id": f"{key}:{window - 1}"}, {"requests": 1})
+            previous = previous_bucket["requests"] if previous_bucket else 0
+        return previous, bucket["requests"]
+
+class Lease:
+    """Requests a client may still make in a window without asking the store"""
+    __slots__ = ("window", "previous", "total", "tokens", "blocked_until")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.previous: Optional[int] = None  # Store count of the previous window, once read
+        self.total = 0  # Store count of this window, leased tokens included
+        self.tokens = 0
+        self.blocked_until = 0.0
+
+class SharedRateLimiter:
+    """Sliding-window-counter rate limiting over a shared ``RateLimitStore``.
+
+    Rather than one store round trip per request, up to ``lease_size``
+    requests are reserved at a time and handed out locally. Leases shrink
+    as a client nears its limit, so reserved but unused requests can
+    overcount a client by at most ``lease_size`` per process. A client
+    refused by the store is refused locally for ``block_seconds`` before
+    the store is asked again.
+
+    If the store fails, requests are limited per process until it is back.
+    """
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        lease_size: Optional[int] = None,
+        block_seconds: float = 1.0,
+        max_clients: Optional[int] = None
+    ):
+        self.store = store
+        self.window_seconds = store.window_seconds
+        self.lease_size = lease_size or settings.RATE_LIMIT_LEASE_SIZE
+        self.block_seconds = block_seconds
+        self.max_clients = max_clients or settings.RATE_LIMIT_MAX_CLIENTS
+        self.leases: "OrderedDict[str, Lease]" = OrderedDict()
+        self.fallback = SlidingWindowCounter(self.window_seconds, self.max_clients)
+
+    async def acquire(self, client_id: str, now: float, limit: int) -> Tuple[bool, float]:
+        """Count a request if the client is under ``limit``.
+
+        Returns whether it was allowed and the estimated requests in the
+        window before it.
+        """
+        window = int(now // self.window_seconds)
+        elapsed = now / self.window_seconds - window
+        lease = self.leases.get(client_id)
+        if lease is None or lease.window != window:
+            # Tokens leased in an earlier window are already counted there
+            lease = self.leases[client_id] = Lease(window)
+        self.leases.move_to_end(client_id)
+        evict_idle(self.leases, window, self.max_clients)
+
+        estimate = (lease.previous or 0) * (1 - elapsed) + lease.total - lease.tokens
+        if lease.tokens > 0:
+            lease.tokens -= 1
+            return True, estimate
+        if now < lease.blocked_until:
+            return False, estimate
+
+        amount = max(1, min(self.lease_size, int((limit - estimate) // 2)))
+        try:
+            previous, total = await self.store.add(
+                client_id, window, amount, with_previous=lease.previous is None
+            )
+            if lease.previous is None:
+                lease.previous = previous
+            estimate = lease.previous * (1 - elapsed) + total - amount
+            granted = max(0, min(amount, math.ceil(limit - estimate)))
+            if granted < amount:
+                # Hand back what is over the limit so other processes can use it
+                _, total = await self.store.add(client_id, window, granted - amount)
+        except Exception as e:
+            logger.error(f"Rate limit store failed, limiting per process: {str(e)}")
+            return self.fallback.acquire(client_id, now, limit)
+
+        lease.total = total
+        if granted == 0:
+            lease.blocked_until = min(now + self.block_seconds, (window + 1) * self.window_seconds)
+            return False, estimate
+        lease.tokens = granted - 1
+        return True, estimate
+
+def get_shared_rate_limiter(window_seconds: float = 60.0) -> Optional[SharedRateLimiter]:
+    """Limiter shared across processes as configured by RATE_LIMIT_STORE, or None to limit per process"""
+    if settings.RATE_LIMIT_STORE == "mongodb":
+        return SharedRateLimiter(MongoRateLimitStore(window_seconds))
+    return None
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any, Dict
+from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from app.core.config import settings
+
+class CachedResult(Document):
+    """Execution result shared across submissions of identical code"""
+    key: Indexed(str, unique=True)  # Hash of normalized source, language and test case
+    result: Dict[str, Any]  # ExecutionResult fields
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "result_cache"
+        indexes = [
+            IndexModel(
+                [("created_at", ASCENDING)],
+                expireAfterSeconds=settings.RESULT_CACHE_TTL_SECONDS
+            )
+        ]
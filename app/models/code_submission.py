@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List, Optional
 from beanie import Document, Link
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pydantic.typing import Annotated
 from app.models.user import User
 from app.models.question import Question
@@ -24,6 +25,7 @@ class CodeSubmission(Document):
     question: Annotated[PydanticObjectId, Link[Question]]
     language: str
     code: str
+    samples_only: bool = False  # Judge only the visible test cases ("run" rather than "submit")
     status: str = Field(
         default="pending",
         description="pending, running, completed, error"
@@ -33,6 +35,9 @@ class CodeSubmission(Document):
     total_tests: int = 0
     execution_time: float = 0  # Total execution time
     memory_used: float = 0     # Peak memory usage
+    stopped_after: Optional[int] = None  # Fail-fast: test (1-based, run order) that stopped judging
+    compile_error: Optional[str] = None  # Compiler output, kept once instead of on every result
+    judged_by: Optional[str] = None  # Fencing token of the judge run whose writes still apply
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
 
@@ -44,3 +49,8 @@ class CodeSubmission(Document):
             "status",
             "submitted_at"
         ]
+        # History pages, newest first (see reconcile_indexes)
+        background_indexes = [
+            IndexModel([("user", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("question", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
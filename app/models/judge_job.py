@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Optional
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+class JudgeJob(Document):
+    """A submission waiting for, or being judged by, a judge worker"""
+    submission: PydanticObjectId
+    user: Optional[PydanticObjectId] = None
+    status: str = Field(
+        default="queued",
+        description="queued, running, done, dead"
+    )
+    priority_class: str = Field(
+        default="submit",
+        description="interactive, submit, rejudge"
+    )
+    priority: int = 1  # Lower is claimed first; derived from priority_class
+    user_rank: int = 0  # The user's jobs already waiting in this class when enqueued
+    attempts: int = 0
+    available_at: datetime = Field(default_factory=datetime.utcnow)  # Not claimable before this
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None  # Running jobs past this are reclaimed
+    heartbeat_at: Optional[datetime] = None
+    claimed_at: Optional[datetime] = None  # First claim; claimed_at - created_at is the queue wait
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "judge_jobs"
+        indexes = [
+            "submission",
+            IndexModel([
+                ("status", ASCENDING),
+                ("priority", ASCENDING),
+                ("user_rank", ASCENDING),
+                ("available_at", ASCENDING),
+            ]),
+            IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)]),
+            IndexModel([("user", ASCENDING), ("priority_class", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("claimed_at", ASCENDING)]),
+        ]
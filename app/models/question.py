@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List, Optional
 from beanie import Document, Link, PydanticObjectId
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 from app.models.user import User
 from app.schemas.question import QuestionBase, TestCase
@@ -18,6 +19,15 @@ class Question(QuestionBase, Document):
     class Settings:
         name = "questions"
         use_state_management = True
+        # Built at startup by reconcile_indexes, in the background rather than
+        # inside init_beanie, so a large catalog does not hold up startup.
+        # Listing filters by level, topics and companies and pages by _id.
+        background_indexes = [
+            IndexModel([("title_slug", ASCENDING)], unique=True),
+            IndexModel([("level", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("topics", ASCENDING), ("level", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("companies", ASCENDING), ("level", ASCENDING), ("_id", ASCENDING)]),
+        ]
 
     class Config:
         populate_by_name = True
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+class RateLimitBucket(Document):
+    """Requests one client made in one fixed window, counted across all API processes"""
+    id: Optional[str] = None  # "<client>:<window number>"
+    requests: int = 0
+    expires_at: datetime  # Once the window can no longer affect a rate
+
+    class Settings:
+        name = "rate_limits"
+        indexes = [
+            IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)
+        ]
@@ -10,6 +10,7 @@ class CodeSubmissionRequest(BaseModel):
     language: str = Field(..., pattern="^(python|java|cpp|javascript)$")
     code: str
     question_id: str
+    samples_only: bool = False  # Only run the visible test cases, at interactive priority
 
     class Config:
         json_schema_extra = {
@@ -34,6 +35,8 @@ class CodeSubmissionResponse(BaseModel):
     input: Optional[str] = None
     expected_output: Optional[str] = None
     output_value: Optional[str] = None
+    stopped_after: Optional[int] = None
+    compile_error: Optional[str] = None
     submitted_at: datetime
 
 class SubmissionHistory(BaseModel):
@@ -63,6 +66,8 @@ class CodeSubmissionResponse(BaseModel):
     input: Optional[str] = None
     expected_output: Optional[str] = None
     output_value: Optional[str] = None
+    stopped_after: Optional[int] = None
+    compile_error: Optional[str] = None
     submitted_at: datetime
 
 class SubmissionHistory(BaseModel):
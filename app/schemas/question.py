@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 from datetime import datetime
 from pydantic import BaseModel, Field, constr
 from enum import Enum
@@ -10,13 +10,26 @@ class Language(str, Enum):
     CPP = "cpp"
     JAVASCRIPT = "javascript"
 
+class BlobRef(BaseModel):
+    """A payload kept in the test data store"""
+    digest: str  # sha256 of the uncompressed bytes
+    size: int  # Uncompressed bytes
+
+# How outputs are compared; one per checker in execution.checker.CHECKERS
+CheckerMode = Literal["exact", "tokens", "float", "unordered_lines", "json", "json_unordered"]
+
 class TestCase(BaseModel):
     id: str = Field(default_factory=lambda: str(PydanticObjectId()))
-    input: str
-    expected_output: str
+    # Large payloads live in the test data store and are empty here
+    input: str = ""
+    expected_output: str = ""
+    input_ref: Optional[BlobRef] = None
+    output_ref: Optional[BlobRef] = None
     timeout_ms: int = 2000
     memory_limit_mb: int = 512
     is_hidden: bool = False
+    checker_mode: Optional[CheckerMode] = None  # Overrides the question's checker_mode
+    checker_epsilon: Optional[float] = None
 
 class CodeSnippet(BaseModel):
     language: Language
@@ -35,6 +48,8 @@ class QuestionBase(BaseModel):
     content: str
     code_snippets: List[CodeSnippet]
     test_cases: List[TestCase]
+    checker_mode: CheckerMode = "tokens"
+    checker_epsilon: float = 1e-6  # Tolerance of the float checker
     time_complexity: Optional[str] = None
     space_complexity: Optional[str] = None
     hints: List[str] = Field(default_factory=list)
@@ -43,6 +58,45 @@ class QuestionBase(BaseModel):
     submission_count: int = 0
     success_count: int = 0
 
+class QuestionSummary(BaseModel):
+    """A question as shown in the problem list, read with a projection"""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    title_slug: str = ""
+    level: str
+    topics: List[str] = Field(default_factory=list)
+    companies: Optional[List[str]] = Field(default_factory=list)
+    likes: int = 0
+    dislikes: int = 0
+    acceptance_rate: float = 0.0
+    submission_count: int = 0
+    success_count: int = 0
+
+    class Config:
+        allow_population_by_field_name = True
+        json_encoders = {PydanticObjectId: str}
+
+class QuestionSearchHit(BaseModel):
+    """A search result, best first"""
+    id: str = Field(alias="_id")
+    title: str
+    title_slug: str = ""
+    level: str
+    topics: List[str] = Field(default_factory=list)
+    companies: Optional[List[str]] = Field(default_factory=list)
+    score: float
+    highlights: Dict[str, str]  # title and a content snippet, matches in <mark>
+
+    class Config:
+        allow_population_by_field_name = True
+
+class QuestionFacets(BaseModel):
+    """Question counts per filter value, largest first"""
+    total: int
+    level: Dict[str, int]
+    topics: Dict[str, int]
+    companies: Dict[str, int]
+
 class QuestionCreate(QuestionBase):
     pass
 
@@ -0,0 +1,42 @@
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from beanie import init_beanie
+
+from app.core.config import settings
+from app.models.question import Question
+from app.models.user import User
+from app.schemas.question import TestCase
+from app.services.blob_store import externalize_test_case
+
+async def externalize_test_data():
+    """Move large test case payloads of existing questions into the test data store"""
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+
+    # Initialize beanie
+    await init_beanie(
+        database=client[settings.DATABASE_NAME],
+        document_models=[Question, User]
+    )
+
+    questions_collection = Question.get_motor_collection()
+    moved = 0
+
+    # Raw documents, one question at a time, so big payloads are not all held at once
+    async for doc in questions_collection.find({}, {"test_cases": 1}):
+        test_cases = [TestCase.parse_obj(tc) for tc in doc.get("test_cases", [])]
+        externalized = [await externalize_test_case(tc) for tc in test_cases]
+        changed = sum(1 for old, new in zip(test_cases, externalized) if old is not new)
+        if not changed:
+            continue
+
+        await questions_collection.update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"test_cases": [tc.dict() for tc in externalized]}}
+        )
+        moved += changed
+
+    print(f"Externalized payloads of {moved} test cases")
+
+if __name__ == "__main__":
+    asyncio.run(externalize_test_data())
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket
+
+from app.core.config import settings
+from app.schemas.question import BlobRef, TestCase
+
+CHUNK_SIZE = 256 * 1024
+
+
+class BlobNotFoundError(KeyError):
+    pass
+
+
+class BlobStore(ABC):
+    """Content-addressed store for test case payloads.
+
+    Payloads are keyed by the sha256 of their bytes, so identical inputs
+    and outputs are stored once however many test cases share them. They
+    are stored zlib-compressed and streamed back in chunks. Fetched
+    payloads are kept in a per-process LRU bounded by ``cache_bytes``;
+    content addressing means cached entries never go stale.
+    """
+
+    def __init__(self, cache_bytes: Optional[int] = None):
+        self.cache_bytes = settings.TEST_DATA_CACHE_BYTES if cache_bytes is None else cache_bytes
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cached_bytes = 0
+
+    async def put(self, data: bytes) -> BlobRef:
+        digest = hashlib.sha256(data).hexdigest()
+        if not await self._exists(digest):
+            compressed = await asyncio.to_thread(zlib.compress, data, 6)
+            await self._write(digest, compressed)
+        return BlobRef(digest=digest, size=len(data))
+
+    async def stream(self, digest: str) -> AsyncIterator[bytes]:
+        """The payload's bytes, decompressed chunk by chunk"""
+        decompressor = zlib.decompressobj()
+        async for chunk in self._read_chunks(digest):
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    async def get(self, digest: str) -> bytes:
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            return self._cache[digest]
+
+        data = b"".join([chunk async for chunk in self.stream(digest)])
+        if len(data) <= self.cache_bytes:
+            self._cache[digest] = data
+            self._cached_bytes += len(data)
+            while self._cached_bytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+        return data
+
+    @abstractmethod
+    async def _exists(self, digest: str) -> bool:
+        """Whether a blob is stored under ``digest``"""
+
+    @abstractmethod
+    async def _write(self, digest: str, compressed: bytes):
+        """Store compressed bytes under ``digest``"""
+
+    @abstractmethod
+    def _read_chunks(self, digest: str) -> AsyncIterator[bytes]:
+        """The stored compressed bytes, chunk by chunk; ``BlobNotFoundError`` if missing"""
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under ``root``, fanned out by the first two hex digits"""
+
+    def __init__(self, root: Optional[str] = None, cache_bytes: Optional[int] = None):
+        super().__init__(cache_bytes)
+        self.root = root or settings.TEST_DATA_DIR
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    async def _exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    async def _write(self, digest: str, compressed: bytes):
+        def write():
+            path = self._path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write aside and rename, so readers never see half a blob
+            fd, staging = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".staging-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(staging, path)
+
+        await asyncio.to_thread(write)
+
+    async def _read_chunks(self, digest: str) -> AsyncIterator[bytes]:
+        try:
+            f = await asyncio.to_thread(open, self._path(digest), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(digest)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(f.read, CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            f.close()
+
+
+class GridFSBlobStore(BlobStore):
+    """Blobs in a GridFS bucket, one file per digest, shared by every API and
+    worker process"""
+
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        bucket_name: str = "test_data",
+        cache_bytes: Optional[int] = None
+    ):
+        super().__init__(cache_bytes)
+        self.bucket = AsyncIOMotorGridFSBucket(database, bucket_name=bucket_name, chunk_size_bytes=CHUNK_SIZE)
+
+    async def _exists(self, digest: str) -> bool:
+        return bool(await self.bucket.find({"filename": digest}, limit=1).to_list(1))
+
+    async def _write(self, digest: str, compressed: bytes):
+        # Two writers racing on one digest upload identical revisions; reads take either
+        await self.bucket.upload_from_stream(digest, compressed, metadata={"encoding": "zlib"})
+
+    async def _read_chunks(self, digest: str) -> AsyncIterator[bytes]:
+        try:
+            grid_out = await self.bucket.open_download_stream_by_name(digest)
+        except NoFile:
+            raise BlobNotFoundError(digest)
+        while True:
+            chunk = await grid_out.readchunk()
+            if not chunk:
+                return
+            yield chunk
+
+
+_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get the shared test data store named by ``TEST_DATA_STORE``"""
+    global _store
+    if _store is None:
+        if settings.TEST_DATA_STORE == "local":
+            _store = LocalBlobStore()
+        elif settings.TEST_DATA_STORE == "gridfs":
+            from app.models.question import Question
+            _store = GridFSBlobStore(Question.get_motor_collection().database)
+        else:
+            raise ValueError(f"Unknown test data store: {settings.TEST_DATA_STORE}")
+    return _store
+
+
+async def externalize_test_case(
+    test_case: TestCase,
+    store: Optional[BlobStore] = None,
+    inline_max_bytes: Optional[int] = None
+) -> TestCase:
+    """The test case with payloads over ``inline_max_bytes`` moved to the store"""
+    inline_max_bytes = settings.TEST_DATA_INLINE_MAX_BYTES if inline_max_bytes is None else inline_max_bytes
+    update = {}
+    for field, ref_field in (("input", "input_ref"), ("expected_output", "output_ref")):
+        data = getattr(test_case, field).encode()
+        if len(data) > inline_max_bytes:
+            update[ref_field] = await (store or get_blob_store()).put(data)
+            update[field] = ""
+    return test_case.copy(update=update) if update else test_case
+
+
+async def load_test_case(test_case: TestCase, store: Optional[BlobStore] = None) -> TestCase:
+    """The test case with its stored payloads fetched back inline"""
+    update = {}
+    for field, ref_field in (("input", "input_ref"), ("expected_output", "output_ref")):
+        ref = getattr(test_case, ref_field)
+        if ref is not None:
+            update[field] = (await (store or get_blob_store()).get(ref.digest)).decode()
+    return test_case.copy(update=update) if update else test_case
@@ -1,98 +1,96 @@
-import time
-import requests
+import asyncio
+import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple, Union
 from beanie import PydanticObjectId, Link
 from fastapi import HTTPException
+from pymongo import DESCENDING
 import tempfile
 from app.core.config import settings
+from app.core.pagination import keyset_filter
 from app.models.code_submission import CodeSubmission, TestResult
 from app.models.user import User
 from app.models.question import Question, TestCase
+from app.services.execution import (
+    ExecutionBackend,
+    ExecutionRequest,
+    ExecutionResult,
+    ExecutionStatus,
+    Judge0Backend,
+    get_execution_backend
+)
+from app.services.blob_store import BlobStore, load_test_case
+from app.services.execution.checker import apply_checker
+from app.services.judge0_client import Judge0Client
+from app.services.question_cache import question_cache
+from app.services.judge_events import TEST_RESULT_FIELDS, VERDICT_FIELDS, judge_events
+from app.services.result_cache import ResultCache, result_cache_key, result_cache as shared_result_cache
+
+logger = logging.getLogger(__name__)
+
+# Called with each test case and its result as soon as the result is known
+ResultCallback = Callable[[TestCase, ExecutionResult], Awaitable[None]]
+
+# Submission pages: newest first, _id breaking ties between equal times
+SUBMISSION_ORDER = [("submitted_at", DESCENDING), ("_id", DESCENDING)]
+
+# Process-wide cap on test cases being judged at once, shared by all submissions
+judge_slots = asyncio.Semaphore(settings.JUDGE_MAX_CONCURRENCY)
 
 class CodeExecutionService:
-    def __init__(self):
-        self.judge0_api_url = "https://judge0-ce.p.rapidapi.com"
-        self.headers = {
-            "x-rapidapi-key": settings.JUDGE0_API_KEY,
-            "x-rapidapi-host": "judge0-ce.p.rapidapi.com",
-            "content-type": "application/json"
-        }
+    def __init__(
+        self,
+        judge0: Optional[Judge0Client] = None,
+        backend: Optional[ExecutionBackend] = None,
+        result_cache: Optional[ResultCache] = None,
+        test_data: Optional[BlobStore] = None
+    ):
+        if backend is None:
+            backend = Judge0Backend(judge0) if judge0 else get_execution_backend()
+        self.backend = backend
+        if result_cache is None and settings.RESULT_CACHE_ENABLED:
+            result_cache = shared_result_cache
+        self.result_cache = result_cache
+        # None means the shared store, looked up only when a payload is stored there
+        self.test_data = test_data
         self.language_configs = {
             "python": {
-                "judge0_id": 71,  # Python (3.8.1)
                 "extension": ".py",
                 "timeout": 10,  # seconds
             },
             "java": {
-                "judge0_id": 62,  # Java (OpenJDK 13.0.1)
                 "extension": ".java",
                 "timeout": 15,
             },
             "cpp": {
-                "judge0_id": 54,  # C++ (GCC 9.2.0)
                 "extension": ".cpp",
                 "timeout": 10,
             },
             "javascript": {
-                "image": "node:16-slim",
                 "extension": ".js",
-                "command": "node",
-                "memory_limit": "256m",
                 "timeout": 10,
-                "compile_needed": False
             }
         }
 
     async def execute_code(self, code: str, lang: str, input_data: str) -> Dict[str, Any]:
-        """Execute code using Judge0 CE API and return result"""
+        """Execute code on the configured backend and return result"""
         try:
             config = self.language_configs[lang]
 
-            # Prepare submission data
-            submission_data = {
-                "source_code": code,
-                "language_id": config['judge0_id'],
-                "stdin": input_data,
-                "cpu_time_limit": config['timeout'],
-                "memory_limit": 256000  # 256MB in KB
-            }
-
-            # Create submission
-            response = requests.post(
-                f"{self.judge0_api_url}/submissions",
-                headers=self.headers,
-                json=submission_data
-            )
-            response.raise_for_status()
-            token = response.json()['token']
-
-            # Poll for results
-            max_attempts = 10
-            attempt = 0
-            while attempt < max_attempts:
-                response = requests.get(
-                    f"{self.judge0_api_url}/submissions/{token}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                if result['status']['id'] not in [1, 2]:  # Not queued or processing
-                    break
-
-                attempt += 1
-                time.sleep(1)
+            result = await self.backend.run(lang, code, ExecutionRequest(
+                stdin=input_data,
+                time_limit=config['timeout'],
+                memory_limit=256000  # 256MB in KB
+            ))
 
             # Process results
-            status = result['status']['id']
-            if status == 3:  # Accepted
+            if result.status == ExecutionStatus.ACCEPTED:
                 return {
                     "status": "success",
-                    "output": result.get('stdout', ''),
+                    "output": result.stdout,
                     "error": None
                 }
-            elif status == 5:  # Time Limit Exceeded
+            elif result.status == ExecutionStatus.TIME_LIMIT_EXCEEDED:
                 return {
                     "status": "error",
                     "output": "",
@@ -101,8 +99,8 @@ class CodeExecutionService:
             else:
                 return {
                     "status": "error",
-                    "output": result.get('stdout', ''),
-                    "error": result.get('stderr', '') or result.get('compile_output', '')
+                    "output": result.stdout,
+                    "error": result.stderr or result.compile_output or result.message
                 }
 
         except Exception as e:
@@ -117,7 +115,8 @@ class CodeExecutionService:
         user_id: str,
         question_id: str,
         language: str,
-        code: str
+        code: str,
+        samples_only: bool = False
     ) -> str:
         """Queue a code submission for execution"""
         if language not in self.language_configs:
@@ -132,125 +131,401 @@ class CodeExecutionService:
             question=PydanticObjectId(question_id),
             language=language,
             code=code,
+            samples_only=samples_only,
             status="pending"
         )
         await submission.insert()
         
         return str(submission.id)
 
-    async def execute_submission(self, submission_id: str):
-        """Execute a queued code submission"""
+    async def execute_submission(
+        self,
+        submission_id: str,
+        claim_from: Tuple[str, ...] = ("pending",),
+        fence: Optional[str] = None
+    ):
+        """Execute a queued code submission.
+
+        The submission is only judged if its status is one of ``claim_from``
+        (a retry after a crash or failure also claims "running" or "error").
+        Every write is a targeted update: results are pushed one by one as
+        they finish, and the code is never written back.
+
+        ``fence`` identifies this judge run. The claim records it, and later
+        writes only apply while it is still recorded, so a run whose job
+        was reclaimed by another worker cannot write over the new run.
+        """
         submission = await CodeSubmission.get(PydanticObjectId(submission_id))
         if not submission:
             raise HTTPException(status_code=404, detail="Su-bmission not found")
 
-        question = await Question.get(submission.question)
+        question = await question_cache.get(submission.question)
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
 
-        # Update status to running
-        submission.status = "running"
-        await submission.save()
+        # Update status to running, unless someone else got there first
+        claimed = await self._update_submission(
+            submission.id,
+            {"$set": {
+                "status": "running",
+                "results": [],
+                "total_passed": 0,
+                "execution_time": 0,
+                "memory_used": 0,
+                "stopped_after": None,
+                "compile_error": None,
+                "completed_at": None,
+                "judged_by": fence,
+            }},
+            status=list(claim_from)
+        )
+        if not claimed:
+            logger.info(f"Submission {submission_id} is no longer {'/'.join(claim_from)}; skipping")
+            return
+        judge_events.publish(submission_id, "status", {"status": "running"})
 
-        try:
-            results = await self._run_test_cases(
-                language=submission.language,
-                code=submission.code,
-                test_cases=question.test_cases
+        # TestResults by test case, built once so ids match across writes
+        reported: Dict[int, TestResult] = {}
+
+        async def report(test_case: TestCase, result: ExecutionResult):
+            test_result = self._to_test_result(test_case, result)
+            reported[id(test_case)] = test_result
+            await self._update_submission(
+                submission.id,
+                {
+                    "$push": {"results": test_result.dict(exclude={"id", "revision_id"})},
+                    "$inc": {"total_passed": int(test_result.passed)},
+                },
+                status="running",
+                fence=fence
             )
+            judge_events.publish(submission_id, "result", test_result.dict(include=set(TEST_RESULT_FIELDS)))
 
-            # Update submission with results
-            submission.status = "completed"
-            submission.completed_at = datetime.utcnow()
-            submission.results = results
-            submission.total_tests = len(results)
-            submission.total_passed = sum(1 for r in results if r.passed)
-            
-            # Calculate total execution time and peak memory
-            submission.execution_time = sum(r.execution_time for r in results)
-            submission.memory_used = max(r.memory_used for r in results)
-            
-            await submission.save()
+        try:
+            fail_fast = settings.JUDGE_FAIL_FAST
+            test_cases = [self._with_checker(tc, question) for tc in question.test_cases]
+            if submission.samples_only:
+                test_cases = [tc for tc in test_cases if not tc.is_hidden]
+            # Fetch stored payloads only for the test cases this run needs
+            test_cases = list(await asyncio.gather(*(load_test_case(tc, self.test_data) for tc in test_cases)))
+            if fail_fast:
+                test_cases = self._fail_fast_order(test_cases)
+
+            # Build once up front; a compile error fails the whole submission
+            compile_error = await self.backend.compile(submission.language, submission.code)
+            if compile_error is not None and compile_error.status == ExecutionStatus.COMPILATION_ERROR:
+                outcomes = []
+                compile_output = compile_error.compile_output
+            else:
+                outcomes = await self._run_test_cases(
+                    language=submission.language,
+                    code=submission.code,
+                    test_cases=test_cases,
+                    fail_fast=fail_fast,
+                    on_result=report
+                )
+                # Backends that compile per run report the same error on every test
+                compile_output = next(
+                    (r.compile_output for _, r in outcomes if r.status == ExecutionStatus.COMPILATION_ERROR),
+                    None
+                )
+            results = [
+                reported.get(id(test_case)) or self._to_test_result(test_case, result)
+                for test_case, result in outcomes
+            ]
+
+            # Final totals; the results themselves are already stored
+            verdict = {
+                "status": "completed",
+                "completed_at": datetime.utcnow(),
+                "total_tests": len(test_cases),
+                "total_passed": sum(1 for r in results if r.passed),
+                "compile_error": compile_output,
+                "stopped_after": None,
+                # Calculate total execution time and peak memory
+                "execution_time": sum(r.execution_time for r in results),
+                "memory_used": max((r.memory_used for r in results), default=0),
+            }
+
+            # Record which test stopped judging (1-based, in run order)
+            first_failure = next((r for r in results if not r.passed), None)
+            if fail_fast and first_failure:
+                run_order = [self._test_case_id(tc) for tc in test_cases]
+                verdict["stopped_after"] = run_order.index(first_failure.test_case_id) + 1
+
+            update = {"$set": verdict}
+            # Results reported after fail-fast had already stopped judging
+            kept = {r.test_case_id for r in results}
+            dropped = [r.test_case_id for r in reported.values() if r.test_case_id not in kept]
+            if dropped:
+                update["$pull"] = {"results": {"test_case_id": {"$in": dropped}}}
+
+            await self._update_submission(submission.id, update, status="running", fence=fence)
+            judge_events.publish(
+                submission_id, "verdict", {field: verdict.get(field) for field in VERDICT_FIELDS}
+            )
 
         except Exception as e:
-            submission.status = "error"
-            submission.completed_at = datetime.utcnow()
-            await submission.save()
+            await self._update_submission(
+                submission.id,
+                {"$set": {"status": "error", "completed_at": datetime.utcnow()}},
+                status="running",
+                fence=fence
+            )
+            judge_events.publish(submission_id, "verdict", {"status": "error"})
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _update_submission(
+        self,
+        submission_id: PydanticObjectId,
+        update: Dict[str, Any],
+        status: Union[str, List[str]],
+        fence: Optional[str] = None
+    ) -> bool:
+        """Apply an update only while the submission has the given status,
+        and, with a ``fence``, only while that judge run still owns it.
+
+        Returns whether it applied.
+        """
+        query = {"_id": submission_id, "status": {"$in": status} if isinstance(status, list) else status}
+        if fence is not None:
+            query["judged_by"] = fence
+        result = await CodeSubmission.get_motor_collection().update_one(query, update)
+        return result.matched_count == 1
+
     async def _run_test_cases(
         self,
         language: str,
         code: str,
-        test_cases: List[TestCase]
-    ) -> List[TestResult]:
-        """Run test cases using Judge0 API"""
-        config = self.language_configs[language]
-        results = []
+        test_cases: List[TestCase],
+        fail_fast: bool = False,
+        on_result: Optional[ResultCallback] = None
+    ) -> List[Tuple[TestCase, ExecutionResult]]:
+        """Run test cases, pairing each with its result.
+
+        Results of identical code on identical test cases are reused from
+        the result cache; only the misses go to the execution backend.
+        With ``fail_fast`` judging stops at the first failing test case and
+        only the results gathered up to that point are returned.
+        ``on_result`` is awaited with each result as soon as it is known.
+        """
+        if self.result_cache is None:
+            return await self._execute_test_cases(language, code, test_cases, fail_fast, on_result)
+
+        requests = [self._build_request(tc) for tc in test_cases]
+        runtime = self.backend.runtime(language)
+        keys = [result_cache_key(runtime, language, code, request) for request in requests]
+        found = await self.result_cache.get_many(keys)
+
+        # Cached outputs are raw, so each is checked against its own test case
+        cached: Dict[int, ExecutionResult] = {}
+        for i, (key, request) in enumerate(zip(keys, requests)):
+            if key in found:
+                cached[i] = await apply_checker(found[key], request)
+
+        stop = len(test_cases)
+        if fail_fast:
+            # A cached failure already ends judging; run only what precedes it
+            stop = next((i + 1 for i in sorted(cached) if not cached[i].passed), stop)
+        if on_result:
+            for i in sorted(cached):
+                if i < stop:
+                    await on_result(test_cases[i], cached[i])
+        to_run = [tc for i, tc in enumerate(test_cases[:stop]) if i not in cached]
+        executed = await self._execute_test_cases(language, code, to_run, fail_fast, on_result) if to_run else []
+        executed_by_id = {id(tc): result for tc, result in executed}
+        await self.result_cache.put_many({
+            key: executed_by_id[id(tc)]
+            for tc, key in zip(test_cases, keys)
+            if id(tc) in executed_by_id
+        })
+
+        outcomes = []
+        for i, tc in enumerate(test_cases):
+            result = cached.get(i) or executed_by_id.get(id(tc))
+            if result is None:
+                continue
+            outcomes.append((tc, result))
+            if fail_fast and not result.passed:
+                break
+        return outcomes
+
+    async def _execute_test_cases(
+        self,
+        language: str,
+        code: str,
+        test_cases: List[TestCase],
+        fail_fast: bool = False,
+        on_result: Optional[ResultCallback] = None
+    ) -> List[Tuple[TestCase, ExecutionResult]]:
+        """Run test cases on the execution backend in the configured mode"""
+        if settings.JUDGE_EXECUTION_MODE == "batch":
+            return await self._run_test_cases_batch(language, code, test_cases, fail_fast, on_result)
+        if settings.JUDGE_EXECUTION_MODE == "concurrent":
+            return await self._run_test_cases_concurrent(language, code, test_cases, fail_fast, on_result)
 
+        outcomes = []
         for test_case in test_cases:
-            try:
-                # Prepare submission data
-                data = {
-                    "source_code": code,
-                    "language_id": config["judge0_id"],
-                    "stdin": test_case.input,
-                    "expected_output": test_case.expected_output,
-                    "cpu_time_limit": 2,  # 2 seconds
-                    "memory_limit": 256000  # 256MB
-                }
+            result = await self._run_test_case(language, code, test_case)
+            outcomes.append((test_case, result))
+            if on_result:
+                await on_result(test_case, result)
+            if fail_fast and not result.passed:
+                break
 
-                # Create submission
-                response = requests.post(
-                    f"{self.judge0_api_url}/submissions",
-                    headers=self.headers,
-                    json=data
-                )
-                response.raise_for_status()
-                token = response.json()["token"]
-
-                # Wait for result (poll every 0.5 seconds)
-                while True:
-                    response = requests.get(
-                        f"{self.judge0_api_url}/submissions/{token}",
-                        headers=self.headers
-                    )
-                    response.raise_for_status()
-                    submission = response.json()
-
-                    if submission["status"]["id"] not in [1, 2]:  # Not queued or processing
-                        break
-                    time.sleep(0.5)
-
-                # Process result
-                status = submission["status"]
-                passed = status["id"] == 3  # Accepted
-                error = None if passed else f"{status['description']}: {submission.get('compile_output', '')}"
-
-                # Generate test case ID if not present
-                test_case_id = getattr(test_case, 'id', None) or str(PydanticObjectId())
-                results.append(TestResult(
-                    test_case_id=str(test_case_id),
-                    passed=passed,
-                    execution_time=float(submission.get("time", 0)),
-                    memory_used=float(submission.get("memory", 0)) / 1024,  # Convert KB to MB
-                    output=None if test_case.is_hidden else submission.get("stdout", ""),
-                    error=error,
-                    is_hidden=test_case.is_hidden
-                ))
-
-            except Exception as e:
-                test_case_id = getattr(test_case, 'id', None) or str(PydanticObjectId())
-                results.append(TestResult(
-                    test_case_id=str(test_case_id),
-                    passed=False,
-                    execution_time=0,
-                    memory_used=0,
-                    error=f"Judge0 API error: {str(e)}",
-                    is_hidden=test_case.is_hidden
-                ))
-
-        return results
+        return outcomes
+
+    def _fail_fast_order(self, test_cases: List[TestCase]) -> List[TestCase]:
+        """Visible (sample) test cases first, so common mistakes stop judging early"""
+        return sorted(test_cases, key=lambda test_case: test_case.is_hidden)
+
+    async def _run_test_case(
+        self,
+        language: str,
+        code: str,
+        test_case: TestCase
+    ) -> ExecutionResult:
+        """Run a single test case on the execution backend"""
+        return await self.backend.run(language, code, self._build_request(test_case))
+
+    async def _run_test_cases_concurrent(
+        self,
+        language: str,
+        code: str,
+        test_cases: List[TestCase],
+        fail_fast: bool = False,
+        on_result: Optional[ResultCallback] = None
+    ) -> List[Tuple[TestCase, ExecutionResult]]:
+        """Run test cases in parallel, bounded per submission and process-wide"""
+        submission_slots = asyncio.Semaphore(settings.JUDGE_MAX_CONCURRENCY_PER_SUBMISSION)
+
+        async def run_one(test_case: TestCase) -> ExecutionResult:
+            async with submission_slots, judge_slots:
+                result = await self._run_test_case(language, code, test_case)
+            if on_result:
+                await on_result(test_case, result)
+            return result
+
+        tasks = [asyncio.create_task(run_one(test_case)) for test_case in test_cases]
+        if not fail_fast:
+            # gather keeps results in test case order
+            return list(zip(test_cases, await asyncio.gather(*tasks)))
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if not (await next_done).passed:
+                    break
+        finally:
+            # Cancel whatever is still queued or in flight
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [
+            (test_case, task.result())
+            for test_case, task in zip(test_cases, tasks)
+            if not task.cancelled()
+        ]
+
+    async def _run_test_cases_batch(
+        self,
+        language: str,
+        code: str,
+        test_cases: List[TestCase],
+        fail_fast: bool = False,
+        on_result: Optional[ResultCallback] = None
+    ) -> List[Tuple[TestCase, ExecutionResult]]:
+        """Run all test cases through the backend's batch path
+        (Judge0 batch submissions, or one build for local runs).
+
+        With ``fail_fast`` the test cases go out one batch at a time, no
+        further batches are sent once a batch contains a failure, and that
+        batch's results after the first failure are discarded, as in the
+        other modes.
+        """
+        if not fail_fast:
+            return await self._run_batch(language, code, test_cases, on_result)
+
+        outcomes = []
+        batch_size = self.backend.batch_size
+        for start in range(0, len(test_cases), batch_size):
+            batch_outcomes = await self._run_batch(language, code, test_cases[start:start + batch_size])
+            failure = next((i for i, (_, result) in enumerate(batch_outcomes) if not result.passed), None)
+            if failure is not None:
+                batch_outcomes = batch_outcomes[:failure + 1]
+            outcomes += batch_outcomes
+            if on_result:
+                for test_case, result in batch_outcomes:
+                    await on_result(test_case, result)
+            if failure is not None:
+                break
+
+        return outcomes
+
+    async def _run_batch(
+        self,
+        language: str,
+        code: str,
+        test_cases: List[TestCase],
+        on_result: Optional[ResultCallback] = None
+    ) -> List[Tuple[TestCase, ExecutionResult]]:
+        """Run a list of test cases as one backend batch"""
+        results = await self.backend.run_many(
+            language, code, [self._build_request(test_case) for test_case in test_cases]
+        )
+        outcomes = list(zip(test_cases, results))
+        if on_result:
+            for test_case, result in outcomes:
+                await on_result(test_case, result)
+        return outcomes
+
+    def _with_checker(self, test_case: TestCase, question: Question) -> TestCase:
+        """The test case with the question's checker filled in where it sets none"""
+        mode, epsilon = test_case.checker_mode, test_case.checker_epsilon
+        return test_case.copy(update={
+            "checker_mode": question.checker_mode if mode is None else mode,
+            "checker_epsilon": question.checker_epsilon if epsilon is None else epsilon  # 0 is a valid tolerance
+        })
+
+    def _build_request(self, test_case: TestCase) -> ExecutionRequest:
+        """Build the backend request for one test case"""
+        request = ExecutionRequest(
+            stdin=test_case.input,
+            expected_output=test_case.expected_output,
+            time_limit=2,  # 2 seconds
+            memory_limit=256000  # 256MB
+        )
+        if test_case.checker_mode is not None:
+            request.checker = test_case.checker_mode
+        if test_case.checker_epsilon is not None:
+            request.epsilon = test_case.checker_epsilon
+        return request
+
+    def _to_test_result(self, test_case: TestCase, result: ExecutionResult) -> TestResult:
+        """Convert a backend result into a TestResult"""
+        if result.passed:
+            error = None
+        elif result.status == ExecutionStatus.INTERNAL_ERROR:
+            error = result.message
+        elif result.status == ExecutionStatus.COMPILATION_ERROR:
+            # The compiler output is kept once, on the submission
+            error = result.description
+        else:
+            error = f"{result.description}: {result.compile_output}"
+
+        return TestResult(
+            test_case_id=self._test_case_id(test_case),
+            passed=result.passed,
+            execution_time=result.time,
+            memory_used=result.memory / 1024,  # Convert KB to MB
+            output=None if test_case.is_hidden else result.stdout,
+            error=error,
+            is_hidden=test_case.is_hidden
+        )
+
+    def _test_case_id(self, test_case: TestCase) -> str:
+        # Generate test case ID if not present
+        return str(getattr(test_case, 'id', None) or PydanticObjectId())
 
         """Get the appropriate run command for the language"""
         if language == "python":
@@ -270,20 +545,30 @@ class CodeExecutionService:
         self,
         user_id: str,
         question_id: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        after: Optional[List[Any]] = None
     ) -> List[CodeSubmission]:
-        """Get submissions for a user"""
+        """Get submissions for a user, newest first.
+
+        ``after`` is the ``SUBMISSION_ORDER`` key of the last submission of
+        the previous page.
+        """
         query = {"user": PydanticObjectId(user_id)}
         if question_id:
             query["question"] = PydanticObjectId(question_id)
+        if after:
+            query.update(keyset_filter(SUBMISSION_ORDER, after))
         
-        return await CodeSubmission.find(query).limit(limit).to_list()
+        return await CodeSubmission.find(query).sort(SUBMISSION_ORDER).limit(limit).to_list()
 
     async def get_question_submissions(
         self,
         question_id: str,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[List[Any]] = None
     ) -> List[CodeSubmission]:
-        """Get all submissions for a specific question"""
+        """Get all submissions for a specific question, newest first"""
         query = {"question": PydanticObjectId(question_id)}
-        return await CodeSubmission.find(query).limit(limit).to_list()
+        if after:
+            query.update(keyset_filter(SUBMISSION_ORDER, after))
+        return await CodeSubmission.find(query).sort(SUBMISSION_ORDER).limit(limit).to_list()
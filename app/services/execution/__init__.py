@@ -0,0 +1,40 @@
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.execution.base import (
+    ExecutionBackend,
+    ExecutionRequest,
+    ExecutionResult,
+    ExecutionStatus
+)
+from app.services.execution.judge0 import Judge0Backend
+from app.services.execution.local import LocalBackend
+
+EXECUTION_BACKENDS = {
+    "judge0": Judge0Backend,
+    "local": LocalBackend,
+}
+
+
+_backends: Dict[str, ExecutionBackend] = {}
+
+
+def get_execution_backend(name: Optional[str] = None) -> ExecutionBackend:
+    """Get the shared execution backend named by ``EXECUTION_BACKEND``"""
+    name = name or settings.EXECUTION_BACKEND
+    if name not in EXECUTION_BACKENDS:
+        raise ValueError(f"Unknown execution backend: {name}")
+    if name not in _backends:
+        _backends[name] = EXECUTION_BACKENDS[name]()
+    return _backends[name]
+
+
+__all__ = [
+    'ExecutionBackend',
+    'ExecutionRequest',
+    'ExecutionResult',
+    'ExecutionStatus',
+    'Judge0Backend',
+    'LocalBackend',
+    'get_execution_backend'
+]
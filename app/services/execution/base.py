@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ExecutionStatus(str, Enum):
+    ACCEPTED = "accepted"
+    WRONG_ANSWER = "wrong_answer"
+    TIME_LIMIT_EXCEEDED = "time_limit_exceeded"
+    MEMORY_LIMIT_EXCEEDED = "memory_limit_exceeded"
+    OUTPUT_LIMIT_EXCEEDED = "output_limit_exceeded"
+    RUNTIME_ERROR = "runtime_error"
+    COMPILATION_ERROR = "compilation_error"
+    INTERNAL_ERROR = "internal_error"
+
+
+class ExecutionRequest(BaseModel):
+    """One run of a program: its stdin, the expected stdout and the limits"""
+    stdin: str = ""
+    expected_output: Optional[str] = None  # None means any output is accepted
+    checker: str = "tokens"  # How output is compared, see checker.CHECKERS
+    epsilon: float = 1e-6  # Tolerance of the "float" checker
+    time_limit: float = 2.0  # CPU seconds
+    memory_limit: int = 256000  # KB
+
+
+class ExecutionResult(BaseModel):
+    """Outcome of one run, normalized across backends"""
+    status: ExecutionStatus
+    description: str  # Human readable status, e.g. "Wrong Answer"
+    stdout: str = ""
+    stderr: str = ""
+    compile_output: str = ""
+    message: Optional[str] = None  # Backend failure details
+    time: float = 0  # CPU seconds
+    memory: float = 0  # Peak memory in KB
+
+    @property
+    def passed(self) -> bool:
+        return self.status == ExecutionStatus.ACCEPTED
+
+
+class ExecutionBackend(ABC):
+    """Runs submitted code against inputs.
+
+    ``run_many`` runs one program against several inputs; backends that can
+    share work between runs (one HTTP batch, one compilation) override it.
+    Backends with a separate build step override ``compile`` so a
+    compilation error is found once, before any test runs. Backends only
+    run programs; a clean run gets its verdict from ``apply_checker``.
+    """
+
+    name: str = ""
+    batch_size: int = 20
+
+    @abstractmethod
+    async def run(self, language: str, code: str, request: ExecutionRequest) -> ExecutionResult:
+        """Run ``code`` once"""
+
+    async def run_many(
+        self,
+        language: str,
+        code: str,
+        requests: List[ExecutionRequest]
+    ) -> List[ExecutionResult]:
+        """Run ``code`` against every request, returning results in order"""
+        return [await self.run(language, code, request) for request in requests]
+
+    async def compile(self, language: str, code: str) -> Optional[ExecutionResult]:
+        """Build ``code`` ahead of its runs; returns the failure if it does not build.
+
+        The default has no separate build step and reports nothing.
+        """
+        return None
+
+    def runtime(self, language: str) -> str:
+        """What runs ``language`` here: the backend and, where known, its version.
+
+        Results are only reused between runs on the same runtime.
+        """
+        return self.name
+
+    async def start(self):
+        """Acquire anything the backend wants ready before the first run"""
+
+    async def close(self):
+        """Release anything the backend holds on to"""
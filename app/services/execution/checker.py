@@ -0,0 +1,127 @@
+import asyncio
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.execution.base import ExecutionRequest, ExecutionResult, ExecutionStatus
+
+
+def _lines(text: str) -> List[str]:
+    """Lines without trailing whitespace, ignoring blank lines at the end"""
+    return [line.rstrip() for line in text.replace("\r\n", "\n").rstrip().split("\n")]
+
+
+def _is_close(token: str, expected: str, epsilon: float) -> bool:
+    try:
+        a, b = float(token), float(expected)
+    except ValueError:
+        return token == expected
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return math.isclose(a, b, rel_tol=epsilon, abs_tol=epsilon)
+
+
+def _json_values(text: str) -> List[Any]:
+    """One JSON value per non-blank line"""
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _unordered(value: Any) -> Any:
+    """Arrays as multisets, recursively, so element order does not matter"""
+    if isinstance(value, list):
+        return sorted((_unordered(item) for item in value), key=lambda item: json.dumps(item, sort_keys=True))
+    if isinstance(value, dict):
+        return {key: _unordered(item) for key, item in value.items()}
+    return value
+
+
+def match_exact(output: str, expected: str, epsilon: float) -> bool:
+    """Same text, up to line endings and trailing newlines"""
+    return output.replace("\r\n", "\n").rstrip("\n") == expected.replace("\r\n", "\n").rstrip("\n")
+
+
+def match_tokens(output: str, expected: str, epsilon: float) -> bool:
+    """Same whitespace-separated tokens"""
+    return output.split() == expected.split()
+
+
+def match_float(output: str, expected: str, epsilon: float) -> bool:
+    """Same tokens, numbers equal within ``epsilon`` (absolute or relative)"""
+    tokens, expected_tokens = output.split(), expected.split()
+    return len(tokens) == len(expected_tokens) and all(
+        _is_close(token, expected_token, epsilon)
+        for token, expected_token in zip(tokens, expected_tokens)
+    )
+
+
+def match_unordered_lines(output: str, expected: str, epsilon: float) -> bool:
+    """Same lines in any order"""
+    return sorted(_lines(output)) == sorted(_lines(expected))
+
+
+def match_json(output: str, expected: str, epsilon: float) -> bool:
+    """Same JSON value per line, whatever the formatting and key order"""
+    try:
+        return _json_values(output) == _json_values(expected)
+    except (ValueError, RecursionError):  # Not JSON, or nested deeper than we parse
+        return False
+
+
+def match_json_unordered(output: str, expected: str, epsilon: float) -> bool:
+    """Like ``json``, with arrays compared regardless of element order"""
+    try:
+        return _unordered(_json_values(output)) == _unordered(_json_values(expected))
+    except (ValueError, RecursionError):
+        return False
+
+
+CHECKERS: Dict[str, Callable[[str, str, float], bool]] = {
+    "exact": match_exact,
+    "tokens": match_tokens,
+    "float": match_float,
+    "unordered_lines": match_unordered_lines,
+    "json": match_json,
+    "json_unordered": match_json_unordered,
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def outputs_match(output: str, expected: str, mode: str = "tokens", epsilon: float = 1e-6) -> bool:
+    if mode not in CHECKERS:
+        raise ValueError(f"Unknown checker mode: {mode}")
+    return CHECKERS[mode](output, expected, epsilon)
+
+
+async def check_output(output: str, expected: str, mode: str = "tokens", epsilon: float = 1e-6) -> bool:
+    """Compare outputs without blocking the event loop.
+
+    Small outputs are compared inline; large ones in a process pool, since
+    tokenizing and parsing megabytes of output holds the GIL.
+    """
+    global _pool
+    if len(output) + len(expected) < settings.CHECKER_OFFLOAD_BYTES:
+        return outputs_match(output, expected, mode, epsilon)
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.CHECKER_PROCESSES)
+    return await asyncio.get_running_loop().run_in_executor(
+        _pool, outputs_match, output, expected, mode, epsilon
+    )
+
+
+async def apply_checker(result: ExecutionResult, request: ExecutionRequest) -> ExecutionResult:
+    """Give a run that finished cleanly its verdict against the expected output"""
+    if request.expected_output is None or result.status != ExecutionStatus.ACCEPTED:
+        return result
+    if await check_output(result.stdout, request.expected_output, request.checker, request.epsilon):
+        return result
+    return result.copy(update={"status": ExecutionStatus.WRONG_ANSWER, "description": "Wrong Answer"})
+
+
+def shutdown_checker_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,187 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STAGING_PREFIX = ".staging-"
+LOCK_FILE = ".lock"  # In every entry, share-locked by each job using the build
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+class CompileCache:
+    """Size-bounded on-disk LRU cache of build directories.
+
+    Each entry is the directory a distinct source was built in, named by
+    ``key(language, code, flags)``. Entries are published with an atomic
+    rename, so concurrent builders never see a half-written one, and the
+    least recently used entries are removed once the cache outgrows
+    ``max_bytes``. A checked-out entry holds a shared ``flock`` on its lock
+    file and eviction only removes entries it can lock exclusively, so no
+    process sharing the cache directory loses a build it is running from.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or settings.COMPILE_CACHE_DIR
+        self.max_bytes = max_bytes or settings.COMPILE_CACHE_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+
+    @staticmethod
+    def key(language: str, code: str, flags: List[str]) -> str:
+        """Hash of everything that determines the build output"""
+        digest = hashlib.sha256()
+        for part in (language, *flags, code):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _open_lock(self, key: str) -> Optional[int]:
+        try:
+            return os.open(os.path.join(self._path(key), LOCK_FILE), os.O_RDONLY | os.O_CREAT, 0o644)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def _is_published(self, key: str, fd: int) -> bool:
+        """Whether ``fd`` is the lock file of the entry now published under ``key``"""
+        try:
+            current = os.stat(os.path.join(self._path(key), LOCK_FILE))
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(fd)
+        return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+    def _acquire(self, key: str) -> Optional[int]:
+        """Share-lock a cached build and mark it as recently used.
+
+        Returns the lock's file descriptor, to be closed once the build is
+        no longer in use, or ``None`` if there is no such build.
+        """
+        fd = self._open_lock(key)
+        if fd is None:
+            return None
+        # Eviction holds the exclusive lock only while it moves an entry aside
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        if not self._is_published(key, fd):
+            # Evicted between the open and the lock
+            os.close(fd)
+            return None
+        os.utime(self._path(key))
+        return fd
+
+    @asynccontextmanager
+    async def checkout(self, key: str, build: Callable[[str], Awaitable[None]]) -> AsyncIterator[str]:
+        """Yield the build directory for ``key``, building it on a miss.
+
+        ``build`` gets an empty directory to build in; if it raises, nothing
+        is cached. Concurrent checkouts of the same key build only once.
+        """
+        # Users are counted because a waiter woken by a release does not
+        # hold the lock yet; dropping it then would let a newcomer build too
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        built = False
+        try:
+            async with lock:
+                fd = self._acquire(key)
+                if fd is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    while fd is None:  # Another process may evict it right after publishing
+                        await self._build(key, build)
+                        fd = self._acquire(key)
+                    built = True
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+        try:
+            if built:
+                await asyncio.to_thread(self.evict)
+            yield self._path(key)
+        finally:
+            os.close(fd)
+
+    async def _build(self, key: str, build: Callable[[str], Awaitable[None]]):
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=self.root)
+        try:
+            await build(staging)
+            open(os.path.join(staging, LOCK_FILE), "a").close()
+            try:
+                os.rename(staging, self._path(key))
+            except OSError:
+                # Another process published the same build first
+                if not os.path.isdir(self._path(key)):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _remove(self, name: str) -> bool:
+        """Remove an entry unless a job in any process is using it"""
+        fd = self._open_lock(name)
+        if fd is None:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if not self._is_published(name, fd):
+                return False  # Already evicted, possibly rebuilt since
+            # Moved aside under the lock, so nobody can check it out while it is removed
+            trash = os.path.join(self.root, f"{STAGING_PREFIX}{name}-{os.urandom(4).hex()}")
+            os.rename(self._path(name), trash)
+        except BlockingIOError:
+            return False  # In use, here or in another process
+        finally:
+            os.close(fd)
+        shutil.rmtree(trash, ignore_errors=True)
+        return True
+
+    def evict(self):
+        """Remove least recently used builds until the cache fits in ``max_bytes``"""
+        try:
+            names = [name for name in os.listdir(self.root) if not name.startswith(STAGING_PREFIX)]
+        except FileNotFoundError:
+            return
+
+        entries = []
+        for name in names:
+            path = self._path(name)
+            try:
+                entries.append((os.stat(path).st_mtime, name, directory_size(path)))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if not self._remove(name):
+                continue
+            total -= size
+            logger.debug(f"Evicted build {name} ({size} bytes) from the compile cache")
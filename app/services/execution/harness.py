@@ -0,0 +1,175 @@
+"""Warm Python worker for the local execution backend.
+
+Run as ``python -I harness.py``. It must not import anything from ``app``:
+the interpreter runs isolated and outlives many submissions.
+
+Protocol: one JSON job per stdin line,
+``{"code": str, "tests": [{"stdin", "time_limit", "memory_limit", "output_limit"}]}``,
+answered by one JSON line on stdout, either ``{"error": str}`` when the
+code does not compile or ``{"results": [...]}`` with one entry per test.
+
+The code is compiled once per job; each test then runs in a child forked
+from this warm interpreter, with rlimits applied and stdio redirected to
+files, and is reaped with ``wait4`` for its CPU time and peak RSS. Each
+test runs in a scratch directory of its own, wiped once it ends. The
+harness is a child subreaper, so processes a test forks are reparented
+here when the test exits and are killed before the next test starts.
+"""
+import builtins
+import ctypes
+import json
+import math
+import os
+import resource
+import shutil
+import signal
+import sys
+import tempfile
+import traceback
+
+PR_SET_PDEATHSIG = 1
+PR_SET_CHILD_SUBREAPER = 36
+
+
+def prctl(option, value):
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(option, value, 0, 0, 0)
+    except (OSError, AttributeError):
+        pass  # Not Linux; killing the process group still applies
+
+
+def kill_orphans():
+    """Kill and reap every remaining child; only a test's leftovers are here"""
+    children = f"/proc/{os.getpid()}/task/{os.getpid()}/children"
+    while True:
+        try:
+            with open(children) as f:
+                pids = [int(pid) for pid in f.read().split()]
+        except OSError:
+            return
+        if not pids:
+            return
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+
+def run_test(program, test):
+    scratch = tempfile.mkdtemp(prefix="algotutor-test-")
+    try:
+        return run_in(program, test, scratch)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def run_in(program, test, workdir):
+    time_limit = test["time_limit"]
+    output_limit = test["output_limit"]
+    cpu_seconds = math.ceil(time_limit)
+
+    with tempfile.TemporaryFile(dir=workdir) as stdin_file, \
+            tempfile.TemporaryFile(dir=workdir) as stdout_file, \
+            tempfile.TemporaryFile(dir=workdir) as stderr_file:
+        stdin_file.write(test["stdin"].encode())
+        stdin_file.seek(0)
+
+        harness_pid = os.getpid()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                os.setsid()
+                # Die with the harness when the pool kills it mid-test
+                prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
+                if os.getppid() != harness_pid:
+                    os._exit(exit_code)
+                os.chdir(workdir)
+                resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+                resource.setrlimit(resource.RLIMIT_FSIZE, (output_limit, output_limit))
+                resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+                memory_bytes = test["memory_limit"] * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+                resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+                os.dup2(stdin_file.fileno(), 0)
+                os.dup2(stdout_file.fileno(), 1)
+                os.dup2(stderr_file.fileno(), 2)
+                # Drop everything else, including the protocol channel
+                os.closerange(3, resource.getrlimit(resource.RLIMIT_NOFILE)[0])
+                sys.stdin = open(0, "r", closefd=False)
+                sys.stdout = open(1, "w", closefd=False)
+                sys.stderr = open(2, "w", closefd=False)
+                try:
+                    exec(program, {"__name__": "__main__", "__builtins__": builtins})
+                    exit_code = 0
+                except SystemExit as e:
+                    exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except BaseException as e:
+                    # Skip the harness frame so the traceback starts in main.py
+                    traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(exit_code)
+
+        timed_out = []
+
+        def kill_group():
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        def on_alarm(signum, frame):
+            timed_out.append(True)
+            kill_group()
+
+        signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, time_limit * 2 + 1)
+        try:
+            _, exit_status, rusage = os.wait4(pid, 0)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        kill_group()
+        kill_orphans()
+
+        output_limit_hit = os.fstat(stdout_file.fileno()).st_size >= output_limit
+        stdout_file.seek(0)
+        stderr_file.seek(0)
+        return {
+            "exit_status": exit_status,
+            "cpu_time": rusage.ru_utime + rusage.ru_stime,
+            "max_rss": rusage.ru_maxrss,
+            "stdout": stdout_file.read(output_limit).decode(errors="replace"),
+            "stderr": stderr_file.read(output_limit).decode(errors="replace"),
+            "timed_out": bool(timed_out),
+            "output_limit_hit": output_limit_hit,
+        }
+
+
+def main():
+    # Keep the protocol channel private; children write to fd 1 freely
+    protocol_out = os.fdopen(os.dup(1), "w")
+    os.dup2(os.open(os.devnull, os.O_WRONLY), 1)
+    prctl(PR_SET_CHILD_SUBREAPER, 1)
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        try:
+            program = compile(job["code"], "main.py", "exec")
+        except (SyntaxError, ValueError):
+            response = {"error": traceback.format_exc(limit=0)}
+        else:
+            response = {"results": [run_test(program, test) for test in job["tests"]]}
+        protocol_out.write(json.dumps(response) + "\n")
+        protocol_out.flush()
+
+
+if __name__ == "__main__":
+    main()
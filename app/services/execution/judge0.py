@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Optional
+
+from app.services.execution.base import (
+    ExecutionBackend,
+    ExecutionRequest,
+    ExecutionResult,
+    ExecutionStatus
+)
+from app.services.execution.checker import apply_checker
+from app.services.judge0_client import Judge0Client, judge0_client
+
+JUDGE0_LANGUAGE_IDS = {
+    "python": 71,  # Python (3.8.1)
+    "java": 62,  # Java (OpenJDK 13.0.1)
+    "cpp": 54,  # C++ (GCC 9.2.0)
+    "javascript": 63,  # JavaScript (Node.js 12.14.0)
+}
+
+# Judge0 status id -> normalized status
+JUDGE0_STATUSES = {
+    3: ExecutionStatus.ACCEPTED,
+    4: ExecutionStatus.WRONG_ANSWER,
+    5: ExecutionStatus.TIME_LIMIT_EXCEEDED,
+    6: ExecutionStatus.COMPILATION_ERROR,
+    7: ExecutionStatus.RUNTIME_ERROR,  # SIGSEGV
+    8: ExecutionStatus.OUTPUT_LIMIT_EXCEEDED,  # SIGXFSZ
+    9: ExecutionStatus.RUNTIME_ERROR,  # SIGFPE
+    10: ExecutionStatus.RUNTIME_ERROR,  # SIGABRT
+    11: ExecutionStatus.RUNTIME_ERROR,  # NZEC
+    12: ExecutionStatus.RUNTIME_ERROR,  # Other
+}
+
+
+class Judge0Backend(ExecutionBackend):
+    """Runs code on the remote Judge0 CE API"""
+
+    name = "judge0"
+
+    def __init__(self, judge0: Optional[Judge0Client] = None):
+        self.judge0 = judge0 or judge0_client
+
+    @property
+    def batch_size(self) -> int:
+        return self.judge0.batch_size
+
+    def runtime(self, language: str) -> str:
+        # A Judge0 language id pins its compiler or interpreter version
+        return f"{self.name} {self.judge0.base_url} {JUDGE0_LANGUAGE_IDS[language]}"
+
+    def _build_submission_data(
+        self,
+        language: str,
+        code: str,
+        request: ExecutionRequest
+    ) -> Dict[str, Any]:
+        data = {
+            "source_code": code,
+            "language_id": JUDGE0_LANGUAGE_IDS[language],
+            "stdin": request.stdin,
+            "cpu_time_limit": request.time_limit,
+            "memory_limit": request.memory_limit
+        }
+        # No expected_output: Judge0 only runs the code, our checker compares
+        return data
+
+    def _to_result(self, submission: Dict[str, Any]) -> ExecutionResult:
+        status = submission["status"]
+        return ExecutionResult(
+            status=JUDGE0_STATUSES.get(status["id"], ExecutionStatus.INTERNAL_ERROR),
+            description=status.get("description", ""),
+            stdout=submission.get("stdout") or "",
+            stderr=submission.get("stderr") or "",
+            compile_output=submission.get("compile_output") or "",
+            message=submission.get("message"),
+            time=float(submission.get("time") or 0),
+            memory=float(submission.get("memory") or 0)
+        )
+
+    def _error_result(self, error: Any) -> ExecutionResult:
+        return ExecutionResult(
+            status=ExecutionStatus.INTERNAL_ERROR,
+            description="Internal Error",
+            message=f"Judge0 API error: {str(error)}"
+        )
+
+    async def run(self, language: str, code: str, request: ExecutionRequest) -> ExecutionResult:
+        try:
+            submission = await self.judge0.run(
+                self._build_submission_data(language, code, request)
+            )
+        except Exception as e:
+            return self._error_result(e)
+        return await apply_checker(self._to_result(submission), request)
+
+    async def run_many(
+        self,
+        language: str,
+        code: str,
+        requests: List[ExecutionRequest]
+    ) -> List[ExecutionResult]:
+        """Run every request through Judge0 batch submissions"""
+        try:
+            submissions = await self.judge0.run_batch([
+                self._build_submission_data(language, code, request)
+                for request in requests
+            ])
+        except Exception as e:
+            return [self._error_result(e) for _ in requests]
+
+        return [
+            self._error_result(submission["error"])
+            if "error" in submission else await apply_checker(self._to_result(submission), request)
+            for submission, request in zip(submissions, requests)
+        ]
@@ -0,0 +1,466 @@
+import asyncio
+import math
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.execution.base import (
+    ExecutionBackend,
+    ExecutionRequest,
+    ExecutionResult,
+    ExecutionStatus
+)
+from app.services.execution.checker import apply_checker
+from app.services.execution.compile_cache import CompileCache
+from app.services.execution.worker_pool import create_worker_pools
+
+# How to build and run each language. Compiled languages are built in a
+# compile cache entry and run from a fresh working directory with the
+# build referenced by path; interpreted ones run their source in place.
+# JVM and V8 reserve far more address space than they use, so for them the
+# heap is capped with runtime flags instead of RLIMIT_AS. They also start
+# helper threads, which RLIMIT_NPROC counts, so only the others are barred
+# from creating processes.
+LOCAL_LANGUAGES: Dict[str, Dict[str, Any]] = {
+    "python": {
+        "source": "main.py",
+        "run": [sys.executable, "-I", "main.py"],
+        "version": [sys.executable, "--version"],
+        "limit_address_space": True,
+        "limit_processes": True,
+    },
+    "javascript": {
+        "source": "main.js",
+        "run": ["node", "--max-old-space-size={memory_mb}", "main.js"],
+        "version": ["node", "--version"],
+        "limit_address_space": False,
+        "limit_processes": False,
+    },
+    "cpp": {
+        "source": "main.cpp",
+        "compile": ["g++", "-O2", "-std=c++17", "-o", "main", "main.cpp"],
+        "run": ["{build_dir}/main"],
+        "version": ["g++", "--version"],
+        "limit_address_space": True,
+        "limit_processes": True,
+    },
+    "java": {
+        "source": "Main.java",
+        "compile": ["javac", "-encoding", "UTF-8", "Main.java"],
+        "run": ["java", "-Xmx{memory_mb}m", "-Xss64m", "-cp", "{build_dir}", "Main"],
+        "version": ["java", "-version"],
+        "limit_address_space": False,
+        "limit_processes": False,
+    },
+}
+
+# Markers of allocation failures in stderr, for processes that die of them
+OUT_OF_MEMORY_MARKERS = ("MemoryError", "std::bad_alloc", "OutOfMemoryError", "heap out of memory")
+
+COMPILE_TIME_LIMIT = 30  # CPU seconds
+COMPILE_MEMORY_LIMIT = 1024 * 1024  # KB, for compilers that tolerate RLIMIT_AS
+COMPILE_OUTPUT_LIMIT = 256 * 1024 * 1024  # bytes per file the compiler writes
+COMPILE_ERROR_FILE = "compile_error.txt"  # Failed builds are cached too
+
+
+class ProcessOutcome:
+    """What a sandboxed process did, as reported by wait4"""
+
+    def __init__(
+        self,
+        exit_status: int,
+        cpu_time: float,
+        max_rss: float,
+        stdout: str,
+        stderr: str,
+        timed_out: bool,
+        output_limit_hit: bool
+    ):
+        self.exit_status = exit_status
+        self.cpu_time = cpu_time  # seconds
+        self.max_rss = max_rss  # KB
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+        self.output_limit_hit = output_limit_hit
+
+    @property
+    def signal(self) -> Optional[int]:
+        return os.WTERMSIG(self.exit_status) if os.WIFSIGNALED(self.exit_status) else None
+
+    @property
+    def exit_code(self) -> Optional[int]:
+        return os.WEXITSTATUS(self.exit_status) if os.WIFEXITED(self.exit_status) else None
+
+
+def run_sandboxed(
+    argv: List[str],
+    cwd: str,
+    stdin: str,
+    time_limit: float,
+    memory_limit: Optional[int],
+    output_limit: int,
+    limit_processes: bool = False
+) -> ProcessOutcome:
+    """Run a process under CPU/memory/output rlimits and collect its rusage.
+
+    Blocking; call it from a worker thread. ``memory_limit`` is in KB and
+    ``None`` leaves the address space unlimited. ``limit_processes`` stops
+    the process from forking (RLIMIT_NPROC is not enforced for root). A
+    wall-clock timer kills the process group if it sleeps instead of
+    burning CPU, and whatever is left of the group is killed once the
+    process exits.
+    """
+    cpu_seconds = math.ceil(time_limit)
+
+    def apply_limits():
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (output_limit, output_limit))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if memory_limit is not None:
+            memory_bytes = memory_limit * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        if limit_processes:
+            resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+    env = {"PATH": os.environ.get("PATH", "/usr/bin:/bin"), "HOME": cwd, "LANG": "C.UTF-8"}
+
+    with tempfile.TemporaryFile(dir=cwd) as stdin_file, \
+            tempfile.TemporaryFile(dir=cwd) as stdout_file, \
+            tempfile.TemporaryFile(dir=cwd) as stderr_file:
+        stdin_file.write(stdin.encode())
+        stdin_file.seek(0)
+
+        process = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            env=env,
+            stdin=stdin_file,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            preexec_fn=apply_limits,
+            start_new_session=True,
+            close_fds=True
+        )
+
+        timed_out = threading.Event()
+
+        def kill_group():
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        def kill():
+            timed_out.set()
+            kill_group()
+
+        timer = threading.Timer(time_limit * 2 + 1, kill)
+        timer.start()
+        try:
+            _, exit_status, rusage = os.wait4(process.pid, 0)
+        finally:
+            timer.cancel()
+            # Children it left behind must not outlive the run
+            kill_group()
+        # We reaped the child ourselves; keep Popen from waiting on it again
+        process.returncode = exit_status
+
+        # Some runtimes (CPython) ignore SIGXFSZ and fail the write instead
+        output_limit_hit = os.fstat(stdout_file.fileno()).st_size >= output_limit
+        stdout_file.seek(0)
+        stderr_file.seek(0)
+        return ProcessOutcome(
+            exit_status=exit_status,
+            cpu_time=rusage.ru_utime + rusage.ru_stime,
+            max_rss=rusage.ru_maxrss,  # KB on Linux
+            stdout=stdout_file.read(output_limit).decode(errors="replace"),
+            stderr=stderr_file.read(output_limit).decode(errors="replace"),
+            timed_out=timed_out.is_set(),
+            output_limit_hit=output_limit_hit
+        )
+
+
+def classify(outcome: ProcessOutcome, request: ExecutionRequest) -> ExecutionResult:
+    """Turn a finished process into a status for one request.
+
+    A clean exit is "accepted" here; ``apply_checker`` then compares its output.
+    """
+    result = dict(
+        stdout=outcome.stdout,
+        stderr=outcome.stderr,
+        time=outcome.cpu_time,
+        memory=outcome.max_rss
+    )
+
+    if outcome.timed_out or outcome.signal == signal.SIGXCPU or outcome.cpu_time > request.time_limit:
+        return ExecutionResult(
+            status=ExecutionStatus.TIME_LIMIT_EXCEEDED,
+            description="Time Limit Exceeded",
+            **result
+        )
+    if outcome.signal == signal.SIGXFSZ or outcome.output_limit_hit:
+        return ExecutionResult(
+            status=ExecutionStatus.OUTPUT_LIMIT_EXCEEDED,
+            description="Output Limit Exceeded",
+            **result
+        )
+    if outcome.max_rss > request.memory_limit or (
+        outcome.exit_status != 0 and any(m in outcome.stderr for m in OUT_OF_MEMORY_MARKERS)
+    ):
+        return ExecutionResult(
+            status=ExecutionStatus.MEMORY_LIMIT_EXCEEDED,
+            description="Memory Limit Exceeded",
+            **result
+        )
+    if outcome.signal is not None:
+        return ExecutionResult(
+            status=ExecutionStatus.RUNTIME_ERROR,
+            description=f"Runtime Error ({signal.Signals(outcome.signal).name})",
+            **result
+        )
+    if outcome.exit_code != 0:
+        return ExecutionResult(
+            status=ExecutionStatus.RUNTIME_ERROR,
+            description="Runtime Error (NZEC)",
+            **result
+        )
+    return ExecutionResult(status=ExecutionStatus.ACCEPTED, description="Accepted", **result)
+
+
+class LocalBackend(ExecutionBackend):
+    """Runs code as rlimit-sandboxed subprocesses on this machine.
+
+    Every program gets a private working directory. Compiled languages are
+    built once per distinct source into the on-disk compile cache, and
+    every request runs against that one build.
+    Languages with a warm worker pool (Python) skip interpreter startup and
+    run the whole batch inside one pre-started worker instead.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        max_parallel: Optional[int] = None,
+        output_limit: Optional[int] = None,
+        compile_cache: Optional[CompileCache] = None
+    ):
+        self.max_parallel = max_parallel or settings.LOCAL_EXECUTION_MAX_PARALLEL or os.cpu_count() or 1
+        self.output_limit = output_limit or settings.LOCAL_EXECUTION_OUTPUT_LIMIT
+        self._slots = asyncio.Semaphore(self.max_parallel)
+        self.pools = create_worker_pools()
+        self.compile_cache = compile_cache or CompileCache()
+        self._runtimes: Dict[str, str] = {}
+
+    def runtime(self, language: str) -> str:
+        """The backend name and the first line of the toolchain's version banner"""
+        if language not in self._runtimes:
+            try:
+                # Once per language and process; java prints its banner to stderr
+                banner = subprocess.run(
+                    LOCAL_LANGUAGES[language]["version"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    timeout=10
+                ).stdout
+            except (OSError, subprocess.SubprocessError):
+                banner = "unavailable"
+            version = banner.strip().splitlines()[0] if banner.strip() else "unknown"
+            self._runtimes[language] = f"{self.name} {version}"
+        return self._runtimes[language]
+
+    async def start(self):
+        for pool in self.pools.values():
+            await pool.start()
+
+    async def close(self):
+        for pool in self.pools.values():
+            await pool.close()
+
+    def _argv(self, command: List[str], request: ExecutionRequest, build_dir: Optional[str]) -> List[str]:
+        memory_mb = max(request.memory_limit // 1024, 16)
+        return [part.format(memory_mb=memory_mb, build_dir=build_dir) for part in command]
+
+    async def _execute(
+        self,
+        argv: List[str],
+        cwd: str,
+        stdin: str,
+        time_limit: float,
+        memory_limit: Optional[int],
+        limit_processes: bool = False,
+        output_limit: Optional[int] = None
+    ) -> ProcessOutcome:
+        async with self._slots:
+            return await asyncio.to_thread(
+                run_sandboxed,
+                argv,
+                cwd,
+                stdin,
+                time_limit,
+                memory_limit,
+                output_limit or self.output_limit,
+                limit_processes
+            )
+
+    async def _build(self, config: Dict[str, Any], code: str, build_dir: str):
+        """Compile the program in ``build_dir``, recording the output if it fails"""
+        with open(os.path.join(build_dir, config["source"]), "w") as f:
+            f.write(code)
+        outcome = await self._execute(
+            config["compile"],
+            build_dir,
+            "",
+            COMPILE_TIME_LIMIT,
+            COMPILE_MEMORY_LIMIT if config["limit_address_space"] else None,
+            output_limit=COMPILE_OUTPUT_LIMIT
+        )
+        if outcome.exit_status != 0:
+            with open(os.path.join(build_dir, COMPILE_ERROR_FILE), "w") as f:
+                f.write((outcome.stderr or outcome.stdout)[:self.output_limit])
+
+    def _checkout(self, language: str, code: str):
+        """Check out the cached build of ``code``, compiling it on a miss"""
+        config = LOCAL_LANGUAGES[language]
+        key = CompileCache.key(language, code, config["compile"])
+        return self.compile_cache.checkout(key, lambda build_dir: self._build(config, code, build_dir))
+
+    def _compile_error(self, build_dir: str) -> Optional[ExecutionResult]:
+        try:
+            with open(os.path.join(build_dir, COMPILE_ERROR_FILE)) as f:
+                compile_output = f.read()
+        except FileNotFoundError:
+            return None
+        return ExecutionResult(
+            status=ExecutionStatus.COMPILATION_ERROR,
+            description="Compilation Error",
+            compile_output=compile_output
+        )
+
+    async def compile(self, language: str, code: str) -> Optional[ExecutionResult]:
+        if "compile" not in LOCAL_LANGUAGES[language]:
+            return None
+        try:
+            async with self._checkout(language, code) as build_dir:
+                return self._compile_error(build_dir)
+        except Exception as e:
+            return self._internal_error(e)
+
+    async def run(self, language: str, code: str, request: ExecutionRequest) -> ExecutionResult:
+        return (await self.run_many(language, code, [request]))[0]
+
+    async def _run_on_pool(
+        self,
+        language: str,
+        code: str,
+        requests: List[ExecutionRequest]
+    ) -> List[ExecutionResult]:
+        """Run every request inside one warm worker"""
+        job = {
+            "code": code,
+            "tests": [
+                {
+                    "stdin": request.stdin,
+                    "time_limit": request.time_limit,
+                    "memory_limit": request.memory_limit,
+                    "output_limit": self.output_limit
+                }
+                for request in requests
+            ]
+        }
+        # Every test can run up to its wall-clock kill, plus some slack
+        timeout = sum(request.time_limit * 2 + 1 for request in requests) + 5
+
+        async with self._slots:
+            response = await self.pools[language].run(job, timeout)
+
+        if "error" in response:
+            # Same outcome as the interpreter failing to parse the file
+            return [
+                ExecutionResult(
+                    status=ExecutionStatus.RUNTIME_ERROR,
+                    description="Runtime Error (NZEC)",
+                    stderr=response["error"]
+                )
+                for _ in requests
+            ]
+        return [
+            await apply_checker(classify(ProcessOutcome(**outcome), request), request)
+            for outcome, request in zip(response["results"], requests)
+        ]
+
+    async def run_many(
+        self,
+        language: str,
+        code: str,
+        requests: List[ExecutionRequest]
+    ) -> List[ExecutionResult]:
+        if language in self.pools:
+            try:
+                return await self._run_on_pool(language, code, requests)
+            except Exception as e:
+                return self._internal_errors(e, requests)
+
+        config = LOCAL_LANGUAGES[language]
+        try:
+            if "compile" not in config:
+                return await self._run_each(config, code, requests, build_dir=None)
+
+            async with self._checkout(language, code) as build_dir:
+                compile_error = self._compile_error(build_dir)
+                if compile_error is not None:
+                    return [compile_error for _ in requests]
+                return await self._run_each(config, code, requests, build_dir)
+        except Exception as e:
+            return self._internal_errors(e, requests)
+
+    async def _run_each(
+        self,
+        config: Dict[str, Any],
+        code: str,
+        requests: List[ExecutionRequest],
+        build_dir: Optional[str]
+    ) -> List[ExecutionResult]:
+        """Run every request in a private working directory.
+
+        Without a ``build_dir`` the source itself is written there and run.
+        """
+        workdir = tempfile.mkdtemp(prefix="algotutor-run-")
+        try:
+            if build_dir is None:
+                with open(os.path.join(workdir, config["source"]), "w") as f:
+                    f.write(code)
+
+            results = []
+            for request in requests:
+                outcome = await self._execute(
+                    self._argv(config["run"], request, build_dir),
+                    workdir,
+                    request.stdin,
+                    request.time_limit,
+                    request.memory_limit if config["limit_address_space"] else None,
+                    config["limit_processes"]
+                )
+                results.append(await apply_checker(classify(outcome, request), request))
+            return results
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _internal_error(self, error: Exception) -> ExecutionResult:
+        return ExecutionResult(
+            status=ExecutionStatus.INTERNAL_ERROR,
+            description="Internal Error",
+            message=f"Local execution error: {str(error)}"
+        )
+
+    def _internal_errors(self, error: Exception, requests: List[ExecutionRequest]) -> List[ExecutionResult]:
+        return [self._internal_error(error) for _ in requests]
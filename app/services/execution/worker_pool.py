@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HARNESS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "harness.py")
+
+# Warm harness command per language. Only Python has one: a JVM cannot run
+# untrusted classes side by side and survive System.exit or leaked statics,
+# so Java keeps starting a fresh process per run.
+HARNESS_COMMANDS = {
+    "python": [sys.executable, "-I", HARNESS_PATH],
+}
+
+
+class WorkerCrashed(Exception):
+    """Raised when a warm worker dies or stops answering mid-job"""
+
+
+class WarmWorker:
+    """One pre-started harness process, reused for many jobs"""
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self.jobs_done = 0
+        self.healthy = True
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+            limit=64 * 1024 * 1024  # Responses carry every test's output
+        )
+
+    async def run(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a job and wait for its response"""
+        try:
+            self._process.stdin.write((json.dumps(job) + "\n").encode())
+            await self._process.stdin.drain()
+            line = await asyncio.wait_for(self._process.stdout.readline(), timeout)
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            self.healthy = False
+            raise WorkerCrashed(f"Worker did not answer: {type(e).__name__}") from e
+        except BaseException:
+            # Cancelled mid-job: its response is still on the way, and the
+            # next job would read it as its own
+            self.healthy = False
+            raise
+        if not line:
+            self.healthy = False
+            raise WorkerCrashed("Worker exited")
+
+        self.jobs_done += 1
+        return json.loads(line)
+
+    async def stop(self):
+        """Kill the worker together with any test still running in its session"""
+        if self._process is not None and self._process.returncode is None:
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await self._process.wait()
+
+
+class WorkerPool:
+    """Pre-started warm workers for one language.
+
+    Workers are recycled after ``max_jobs`` jobs, and after any crash or
+    limit violation in a job they ran.
+    """
+
+    def __init__(self, command: List[str], size: int, max_jobs: int):
+        self.command = command
+        self.size = size
+        self.max_jobs = max_jobs
+        self._idle: Optional[asyncio.Queue] = None
+
+    async def start(self):
+        """Fill the pool with started workers"""
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            await self._idle.put(await self._spawn())
+
+    async def _spawn(self) -> WarmWorker:
+        worker = WarmWorker(self.command)
+        await worker.start()
+        return worker
+
+    async def run(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Run a job on an idle worker"""
+        await self.start()
+        worker = await self._idle.get()
+        try:
+            response = await worker.run(job, timeout)
+            if self._needs_recycling(job, response):
+                worker.healthy = False
+            return response
+        finally:
+            if worker.healthy and worker.jobs_done < self.max_jobs:
+                await self._idle.put(worker)
+            else:
+                # Shielded, so a cancelled job still leaves the pool full
+                await asyncio.shield(self._replace(worker))
+
+    async def _replace(self, worker: WarmWorker):
+        await worker.stop()
+        await self._idle.put(await self._spawn())
+
+    def _needs_recycling(self, job: Dict[str, Any], response: Dict[str, Any]) -> bool:
+        """A test hit a time, output or memory limit or was killed by a signal"""
+        return any(
+            result["timed_out"]
+            or result["output_limit_hit"]
+            or os.WIFSIGNALED(result["exit_status"])
+            or result["max_rss"] > test["memory_limit"]
+            or (result["exit_status"] != 0 and "MemoryError" in result["stderr"])
+            for test, result in zip(job["tests"], response.get("results", []))
+        )
+
+    async def close(self):
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            await self._idle.get_nowait().stop()
+        self._idle = None
+
+
+def create_worker_pools() -> Dict[str, WorkerPool]:
+    """One pool per language with a warm harness, sized from settings"""
+    size = settings.LOCAL_WORKER_POOL_SIZE
+    if size <= 0:
+        return {}
+    return {
+        language: WorkerPool(command, size, settings.LOCAL_WORKER_MAX_JOBS)
+        for language, command in HARNESS_COMMANDS.items()
+    }
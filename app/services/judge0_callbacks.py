@@ -0,0 +1,87 @@
+import asyncio
+import base64
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Judge0 always base64-encodes these fields in callback bodies
+JUDGE0_ENCODED_FIELDS = ("stdout", "stderr", "compile_output", "message")
+
+
+def callbacks_enabled() -> bool:
+    """Callbacks need a public URL and a secret that authenticates them"""
+    return bool(settings.JUDGE0_CALLBACK_URL and settings.JUDGE0_CALLBACK_SECRET)
+
+
+def decode_callback_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode the base64 text fields of a Judge0 callback body"""
+    decoded = dict(payload)
+    for field in JUDGE0_ENCODED_FIELDS:
+        if decoded.get(field):
+            decoded[field] = base64.b64decode(decoded[field]).decode("utf-8", errors="replace")
+    return decoded
+
+
+class Judge0CallbackRegistry:
+    """Hands Judge0 callback results to the coroutines waiting for them.
+
+    A callback can arrive before the waiter has registered its token (the
+    submission may finish while the create request is still returning), so
+    unclaimed results are kept in a small bounded buffer.
+    """
+
+    def __init__(self, max_unclaimed: int = 10000):
+        self.max_unclaimed = max_unclaimed
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._unclaimed: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def resolve(self, token: str, result: Dict[str, Any]) -> bool:
+        """Deliver a result; returns True if a coroutine was waiting for it"""
+        waiter = self._waiters.pop(token, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(result)
+            return True
+
+        self._unclaimed[token] = result
+        while len(self._unclaimed) > self.max_unclaimed:
+            self._unclaimed.popitem(last=False)
+        return False
+
+    def _register(self, token: str) -> asyncio.Future:
+        waiter = asyncio.get_running_loop().create_future()
+        if token in self._unclaimed:
+            waiter.set_result(self._unclaimed.pop(token))
+        else:
+            self._waiters[token] = waiter
+        return waiter
+
+    async def wait(self, token: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the callback of one token, or None after ``timeout`` seconds"""
+        results = await self.wait_many([token], timeout)
+        return results.get(token)
+
+    async def wait_many(self, tokens: List[str], timeout: float) -> Dict[str, Dict[str, Any]]:
+        """Wait for the callbacks of several tokens; returns the ones that arrived"""
+        waiters = {token: self._register(token) for token in tokens}
+        if not waiters:
+            return {}
+        try:
+            await asyncio.wait(waiters.values(), timeout=timeout)
+        finally:
+            for token, waiter in waiters.items():
+                if not waiter.done():
+                    self._waiters.pop(token, None)
+                    waiter.cancel()
+
+        return {
+            token: waiter.result()
+            for token, waiter in waiters.items()
+            if waiter.done() and not waiter.cancelled()
+        }
+
+
+judge0_callbacks = Judge0CallbackRegistry()
@@ -0,0 +1,346 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.judge0_callbacks import Judge0CallbackRegistry, callbacks_enabled, judge0_callbacks
+
+logger = logging.getLogger(__name__)
+
+# Judge0 status ids for submissions that are still "In Queue" or "Processing"
+JUDGE0_PENDING_STATUSES = (1, 2)
+
+# Only ask Judge0 for the fields we use when reading results
+JUDGE0_RESULT_FIELDS = "token,stdout,stderr,compile_output,message,status,time,memory"
+
+
+class Judge0Error(Exception):
+    """Raised when Judge0 cannot be reached or does not return a result in time"""
+
+
+class Judge0Poller:
+    """Polls every in-flight Judge0 token of the process from one loop.
+
+    Waiters park on a future per token; the loop queries all outstanding
+    tokens with batched GETs, so poll traffic stays roughly constant no
+    matter how many submissions are being judged. The interval starts at
+    ``min_interval`` and backs off towards ``max_interval`` while nothing
+    finishes. The loop starts on the first token and exits when idle.
+    """
+
+    def __init__(
+        self,
+        client: "Judge0Client",
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        backoff: Optional[float] = None,
+        timeout: Optional[float] = None
+    ):
+        self.client = client
+        self.min_interval = min_interval or settings.JUDGE0_POLLER_MIN_INTERVAL_SECONDS
+        self.max_interval = max_interval or settings.JUDGE0_POLLER_MAX_INTERVAL_SECONDS
+        self.backoff = backoff or settings.JUDGE0_POLLER_BACKOFF
+        self.timeout = timeout or client.poll_interval * client.max_poll_attempts
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._interval = self.min_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait(self, token: str) -> Dict[str, Any]:
+        """Wait until the poller sees ``token`` finish"""
+        loop = asyncio.get_running_loop()
+        waiter = self._waiters.get(token)
+        if waiter is None or waiter.done():
+            waiter = loop.create_future()
+            self._waiters[token] = waiter
+            self._deadlines[token] = loop.time() + self.timeout
+            # New work: poll again soon
+            self._interval = self.min_interval
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return await waiter
+
+    async def wait_many(self, tokens: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Wait until the poller sees every token finish"""
+        results = await asyncio.gather(*(self.wait(token) for token in tokens))
+        return dict(zip(tokens, results))
+
+    async def stop(self):
+        """Stop the polling loop and fail anything still waiting"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for waiter in self._waiters.values():
+            if not waiter.done():
+                waiter.set_exception(Judge0Error("Judge0 poller stopped"))
+        self._waiters.clear()
+        self._deadlines.clear()
+
+    async def _run(self):
+        while self._waiters:
+            await asyncio.sleep(self._interval)
+            try:
+                finished = await self._poll_once()
+            except Exception as e:
+                logger.error(f"Judge0 poller error: {str(e)}")
+                finished = 0
+            if finished:
+                self._interval = self.min_interval
+            else:
+                self._interval = min(self._interval * self.backoff, self.max_interval)
+
+    def _pop(self, token: str) -> Optional[asyncio.Future]:
+        self._deadlines.pop(token, None)
+        return self._waiters.pop(token, None)
+
+    async def _poll_once(self) -> int:
+        """Query all outstanding tokens once; returns how many finished"""
+        now = asyncio.get_running_loop().time()
+        for token in list(self._waiters):
+            waiter = self._waiters[token]
+            if waiter.done():
+                # The waiting coroutine was cancelled
+                self._pop(token)
+            elif now > self._deadlines[token]:
+                self._pop(token).set_exception(
+                    Judge0Error(f"Submission {token} did not finish after {self.timeout}s")
+                )
+
+        finished = 0
+        tokens = list(self._waiters)
+        batch_size = self.client.batch_size
+        for start in range(0, len(tokens), batch_size):
+            try:
+                results = await self.client.get_batch(tokens[start:start + batch_size])
+            except Judge0Error as e:
+                logger.warning(f"Judge0 batch poll failed: {str(e)}")
+                continue
+            for result in results:
+                if not result or result["status"]["id"] in JUDGE0_PENDING_STATUSES:
+                    continue
+                waiter = self._pop(result["token"])
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(result)
+                    finished += 1
+
+        return finished
+
+
+class Judge0Client:
+    """Async Judge0 CE client sharing one keep-alive connection pool.
+
+    The app lifespan calls ``start()``/``close()``; code running outside the
+    API process (scripts, tests) gets a client lazily on first use.
+
+    When ``callback_url`` is set, submissions ask Judge0 to PUT their result
+    back to us and waiting falls back to polling only for results whose
+    callback does not arrive within ``callback_timeout`` seconds.
+
+    With ``central_poller`` (the default) all polling goes through one
+    shared ``Judge0Poller`` instead of a loop per waiting coroutine.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        api_host: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_poll_attempts: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        callback_url: Optional[str] = None,
+        callback_timeout: Optional[float] = None,
+        callbacks: Optional[Judge0CallbackRegistry] = None,
+        central_poller: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url or settings.JUDGE0_API_URL
+        self.headers = {
+            "x-rapidapi-key": api_key or settings.JUDGE0_API_KEY,
+            "x-rapidapi-host": api_host or settings.JUDGE0_API_HOST,
+            "content-type": "application/json"
+        }
+        self.timeout = timeout or settings.JUDGE0_TIMEOUT_SECONDS
+        self.max_connections = max_connections or settings.JUDGE0_MAX_CONNECTIONS
+        self.poll_interval = poll_interval or settings.JUDGE0_POLL_INTERVAL_SECONDS
+        self.max_poll_attempts = max_poll_attempts or settings.JUDGE0_MAX_POLL_ATTEMPTS
+        self.batch_size = batch_size or settings.JUDGE0_BATCH_SIZE
+        if callback_url is None:
+            callback_url = settings.JUDGE0_CALLBACK_URL if callbacks_enabled() else ""
+        self.callback_url = callback_url
+        self.callback_timeout = callback_timeout or settings.JUDGE0_CALLBACK_TIMEOUT_SECONDS
+        self.callbacks = callbacks or judge0_callbacks
+        if central_poller is None:
+            central_poller = settings.JUDGE0_CENTRAL_POLLER
+        self.poller = Judge0Poller(self) if central_poller else None
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        """Open the shared connection pool"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                transport=self._transport
+            )
+            logger.info(f"Judge0 client started for {self.base_url}")
+
+    async def close(self):
+        """Close the shared connection pool"""
+        if self.poller is not None:
+            await self.poller.stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Judge0 client closed")
+
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        if self._client is None:
+            await self.start()
+        try:
+            response = await self._client.request(method, url, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise Judge0Error(f"{method} {url} failed: {str(e)}") from e
+        return response.json()
+
+    def _with_callback(self, submission_data: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.callback_url:
+            return submission_data
+        callback_url = self.callback_url
+        if settings.JUDGE0_CALLBACK_SECRET:
+            callback_url += f"?secret={settings.JUDGE0_CALLBACK_SECRET}"
+        return {**submission_data, "callback_url": callback_url}
+
+    async def create_submission(self, submission_data: Dict[str, Any]) -> str:
+        """Create a submission and return its token"""
+        result = await self._request(
+            "POST",
+            "/submissions",
+            params={"base64_encoded": "false", "wait": "false"},
+            json=self._with_callback(submission_data)
+        )
+        return result["token"]
+
+    async def get_submission(self, token: str) -> Dict[str, Any]:
+        """Fetch the current state of a submission"""
+        return await self._request(
+            "GET",
+            f"/submissions/{token}",
+            params={"base64_encoded": "false", "fields": JUDGE0_RESULT_FIELDS}
+        )
+
+    async def wait_for_result(self, token: str) -> Dict[str, Any]:
+        """Wait for a submission's callback, or poll until Judge0 has finished with it"""
+        if self.callback_url:
+            result = await self.callbacks.wait(token, self.callback_timeout)
+            if result is not None:
+                return result
+            logger.warning(f"No Judge0 callback for {token}, falling back to polling")
+
+        if self.poller is not None:
+            return await self.poller.wait(token)
+
+        for _ in range(self.max_poll_attempts):
+            result = await self.get_submission(token)
+            if result["status"]["id"] not in JUDGE0_PENDING_STATUSES:
+                return result
+            await asyncio.sleep(self.poll_interval)
+
+        raise Judge0Error(
+            f"Submission {token} did not finish after {self.max_poll_attempts} polls"
+        )
+
+    async def run(self, submission_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a submission and wait for its result"""
+        token = await self.create_submission(submission_data)
+        return await self.wait_for_result(token)
+
+    async def create_batch(self, submissions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create up to ``batch_size`` submissions in one request.
+
+        Judge0 answers with one entry per submission, in order: either
+        ``{"token": ...}`` or the validation errors for that submission.
+        """
+        return await self._request(
+            "POST",
+            "/submissions/batch",
+            params={"base64_encoded": "false"},
+            json={"submissions": [self._with_callback(sub) for sub in submissions]}
+        )
+
+    async def get_batch(self, tokens: List[str]) -> List[Dict[str, Any]]:
+        """Fetch the current state of several submissions in one request"""
+        result = await self._request(
+            "GET",
+            "/submissions/batch",
+            params={
+                "tokens": ",".join(tokens),
+                "base64_encoded": "false",
+                "fields": JUDGE0_RESULT_FIELDS
+            }
+        )
+        return result["submissions"]
+
+    async def wait_for_batch(self, tokens: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Wait for a set of submissions, polling together for any without a callback"""
+        results: Dict[str, Dict[str, Any]] = {}
+        if self.callback_url:
+            results = await self.callbacks.wait_many(tokens, self.callback_timeout)
+        pending = [token for token in tokens if token not in results]
+        if not pending:
+            return results
+        if self.callback_url:
+            logger.warning(f"No Judge0 callback for {len(pending)} tokens, falling back to polling")
+
+        if self.poller is not None:
+            results.update(await self.poller.wait_many(pending))
+            return results
+
+        for _ in range(self.max_poll_attempts):
+            for start in range(0, len(pending), self.batch_size):
+                for result in await self.get_batch(pending[start:start + self.batch_size]):
+                    if result and result["status"]["id"] not in JUDGE0_PENDING_STATUSES:
+                        results[result["token"]] = result
+            pending = [token for token in pending if token not in results]
+            if not pending:
+                return results
+            await asyncio.sleep(self.poll_interval)
+
+        raise Judge0Error(
+            f"{len(pending)} batched submissions did not finish after "
+            f"{self.max_poll_attempts} polls"
+        )
+
+    async def run_batch(self, submissions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run many submissions with batched create and poll requests.
+
+        Returns one entry per submission, in order. Submissions rejected by
+        Judge0 come back as ``{"error": ...}`` instead of a result.
+        """
+        created: List[Dict[str, Any]] = []
+        for start in range(0, len(submissions), self.batch_size):
+            created += await self.create_batch(submissions[start:start + self.batch_size])
+
+        tokens = [entry["token"] for entry in created if "token" in entry]
+        results = await self.wait_for_batch(tokens) if tokens else {}
+
+        return [
+            results[entry["token"]] if "token" in entry else {"error": str(entry)}
+            for entry in created
+        ]
+
+
+judge0_client = Judge0Client()
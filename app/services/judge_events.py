@@ -0,0 +1,149 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.models.code_submission import CodeSubmission
+
+# Fields of a TestResult sent to clients
+TEST_RESULT_FIELDS = ("test_case_id", "passed", "execution_time", "memory_used", "output", "error", "is_hidden")
+
+# Submission fields in the final verdict event
+VERDICT_FIELDS = (
+    "status",
+    "total_passed",
+    "total_tests",
+    "execution_time",
+    "memory_used",
+    "stopped_after",
+    "compile_error",
+)
+
+FINAL_STATUSES = ("completed", "error")
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class JudgeEventBroker:
+    """In-process fan-out of judging progress to whoever streams a submission.
+
+    Events only reach subscribers in the process that judges the
+    submission; streams served elsewhere fall back to reading progress
+    from the database.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def publish(self, submission_id: str, event: str, data: Dict[str, Any]):
+        for queue in self._subscribers.get(submission_id, ()):
+            queue.put_nowait((event, data))
+
+    @contextmanager
+    def subscribe(self, submission_id: str) -> Iterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(submission_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers[submission_id]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[submission_id]
+
+
+judge_events = JudgeEventBroker()
+
+
+class ProgressTracker:
+    """What a stream has sent so far, so that events arriving from both the
+    broker and the database are sent once each"""
+
+    def __init__(self):
+        self.status: Optional[str] = None
+        self.sent_results: Set[str] = set()
+        self.finished = False
+
+    def accept(self, event: str, data: Dict[str, Any]) -> Optional[str]:
+        """The SSE message for an event, or None if it adds nothing"""
+        if self.finished:
+            return None
+        if event == "status":
+            if data["status"] == self.status:
+                return None
+            self.status = data["status"]
+        elif event == "result":
+            if data["test_case_id"] in self.sent_results:
+                return None
+            self.sent_results.add(data["test_case_id"])
+        elif event == "verdict":
+            self.status = data["status"]
+            self.finished = True
+        return format_sse(event, data)
+
+    def from_snapshot(self, submission: Dict[str, Any]) -> List[str]:
+        """Messages for whatever a stored submission shows that was not sent yet"""
+        events = [("status", {"status": submission["status"]})]
+        events += [
+            ("result", {field: result.get(field) for field in TEST_RESULT_FIELDS})
+            for result in submission.get("results") or []
+        ]
+        if submission["status"] in FINAL_STATUSES:
+            events.append(("verdict", {field: submission.get(field) for field in VERDICT_FIELDS}))
+        return [message for message in (self.accept(*event) for event in events) if message]
+
+
+async def load_progress(submission_id: str) -> Optional[Dict[str, Any]]:
+    """The stored submission without its code"""
+    return await CodeSubmission.get_motor_collection().find_one(
+        {"_id": PydanticObjectId(submission_id)},
+        {"code": 0}
+    )
+
+
+async def progress_stream(
+    submission_id: str,
+    poll_interval: Optional[float] = None,
+    broker: Optional[JudgeEventBroker] = None
+) -> AsyncIterator[str]:
+    """SSE messages for a submission: status changes, each test result and
+    a final verdict, after which the stream ends.
+
+    Events published in this process arrive immediately; when the judge
+    runs elsewhere, the stored submission is re-read every ``poll_interval``.
+    """
+    poll_interval = poll_interval or settings.JUDGE_STREAM_POLL_SECONDS
+    broker = broker or judge_events
+    tracker = ProgressTracker()
+
+    # Subscribe before the first read so nothing published in between is lost
+    with broker.subscribe(submission_id) as events:
+        submission = await load_progress(submission_id)
+        if submission is None:
+            return
+        for message in tracker.from_snapshot(submission):
+            yield message
+
+        while not tracker.finished:
+            try:
+                event, data = await asyncio.wait_for(events.get(), poll_interval)
+            except asyncio.TimeoutError:
+                submission = await load_progress(submission_id)
+                if submission is None:
+                    return
+                messages = tracker.from_snapshot(submission)
+                for message in messages:
+                    yield message
+                if not messages:
+                    yield ": keep-alive\n\n"
+                continue
+
+            message = tracker.accept(event, data)
+            if message:
+                yield message
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from beanie import PydanticObjectId
+from pymongo import ASCENDING, ReturnDocument
+
+from app.core.config import settings
+from app.models.code_submission import CodeSubmission
+from app.models.judge_job import JudgeJob
+
+logger = logging.getLogger(__name__)
+
+# Claim order between classes, first to last. Within a class, jobs are
+# ordered by how many jobs their user already had waiting, so a user who
+# queues 200 submissions gets one turn per round like everyone else.
+PRIORITY_CLASSES = {
+    "interactive": 0,  # Sample-test runs a learner is watching
+    "submit": 1,
+    "rejudge": 2,
+}
+
+
+def wait_percentiles(waits: List[float]) -> Dict[str, Any]:
+    """Summary of queue waits in ms, nearest-rank percentiles"""
+    waits = sorted(waits)
+
+    def percentile(p: float) -> float:
+        return waits[max(math.ceil(p / 100 * len(waits)) - 1, 0)]
+
+    return {
+        "claimed": len(waits),
+        "wait_p50_ms": percentile(50),
+        "wait_p95_ms": percentile(95),
+        "wait_p99_ms": percentile(99),
+        "wait_max_ms": waits[-1],
+    }
+
+
+class JudgeQueue:
+    """Durable queue of submissions to judge, stored in ``judge_jobs``.
+
+    Workers claim jobs with one atomic ``find_one_and_update`` that also
+    takes a lease. A worker keeps its lease alive with heartbeats; when a
+    worker dies, its lease runs out and another worker reclaims the job.
+    Failed jobs are retried with exponential backoff and parked as
+    ``dead`` after ``max_attempts``.
+
+    Jobs are claimed by priority class, then round-robin between users
+    (see ``PRIORITY_CLASSES``), then oldest first.
+    """
+
+    def __init__(
+        self,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_delay: Optional[float] = None
+    ):
+        self.lease_seconds = lease_seconds or settings.JUDGE_QUEUE_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.JUDGE_QUEUE_MAX_ATTEMPTS
+        self.retry_delay = retry_delay or settings.JUDGE_QUEUE_RETRY_DELAY_SECONDS
+        # Wakes workers in this process as soon as a job is enqueued here
+        self.new_work = asyncio.Event()
+
+    async def enqueue(
+        self,
+        submission_id: str,
+        user_id: Optional[str] = None,
+        priority_class: str = "submit"
+    ) -> JudgeJob:
+        if priority_class not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority_class}")
+
+        user = PydanticObjectId(user_id) if user_id else None
+        user_rank = 0
+        if user is not None:
+            user_rank = await JudgeJob.find({
+                "user": user,
+                "priority_class": priority_class,
+                "status": {"$in": ["queued", "running"]},
+            }).count()
+
+        job = JudgeJob(
+            submission=PydanticObjectId(submission_id),
+            user=user,
+            priority_class=priority_class,
+            priority=PRIORITY_CLASSES[priority_class],
+            user_rank=user_rank
+        )
+        await job.insert()
+        self.new_work.set()
+        return job
+
+    async def claim(self, worker_id: str) -> Optional[JudgeJob]:
+        """Take the next available job in claim order, or one whose lease has expired"""
+        while True:
+            now = datetime.utcnow()
+            document = await JudgeJob.get_motor_collection().find_one_and_update(
+                {
+                    "$or": [
+                        {"status": "queued", "available_at": {"$lte": now}},
+                        {"status": "running", "lease_expires_at": {"$lt": now}},
+                    ]
+                },
+                # Pipeline update, so the first claim time can be kept
+                [{"$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "heartbeat_at": now,
+                    "claimed_at": {"$ifNull": ["$claimed_at", now]},
+                    "attempts": {"$add": ["$attempts", 1]},
+                }}],
+                sort=[("priority", ASCENDING), ("user_rank", ASCENDING), ("available_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+            if document is None:
+                return None
+
+            job = JudgeJob.parse_obj(document)
+            if job.attempts <= self.max_attempts:
+                return job
+            # Its workers kept dying mid-job; stop handing it out
+            await self._dead_letter(job, "Lease expired on every attempt")
+
+    async def stats(self, since: datetime) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and queue-wait percentiles (ms) per priority class.
+
+        Waits cover jobs first claimed since ``since``.
+        """
+        stats = {
+            priority_class: {"queued": 0, "running": 0, "claimed": 0}
+            for priority_class in PRIORITY_CLASSES
+        }
+
+        depth = await JudgeJob.get_motor_collection().aggregate([
+            {"$match": {"status": {"$in": ["queued", "running"]}}},
+            {"$group": {"_id": {"class": "$priority_class", "status": "$status"}, "count": {"$sum": 1}}},
+        ]).to_list(None)
+        for row in depth:
+            stats.setdefault(row["_id"]["class"], {})[row["_id"]["status"]] = row["count"]
+
+        waits = await JudgeJob.get_motor_collection().aggregate([
+            {"$match": {"claimed_at": {"$gte": since}}},
+            {"$group": {
+                "_id": "$priority_class",
+                "waits": {"$push": {"$subtract": ["$claimed_at", "$created_at"]}},
+            }},
+        ]).to_list(None)
+        for row in waits:
+            stats.setdefault(row["_id"], {}).update(wait_percentiles(row["waits"]))
+
+        return stats
+
+    async def heartbeat(self, job: JudgeJob) -> bool:
+        """Extend the lease; False means the job was reclaimed by another worker"""
+        now = datetime.utcnow()
+        result = await JudgeJob.get_motor_collection().update_one(
+            {"_id": job.id, "worker_id": job.worker_id, "status": "running"},
+            {"$set": {
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "heartbeat_at": now,
+            }}
+        )
+        return result.matched_count == 1
+
+    async def complete(self, job: JudgeJob):
+        await self._finish(job, "done")
+
+    async def fail(self, job: JudgeJob, error: str, retry: bool = True):
+        """Put the job back for another attempt, or dead-letter it"""
+        if not retry or job.attempts >= self.max_attempts:
+            await self._dead_letter(job, error)
+            return
+
+        delay = self.retry_delay * 2 ** (job.attempts - 1)
+        await JudgeJob.get_motor_collection().update_one(
+            {"_id": job.id, "worker_id": job.worker_id},
+            {"$set": {
+                "status": "queued",
+                "available_at": datetime.utcnow() + timedelta(seconds=delay),
+                "worker_id": None,
+                "lease_expires_at": None,
+                "last_error": error,
+            }}
+        )
+
+    async def _dead_letter(self, job: JudgeJob, error: str):
+        """Park the job and fail its submission, so nobody waits on it forever"""
+        logger.error(f"Judge job {job.id} dead after {job.attempts} attempts: {error}")
+        await self._finish(job, "dead", error)
+        await CodeSubmission.get_motor_collection().update_one(
+            {"_id": job.submission, "status": {"$in": ["pending", "running"]}},
+            {"$set": {"status": "error", "completed_at": datetime.utcnow()}}
+        )
+
+    async def _finish(self, job: JudgeJob, status: str, error: Optional[str] = None):
+        update = {"status": status, "finished_at": datetime.utcnow(), "lease_expires_at": None}
+        if error is not None:
+            update["last_error"] = error
+        await JudgeJob.get_motor_collection().update_one(
+            {"_id": job.id, "worker_id": job.worker_id},
+            {"$set": update}
+        )
+
+
+judge_queue = JudgeQueue()
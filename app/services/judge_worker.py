@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Optional, Set
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.models.judge_job import JudgeJob
+from app.services.code_service import CodeExecutionService
+from app.services.judge_queue import JudgeQueue, judge_queue
+
+logger = logging.getLogger(__name__)
+
+
+class JudgeWorker:
+    """Claims judge jobs from the queue and judges up to ``concurrency`` at once.
+
+    Runs inside ``python -m app.worker``, or inside the API process when
+    ``JUDGE_EMBEDDED_WORKER`` is on.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JudgeQueue] = None,
+        service: Optional[CodeExecutionService] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None
+    ):
+        self.queue = queue or judge_queue
+        self.service = service or CodeExecutionService()
+        self.concurrency = concurrency or settings.JUDGE_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.JUDGE_QUEUE_POLL_SECONDS
+        self.heartbeat_interval = heartbeat_interval or settings.JUDGE_QUEUE_HEARTBEAT_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._stopping = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(self):
+        """Claim and judge jobs until ``stop`` is called"""
+        logger.info(f"Judge worker {self.worker_id} started")
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            try:
+                job = await self.queue.claim(self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to claim a judge job: {str(e)}")
+                job = None
+            if job is None:
+                self._slots.release()
+                await self._wait_for_work()
+                continue
+
+            task = asyncio.create_task(self._process(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _wait_for_work(self):
+        """Sleep until the poll interval passes, new work is enqueued here, or we stop"""
+        self.queue.new_work.clear()
+        waiters = [
+            asyncio.create_task(self.queue.new_work.wait()),
+            asyncio.create_task(self._stopping.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _process(self, job: JudgeJob):
+        # A retry picks up after a crash ("running") or a failure ("error")
+        claim_from = ("pending",) if job.attempts <= 1 else ("pending", "running", "error")
+        judging = asyncio.create_task(self.service.execute_submission(
+            str(job.submission),
+            claim_from=claim_from,
+            fence=f"{self.worker_id}:{job.attempts}"
+        ))
+        heartbeat = asyncio.create_task(self._heartbeat(job, judging))
+        try:
+            await judging
+        except asyncio.CancelledError:
+            if not heartbeat.done():
+                raise  # We are stopping, not the heartbeat
+            # Another worker owns the job now; leave it and its submission alone
+            logger.warning(f"Stopped judging job {job.id} after losing its lease")
+        except HTTPException as e:
+            # 4xx (submission or question gone) will not get better on retry
+            await self.queue.fail(job, str(e.detail), retry=e.status_code >= 500)
+        except Exception as e:
+            await self.queue.fail(job, str(e))
+        else:
+            await self.queue.complete(job)
+        finally:
+            heartbeat.cancel()
+            judging.cancel()
+            self._slots.release()
+
+    async def _heartbeat(self, job: JudgeJob, judging: asyncio.Task):
+        """Keep the lease alive, and cancel ``judging`` once it is lost"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await self.queue.heartbeat(job):
+                    logger.warning(f"Lost the lease on judge job {job.id}")
+                    judging.cancel()
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat for judge job {job.id} failed: {str(e)}")
+
+    async def stop(self):
+        """Stop claiming and wait for the jobs in hand to finish"""
+        self._stopping.set()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info(f"Judge worker {self.worker_id} stopped")
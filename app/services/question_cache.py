@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.models.question import Question
+
+
+class QuestionCache:
+    """In-process LRU cache of questions, by id and by slug.
+
+    Entries expire after ``ttl`` seconds, which bounds how long another
+    process's edits go unseen; edits made in this process invalidate
+    right away. Concurrent misses on one key share a single database read.
+
+    Cached questions are shared between callers and must not be modified;
+    write paths load their own copy from the database. The one exception
+    is the like and dislike counters, which ``add_to_counters`` keeps up
+    to date in place rather than dropping the hottest questions on every
+    click.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries or settings.QUESTION_CACHE_MAX_ENTRIES
+        self.ttl = settings.QUESTION_CACHE_TTL_SECONDS if ttl is None else ttl
+        self._entries: "OrderedDict[str, Tuple[float, Question]]" = OrderedDict()
+        self._slugs: Dict[str, str] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        # When each key was last invalidated, on a clock that ticks per
+        # invalidation, so loads of that key started earlier are not stored.
+        # Only loads in flight read it, so it is emptied whenever none are.
+        self._clock = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, question_id: Any) -> Optional[Question]:
+        question_id = str(question_id)
+        return await self._get(
+            question_id,
+            f"id:{question_id}",
+            lambda: Question.get(PydanticObjectId(question_id))
+        )
+
+    async def get_by_slug(self, slug: str) -> Optional[Question]:
+        return await self._get(
+            self._slugs.get(slug),
+            f"slug:{slug}",
+            lambda: Question.find_one({"title_slug": slug})
+        )
+
+    async def _get(
+        self,
+        question_id: Optional[str],
+        load_key: str,
+        load: Callable[[], Awaitable[Optional[Question]]]
+    ) -> Optional[Question]:
+        entry = self._entries.get(question_id) if question_id else None
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(question_id)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        if load_key in self._loading:
+            return await asyncio.shield(self._loading[load_key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[load_key] = future
+        started_at = self._clock
+        try:
+            question = await load()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get it too; mark it retrieved in case there are none
+            future.exception()
+            raise
+        else:
+            if question is not None and not self._invalidated_since(started_at, load_key, question):
+                self._store(question)
+            future.set_result(question)
+            return question
+        finally:
+            del self._loading[load_key]
+            if not self._loading:
+                self._invalidated_at.clear()
+
+    def _invalidated_since(self, started_at: int, load_key: str, question: Question) -> bool:
+        """Whether the question was invalidated, under any of its keys, after a load started"""
+        keys = ("*", load_key, f"id:{question.id}", f"slug:{question.title_slug}")
+        return any(self._invalidated_at.get(key, -1) > started_at for key in keys)
+
+    def _mark_invalidated(self, *keys: str):
+        if not self._loading:
+            return
+        self._clock += 1
+        for key in keys:
+            self._invalidated_at[key] = self._clock
+
+    def _store(self, question: Question):
+        question_id = str(question.id)
+        self._entries[question_id] = (time.monotonic() + self.ttl, question)
+        self._entries.move_to_end(question_id)
+        self._slugs[question.title_slug] = question_id
+        while len(self._entries) > self.max_entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            if self._slugs.get(evicted.title_slug) == str(evicted.id):
+                del self._slugs[evicted.title_slug]
+
+    def invalidate(self, question_id: Any = None, slug: Optional[str] = None):
+        """Drop a question, by id and/or slug, after it was written"""
+        keys = []
+        if slug is not None:
+            keys.append(f"slug:{slug}")
+            question_id = question_id or self._slugs.get(slug)
+            self._slugs.pop(slug, None)
+        if question_id is not None:
+            keys.append(f"id:{question_id}")
+            entry = self._entries.pop(str(question_id), None)
+            if entry is not None:
+                keys.append(f"slug:{entry[1].title_slug}")
+                if self._slugs.get(entry[1].title_slug) == str(question_id):
+                    del self._slugs[entry[1].title_slug]
+        self._mark_invalidated(*keys)
+
+    def add_to_counters(self, question_id: Any, increments: Dict[str, int]):
+        """Apply increments already written to the database to a cached question.
+
+        A load in flight may still store the counts from before them; the
+        TTL bounds how long that lasts.
+        """
+        entry = self._entries.get(str(question_id))
+        if entry is None:
+            return
+        question = entry[1]
+        for field, amount in increments.items():
+            setattr(question, field, getattr(question, field) + amount)
+
+    def clear(self):
+        self._mark_invalidated("*")
+        self._entries.clear()
+        self._slugs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+question_cache = QuestionCache()
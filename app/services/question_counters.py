@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Dict, Optional
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.models.question import Question
+from app.services.question_cache import question_cache
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ("likes", "dislikes")
+
+
+class QuestionCounters:
+    """Like and dislike counts, changed with atomic ``$inc`` updates only.
+
+    With ``write_behind``, increments are summed in memory per question
+    and written every ``flush_interval`` seconds in one ``bulk_write``, so
+    a burst of clicks on one question costs one update. Counts not yet
+    flushed are lost if the process dies.
+    """
+
+    def __init__(self, write_behind: Optional[bool] = None, flush_interval: Optional[float] = None):
+        self.write_behind = settings.QUESTION_COUNTERS_WRITE_BEHIND if write_behind is None else write_behind
+        self.flush_interval = flush_interval or settings.QUESTION_COUNTERS_FLUSH_SECONDS
+        self._pending: Counter = Counter()  # (question id, field) -> increment
+        self._task: Optional[asyncio.Task] = None
+
+    async def increment(self, question_id: str, field: str, amount: int = 1) -> bool:
+        """Add to a counter; False if there is no such question"""
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"Unknown counter: {field}")
+
+        if not self.write_behind:
+            result = await Question.get_motor_collection().update_one(
+                {"_id": PydanticObjectId(question_id)},
+                {"$inc": {field: amount}}
+            )
+            if result.matched_count:
+                question_cache.add_to_counters(question_id, {field: amount})
+            return bool(result.matched_count)
+
+        # Usually answered from the question cache, not the database
+        if await question_cache.get(question_id) is None:
+            return False
+        self._pending[(str(question_id), field)] += amount
+        return True
+
+    async def flush(self):
+        """Write the buffered increments, one update per question"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, Counter()
+
+        increments: Dict[str, Dict[str, int]] = {}
+        for (question_id, field), amount in pending.items():
+            increments.setdefault(question_id, {})[field] = amount
+        try:
+            await Question.get_motor_collection().bulk_write(
+                [
+                    UpdateOne({"_id": PydanticObjectId(question_id)}, {"$inc": fields})
+                    for question_id, fields in increments.items()
+                ],
+                ordered=False
+            )
+        except Exception as e:
+            logger.error(f"Failed to flush question counters, will retry: {str(e)}")
+            self._pending.update(pending)
+            return
+        for question_id, fields in increments.items():
+            question_cache.add_to_counters(question_id, fields)
+
+    def start(self):
+        if self.write_behind and self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def stop(self):
+        """Stop flushing periodically and write what is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+question_counters = QuestionCounters()
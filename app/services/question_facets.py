@@ -0,0 +1,119 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.question import Question
+
+# Normalized filters: level, then sorted, deduplicated topics and companies
+FacetKey = Tuple[Optional[str], Tuple[str, ...], Tuple[str, ...]]
+
+
+def facet_key(
+    level: Optional[str] = None,
+    topics: Optional[List[str]] = None,
+    companies: Optional[List[str]] = None
+) -> FacetKey:
+    return level or None, tuple(sorted(set(topics or ()))), tuple(sorted(set(companies or ())))
+
+
+def facet_pipeline(key: FacetKey) -> List[Dict[str, Any]]:
+    """One aggregation counting questions per level, topic and company.
+
+    Topic and company filters narrow every facet. The level filter is
+    left out of the level facet, so the sidebar still shows how many
+    questions each other level would give.
+    """
+    level, topics, companies = key
+    match: Dict[str, Any] = {}
+    if topics:
+        match["topics"] = {"$all": list(topics)}
+    if companies:
+        match["companies"] = {"$all": list(companies)}
+    level_match = [{"$match": {"level": level}}] if level else []
+
+    return [
+        {"$match": match},
+        {"$facet": {
+            "total": level_match + [{"$count": "count"}],
+            "level": [{"$sortByCount": "$level"}],
+            "topics": level_match + [{"$unwind": "$topics"}, {"$sortByCount": "$topics"}],
+            "companies": level_match + [{"$unwind": "$companies"}, {"$sortByCount": "$companies"}],
+        }},
+    ]
+
+
+def facet_counts(row: Dict[str, Any]) -> Dict[str, Any]:
+    """The ``$facet`` output as ``{facet: {value: count}}``, largest counts first"""
+    counts = {
+        facet: {bucket["_id"]: bucket["count"] for bucket in row.get(facet, []) if bucket["_id"] is not None}
+        for facet in ("level", "topics", "companies")
+    }
+    counts["total"] = row["total"][0]["count"] if row.get("total") else 0
+    return counts
+
+
+class QuestionFacetCache:
+    """Facet counts per normalized filter set, cached until questions change.
+
+    Question writes in this process clear the cache; entries also expire
+    after ``ttl`` seconds to pick up writes made by other processes.
+    Concurrent misses on one filter set share a single aggregation.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 256):
+        self.ttl = settings.QUESTION_FACETS_TTL_SECONDS if ttl is None else ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[FacetKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._loading: Dict[FacetKey, asyncio.Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def counts(
+        self,
+        level: Optional[str] = None,
+        topics: Optional[List[str]] = None,
+        companies: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        key = facet_key(level, topics, companies)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        if key in self._loading:
+            return await asyncio.shield(self._loading[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        generation = self._generation
+        try:
+            rows = await Question.get_motor_collection().aggregate(facet_pipeline(key)).to_list(None)
+            counts = facet_counts(rows[0] if rows else {})
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get it too; mark it retrieved in case there are none
+            future.exception()
+            raise
+        else:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, counts)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            future.set_result(counts)
+            return counts
+        finally:
+            del self._loading[key]
+
+    def invalidate(self):
+        """Drop every entry; any question write can change any count"""
+        self._generation += 1
+        self._entries.clear()
+
+
+question_facets = QuestionFacetCache()
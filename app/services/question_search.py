@@ -0,0 +1,250 @@
+import asyncio
+import bisect
+import heapq
+import html
+import logging
+import math
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.question import Question
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of a term occurrence in each field
+FIELD_WEIGHTS = {"title": 5.0, "topics": 3.0, "companies": 3.0, "content": 1.0}
+
+# Fields each search hit carries besides its score and highlights
+HIT_FIELDS = ("title", "title_slug", "level", "topics", "companies")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to with you your".split()
+)
+
+# Share of an exact match's score given to a term that only starts with the query term
+PREFIX_WEIGHT = 0.5
+# Most index terms one query term expands to by prefix
+MAX_PREFIX_TERMS = 50
+
+SNIPPET_CHARS = 160
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TAGS = re.compile(r"<[^>]+>")
+_TOKENS = re.compile(r"[a-z0-9]+")
+
+
+def plain_text(content: str) -> str:
+    """Question content (HTML or markdown) as plain text"""
+    return " ".join(html.unescape(_TAGS.sub(" ", content or "")).split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKENS.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class QuestionSearchIndex:
+    """In-memory inverted index over question titles, content, topics and companies.
+
+    Hits are ranked by BM25 over field-weighted term frequencies; every
+    query term also matches index terms it is a prefix of ("dyn" finds
+    "dynamic"), at a lower weight. The index is built from the database on
+    first use, kept current by this process's question writes, and rebuilt
+    every ``refresh_seconds`` to pick up writes made by other processes.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        self.refresh_seconds = refresh_seconds or settings.QUESTION_SEARCH_REFRESH_SECONDS
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: List[str] = []  # Sorted, for prefix lookups
+        self._lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._document_terms: Dict[str, List[str]] = {}
+        self._weights: Dict[str, Dict[str, float]] = {}
+        self._built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Writes seen while a rebuild runs, applied again to the rebuilt index
+        self._replay: Optional[List[Tuple[str, Any]]] = None
+
+    def upsert(self, question: Any):
+        """Index a question, replacing whatever was indexed for it before"""
+        if self._replay is not None:
+            self._replay.append(("upsert", question))
+        question_id = str(question.id)
+        self._remove(question_id)
+        self._weights.clear()
+
+        document = {field: getattr(question, field, None) for field in HIT_FIELDS}
+        document["content"] = plain_text(getattr(question, "content", ""))
+        frequencies: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = document[field] or ""
+            for token in tokenize(" ".join(value) if isinstance(value, list) else value):
+                frequencies[token] += weight
+
+        for term, frequency in frequencies.items():
+            if term not in self._postings:
+                self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            self._postings[term][question_id] = frequency
+        self._documents[question_id] = document
+        self._document_terms[question_id] = list(frequencies)
+        self._lengths[question_id] = sum(frequencies.values())
+        self._total_length += self._lengths[question_id]
+
+    def remove(self, question_id: Any):
+        if self._replay is not None:
+            self._replay.append(("remove", question_id))
+        self._remove(str(question_id))
+
+    def _remove(self, question_id: str):
+        if question_id not in self._documents:
+            return
+        self._weights.clear()
+        del self._documents[question_id]
+        self._total_length -= self._lengths.pop(question_id)
+        for term in self._document_terms.pop(question_id):
+            postings = self._postings[term]
+            del postings[question_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def _expand(self, term: str) -> Iterable[Tuple[str, float]]:
+        """Index terms matching a query term, with the weight of the match"""
+        start = bisect.bisect_left(self._terms, term)
+        for candidate in self._terms[start:start + MAX_PREFIX_TERMS]:
+            if not candidate.startswith(term):
+                break
+            yield candidate, 1.0 if candidate == term else PREFIX_WEIGHT
+
+    def _term_weights(self, term: str) -> Dict[str, float]:
+        """BM25 weight of a term in each question containing it, cached until the next write"""
+        weights = self._weights.get(term)
+        if weights is None:
+            postings = self._postings[term]
+            count = len(self._documents)
+            average_length = self._total_length / count or 1.0
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            weights = self._weights[term] = {
+                question_id: idf * frequency * (K1 + 1) / (
+                    frequency + K1 * (1 - B + B * self._lengths[question_id] / average_length)
+                )
+                for question_id, frequency in postings.items()
+            }
+        return weights
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._documents:
+            return []
+
+        expanded = [match for term in terms for match in self._expand(term)]
+        scores: Dict[str, float] = {}
+        for index_term, weight in expanded:
+            for question_id, term_weight in self._term_weights(index_term).items():
+                scores[question_id] = scores.get(question_id, 0.0) + weight * term_weight
+
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [
+            self._hit(question_id, score, [t for t, _ in expanded if question_id in self._postings[t]])
+            for question_id, score in ranked
+        ]
+
+    def _hit(self, question_id: str, score: float, terms: Iterable[str]) -> Dict[str, Any]:
+        document = self._documents[question_id]
+        pattern = re.compile(
+            r"\b(" + "|".join(sorted(map(re.escape, terms), key=len, reverse=True)) + r")\w*",
+            re.IGNORECASE
+        )
+        hit = {field: document[field] for field in HIT_FIELDS}
+        hit.update({
+            "_id": question_id,
+            "score": round(score, 4),
+            "highlights": {
+                "title": highlight(document["title"] or "", pattern),
+                "content": highlight(snippet(document["content"], pattern), pattern),
+            },
+        })
+        return hit
+
+    async def ensure_current(self):
+        """Build the index on first use; later, refresh it in the background
+        once it is older than ``refresh_seconds``"""
+        if self._built_at is None:
+            async with self._lock:
+                if self._built_at is None:
+                    await self.rebuild()
+        elif time.monotonic() - self._built_at >= self.refresh_seconds and not self._lock.locked():
+            # Searches keep using the current index until the fresh one is ready
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self):
+        async with self._lock:
+            if time.monotonic() - self._built_at < self.refresh_seconds:
+                return
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Failed to rebuild the question search index: {str(e)}")
+
+    async def rebuild(self):
+        fresh = QuestionSearchIndex(self.refresh_seconds)
+        projection = {field: 1 for field in HIT_FIELDS + ("content",)}
+        self._replay = []
+        try:
+            async for document in Question.get_motor_collection().find({}, projection):
+                fresh.upsert(_Indexed(document))
+            for operation, argument in self._replay:
+                getattr(fresh, operation)(argument)
+        finally:
+            self._replay = None
+        # Swap in the finished index; searches never see a half-built one
+        self._postings, self._terms = fresh._postings, fresh._terms
+        self._lengths, self._total_length = fresh._lengths, fresh._total_length
+        self._documents, self._document_terms = fresh._documents, fresh._document_terms
+        self._weights = fresh._weights
+        self._built_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"questions": len(self._documents), "terms": len(self._terms)}
+
+
+class _Indexed:
+    """Attribute access to a raw question document"""
+
+    def __init__(self, document: Dict[str, Any]):
+        self.id = document["_id"]
+        for field in HIT_FIELDS + ("content",):
+            setattr(self, field, document.get(field))
+
+
+def snippet(text: str, pattern: "re.Pattern") -> str:
+    """Up to ``SNIPPET_CHARS`` of ``text`` around the first match"""
+    match = pattern.search(text)
+    start = 0 if match is None else max(match.start() - SNIPPET_CHARS // 3, 0)
+    if start:
+        # Start on a word boundary
+        start = text.find(" ", start) + 1 or start
+    end = start + SNIPPET_CHARS
+    return ("…" if start else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+def highlight(text: str, pattern: "re.Pattern") -> str:
+    """HTML-escaped ``text`` with matches wrapped in <mark>"""
+    parts, last = [], 0
+    for match in pattern.finditer(text):
+        parts += [html.escape(text[last:match.start()]), f"<mark>{html.escape(match.group(0))}</mark>"]
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
+
+
+question_search = QuestionSearchIndex()
@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.models.cached_result import CachedResult
+from app.services.execution import ExecutionRequest, ExecutionResult, ExecutionStatus
+
+logger = logging.getLogger(__name__)
+
+# Verdicts that depend only on the code and the test case. Time limits and
+# internal errors can flip with machine load, so they are always re-run.
+CACHEABLE_STATUSES = {
+    ExecutionStatus.ACCEPTED,
+    ExecutionStatus.WRONG_ANSWER,
+    ExecutionStatus.MEMORY_LIMIT_EXCEEDED,
+    ExecutionStatus.OUTPUT_LIMIT_EXCEEDED,
+    ExecutionStatus.RUNTIME_ERROR,
+    ExecutionStatus.COMPILATION_ERROR,
+}
+
+
+def normalize_source(code: str) -> str:
+    """Normalize line endings and trailing whitespace at the end of the file.
+
+    Nothing inside the program is touched, so equal normalized sources
+    always behave the same.
+    """
+    return code.replace("\r\n", "\n").replace("\r", "\n").rstrip()
+
+
+def result_cache_key(runtime: str, language: str, code: str, request: ExecutionRequest) -> str:
+    """Hash of the runtime, the normalized source, the language and the run's input and limits.
+
+    ``runtime`` comes from the execution backend, so a verdict from one
+    backend or toolchain version is never reused on another.
+    The expected output is left out: cached results are raw runs, checked
+    again on every hit, so a changed expected output or checker still counts.
+    """
+    digest = hashlib.sha256()
+    for part in (
+        runtime,
+        language,
+        normalize_source(code),
+        request.stdin,
+        str(request.time_limit),
+        str(request.memory_limit),
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def raw_run(result: ExecutionResult) -> ExecutionResult:
+    """The run before the checker: a wrong answer is a clean run too"""
+    if result.status == ExecutionStatus.WRONG_ANSWER:
+        return result.copy(update={"status": ExecutionStatus.ACCEPTED, "description": "Accepted"})
+    return result
+
+
+class ResultCache:
+    """Execution results for (code, language, test case), in two tiers.
+
+    Lookups check a per-process LRU first and then the ``result_cache``
+    collection, whose TTL index expires entries after ``ttl`` seconds.
+    The database tier is best effort: if it fails, judging carries on
+    as if every lookup missed.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        persistent: bool = True
+    ):
+        self.max_entries = max_entries or settings.RESULT_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.RESULT_CACHE_TTL_SECONDS
+        self.persistent = persistent
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, ExecutionResult]]" = OrderedDict()
+
+    def _get_local(self, key: str) -> Optional[ExecutionResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _put_local(self, key: str, result: ExecutionResult, ttl: Optional[float] = None):
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, ExecutionResult]:
+        """Cached results for whichever of ``keys`` are present"""
+        found = {}
+        for key in keys:
+            result = self._get_local(key)
+            if result is not None:
+                found[key] = result
+
+        missing = [key for key in keys if key not in found]
+        if missing and self.persistent:
+            try:
+                oldest = datetime.utcnow() - timedelta(seconds=self.ttl)
+                documents = await CachedResult.find(
+                    {"key": {"$in": missing}, "created_at": {"$gte": oldest}}
+                ).to_list()
+            except Exception as e:
+                logger.warning(f"Result cache lookup failed: {str(e)}")
+                documents = []
+            for document in documents:
+                result = ExecutionResult(**document.result)
+                # Keep the promoted entry no longer than the stored one lives
+                remaining = self.ttl - (datetime.utcnow() - document.created_at).total_seconds()
+                self._put_local(document.key, result, ttl=remaining)
+                found[document.key] = result
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def put_many(self, results: Dict[str, ExecutionResult]):
+        """Store results whose verdict can be reused, as raw runs"""
+        results = {
+            key: raw_run(result) for key, result in results.items()
+            if result.status in CACHEABLE_STATUSES
+        }
+        if not results:
+            return
+
+        for key, result in results.items():
+            self._put_local(key, result)
+
+        if not self.persistent:
+            return
+        now = datetime.utcnow()
+        try:
+            await CachedResult.get_motor_collection().bulk_write(
+                [
+                    UpdateOne(
+                        {"key": key},
+                        {"$set": {"result": {**result.dict(), "status": result.status.value}, "created_at": now}},
+                        upsert=True
+                    )
+                    for key, result in results.items()
+                ],
+                ordered=False
+            )
+        except Exception as e:
+            logger.warning(f"Result cache write failed: {str(e)}")
+
+    def clear(self):
+        self._entries.clear()
+
+
+result_cache = ResultCache()
@@ -11,6 +11,9 @@ from app.core.config import settings
 from app.main import app
 from app.models.code_submission import CodeSubmission, TestResult
 from app.models.question import Question
+from app.models.cached_result import CachedResult
+from app.models.judge_job import JudgeJob
+from app.models.rate_limit_bucket import RateLimitBucket
 from app.schemas.question import CodeSnippet, TestCase
 from app.models.user import User
 from app.services.auth_service import AuthService
@@ -23,7 +26,7 @@ async def setup_db():
     db = motor_client[test_db_name]
 
     print(f"DEBUG: Initializing Beanie with DB: {db.name} at {datetime.utcnow()}")
-    document_models = [User, Question, CodeSubmission, TestResult]
+    document_models = [User, Question, CodeSubmission, TestResult, CachedResult, JudgeJob, RateLimitBucket]
     await init_beanie(
         database=db,
         document_models=document_models
@@ -66,6 +66,28 @@ async def test_list_questions_with_filters(client: AsyncClient, test_question):
     assert len(data) > 0
     assert all("math" in q["topics"] for q in data)
 
+async def test_list_questions_returns_summaries(client: AsyncClient, test_question):
+    response = await client.get("/api/v1/questions/")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) > 0
+    assert "title_slug" in data[0]
+    assert "content" not in data[0]
+    assert "test_cases" not in data[0]
+
+async def test_sparse_fieldsets(client: AsyncClient, test_question):
+    response = await client.get("/api/v1/questions/?fields=title,level")
+    assert response.status_code == 200
+    assert set(response.json()[0]) == {"_id", "title", "level"}
+
+    question = await Question.find_one({"title": test_question["title"]})
+    response = await client.get(f"/api/v1/questions/{question.id}?fields=content")
+    assert response.status_code == 200
+    assert response.json() == {"_id": str(question.id), "content": question.content}
+
+    response = await client.get("/api/v1/questions/?fields=title,nope")
+    assert response.status_code == 400
+
 async def test_get_question(client: AsyncClient, test_question):
     question = await Question.find_one({"title": test_question["title"]})
     response = await client.get(f"/api/v1/questions/{question.id}")
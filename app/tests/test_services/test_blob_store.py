@@ -0,0 +1,85 @@
+import os
+import pytest
+from app.schemas.question import TestCase
+from app.services.blob_store import (
+    BlobNotFoundError,
+    BlobStore,
+    LocalBlobStore,
+    externalize_test_case,
+    load_test_case
+)
+
+pytestmark = pytest.mark.asyncio
+
+def stored_files(root):
+    return [name for _, _, names in os.walk(root) for name in names]
+
+async def test_incomplete_store_cannot_be_created():
+    class WriteOnlyStore(BlobStore):
+        async def _exists(self, digest):
+            return False
+
+        async def _write(self, digest, compressed):
+            pass
+
+    with pytest.raises(TypeError):
+        WriteOnlyStore()
+
+async def test_identical_payloads_are_stored_once_and_compressed(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    data = b"1 2 3\n" * 10000
+
+    first = await store.put(data)
+    second = await store.put(data)
+
+    assert first == second
+    assert first.size == len(data)
+    files = stored_files(tmp_path)
+    assert files == [first.digest]
+    assert os.path.getsize(tmp_path / first.digest[:2] / first.digest) < len(data) / 10
+
+async def test_payloads_stream_back_in_chunks(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    data = os.urandom(1024 * 1024)
+    ref = await store.put(data)
+
+    chunks = [chunk async for chunk in store.stream(ref.digest)]
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == data
+    assert await store.get(ref.digest) == data
+
+async def test_fetched_payloads_are_cached_within_a_byte_budget(tmp_path):
+    store = LocalBlobStore(str(tmp_path), cache_bytes=150)
+    refs = [await store.put(bytes([i]) * 100) for i in range(2)]
+
+    await store.get(refs[0].digest)
+    await store.get(refs[1].digest)
+
+    assert list(store._cache) == [refs[1].digest]
+    os.remove(tmp_path / refs[1].digest[:2] / refs[1].digest)
+    assert await store.get(refs[1].digest) == bytes([1]) * 100
+    with pytest.raises(BlobNotFoundError):
+        await store.get("0" * 64)
+
+async def test_large_test_case_payloads_round_trip_through_the_store(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    test_case = TestCase(input="5\n" + "7 " * 5000, expected_output="35", is_hidden=True)
+
+    externalized = await externalize_test_case(test_case, store, inline_max_bytes=1024)
+
+    assert externalized.input == ""
+    assert externalized.input_ref.size == len(test_case.input)
+    assert externalized.expected_output == "35"
+    assert externalized.output_ref is None
+    loaded = await load_test_case(externalized, store)
+    assert (loaded.input, loaded.expected_output) == (test_case.input, "35")
+    assert loaded.id == test_case.id
+
+async def test_small_test_cases_stay_inline(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    test_case = TestCase(input="1 2", expected_output="3")
+
+    assert await externalize_test_case(test_case, store, inline_max_bytes=1024) is test_case
+    assert await load_test_case(test_case, store) is test_case
+    assert stored_files(tmp_path) == []
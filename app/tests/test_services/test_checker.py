@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+from typing import get_args
+import pytest
+from pydantic import ValidationError
+from app.core.config import settings
+from app.schemas.question import CheckerMode, QuestionCreate, TestCase
+from app.services.code_service import CodeExecutionService
+from app.services.execution import ExecutionRequest, ExecutionResult, ExecutionStatus
+from app.services.execution.checker import CHECKERS, apply_checker, check_output, outputs_match, shutdown_checker_pool
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.mark.parametrize("mode, output, expected, matches", [
+    ("exact", "1 2\n", "1 2", True),
+    ("exact", "1  2", "1 2", False),
+    ("tokens", "1  2 \n3\n\n", "1 2\n3", True),
+    ("tokens", "1 2 3", "1 2", False),
+    ("float", "0.3333333 1e3", "0.33333333 1000", True),
+    ("float", "0.33 x", "0.3333 x", False),
+    ("unordered_lines", "b\na \n", "a\nb", True),
+    ("unordered_lines", "a\na", "a\nb", False),
+    ("json", '{"b": 1, "a": [1, 2]}', '{"a":[1,2],"b":1}', True),
+    ("json", "[1, 0]", "[0,1]", False),
+    ("json", "not json", "[0,1]", False),
+    ("json_unordered", "[1, 0]", "[0,1]", True),
+    ("json_unordered", "[[3, 2], [1, 0]]", "[[0,1],[2,3]]", True),
+    ("json_unordered", "[1, 1]", "[0,1]", False),
+    # Nesting too deep to parse is a wrong answer, not a judging error
+    ("json", "[" * 100000, "[0,1]", False),
+    ("json_unordered", "[" * 100000 + "]" * 100000, "[0,1]", False),
+])
+async def test_checker_modes(mode, output, expected, matches):
+    assert outputs_match(output, expected, mode) is matches
+
+async def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        outputs_match("1", "1", "fuzzy")
+
+async def test_only_known_checker_modes_are_accepted():
+    assert set(get_args(CheckerMode)) == set(CHECKERS)
+    with pytest.raises(ValidationError):
+        TestCase(checker_mode="bogus")
+    with pytest.raises(ValidationError):
+        QuestionCreate(
+            level="easy", topics=[], title="t", content="c", code_snippets=[], test_cases=[],
+            checker_mode="bogus"
+        )
+
+async def test_explicit_zero_epsilon_overrides_the_question():
+    question = SimpleNamespace(checker_mode="float", checker_epsilon=1e-6)
+    service = CodeExecutionService.__new__(CodeExecutionService)
+
+    test_case = service._with_checker(TestCase(checker_epsilon=0), question)
+
+    assert (test_case.checker_mode, test_case.checker_epsilon) == ("float", 0)
+    assert service._build_request(test_case).epsilon == 0
+
+async def test_large_outputs_are_checked_in_a_process_pool(monkeypatch):
+    monkeypatch.setattr(settings, "CHECKER_OFFLOAD_BYTES", 1024)
+    big = " ".join(str(i) for i in range(10000))
+    try:
+        assert await check_output(big, big + "\n", "tokens")
+        assert not await check_output(big, big + " 1", "tokens")
+    finally:
+        shutdown_checker_pool()
+
+async def test_clean_runs_get_their_verdict_from_the_checker():
+    run = ExecutionResult(status=ExecutionStatus.ACCEPTED, description="Accepted", stdout="[1, 0]\n")
+
+    accepted = await apply_checker(run, ExecutionRequest(expected_output="[0,1]", checker="json_unordered"))
+    rejected = await apply_checker(run, ExecutionRequest(expected_output="[0,1]", checker="json"))
+    crashed = ExecutionResult(status=ExecutionStatus.RUNTIME_ERROR, description="Runtime Error (NZEC)")
+
+    assert accepted.status == ExecutionStatus.ACCEPTED
+    assert rejected.status == ExecutionStatus.WRONG_ANSWER
+    assert (await apply_checker(crashed, ExecutionRequest(expected_output="1"))) is crashed
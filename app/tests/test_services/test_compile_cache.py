@@ -0,0 +1,82 @@
+import asyncio
+import os
+import pytest
+from app.services.execution.compile_cache import CompileCache
+
+pytestmark = pytest.mark.asyncio
+
+def write_artifact(size: int):
+    async def build(build_dir):
+        await asyncio.sleep(0.01)
+        with open(os.path.join(build_dir, "main"), "wb") as f:
+            f.write(b"x" * size)
+    return build
+
+async def test_key_covers_language_code_and_flags():
+    key = CompileCache.key("cpp", "int main() {}", ["-O2"])
+
+    assert key == CompileCache.key("cpp", "int main() {}", ["-O2"])
+    assert key != CompileCache.key("cpp", "int main() {}", ["-O0"])
+    assert key != CompileCache.key("cpp", "int main() { }", ["-O2"])
+    assert key != CompileCache.key("java", "int main() {}", ["-O2"])
+
+async def test_concurrent_checkouts_build_once(tmp_path):
+    cache = CompileCache(str(tmp_path))
+    builds = []
+
+    async def build(build_dir):
+        builds.append(build_dir)
+        await write_artifact(10)(build_dir)
+
+    async def checkout():
+        async with cache.checkout("k", build) as path:
+            return open(os.path.join(path, "main"), "rb").read()
+
+    outputs = await asyncio.gather(*(checkout() for _ in range(5)))
+
+    assert outputs == [b"x" * 10] * 5
+    assert len(builds) == 1
+    assert (cache.misses, cache.hits) == (1, 4)
+
+async def test_failed_build_is_not_cached(tmp_path):
+    cache = CompileCache(str(tmp_path))
+
+    async def broken(build_dir):
+        raise RuntimeError("compiler crashed")
+
+    with pytest.raises(RuntimeError):
+        async with cache.checkout("k", broken):
+            pass
+
+    assert os.listdir(tmp_path) == []
+
+async def test_least_recently_used_builds_are_evicted(tmp_path):
+    cache = CompileCache(str(tmp_path), max_bytes=250)
+
+    for key in ("a", "b"):
+        async with cache.checkout(key, write_artifact(100)):
+            pass
+    os.utime(tmp_path / "a", (0, 0))
+    os.utime(tmp_path / "b", (1, 1))
+    async with cache.checkout("a", write_artifact(100)):
+        pass  # Hit: "a" becomes the most recently used
+
+    async with cache.checkout("c", write_artifact(100)) as path:
+        assert os.path.isdir(path)
+
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+
+async def test_builds_in_use_by_another_process_are_not_evicted(tmp_path):
+    # Separate instances share nothing but the directory, like separate processes
+    running = CompileCache(str(tmp_path))
+    evicting = CompileCache(str(tmp_path), max_bytes=150)
+
+    async with running.checkout("a", write_artifact(100)) as path:
+        async with evicting.checkout("b", write_artifact(100)):
+            pass
+        assert open(os.path.join(path, "main"), "rb").read() == b"x" * 100
+
+    async with evicting.checkout("c", write_artifact(100)):
+        pass
+
+    assert sorted(os.listdir(tmp_path)) == ["c"]
@@ -0,0 +1,58 @@
+import pytest
+from pymongo import ASCENDING, IndexModel
+from app.core.indexes import declared_indexes, index_drift, reconcile_indexes
+from app.models.cached_result import CachedResult
+from app.models.judge_job import JudgeJob
+from app.models.question import Question
+
+pytestmark = pytest.mark.asyncio
+
+class FakeCollection:
+    def __init__(self, name, indexes):
+        self.name = name
+        self.indexes = {"_id_": {"key": [("_id", 1)], "v": 2}, **indexes}
+        self.created = []
+
+    async def index_information(self):
+        return self.indexes
+
+    async def create_indexes(self, indexes):
+        self.created += [index.document["name"] for index in indexes]
+        return self.created
+
+async def test_declared_indexes_cover_every_declaration_style():
+    assert "title_slug_1" in [index.document["name"] for index in declared_indexes(Question)]
+    assert [index.document["name"] for index in declared_indexes(CachedResult)] == ["key_1", "created_at_1"]
+    assert declared_indexes(CachedResult)[0].document["unique"] is True
+    assert declared_indexes(JudgeJob)[0].document["name"] == "submission_1"
+
+async def test_drift_reports_missing_changed_and_extra_indexes():
+    declared = [
+        IndexModel([("title_slug", ASCENDING)], unique=True),
+        IndexModel([("level", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("topics", ASCENDING)]),
+    ]
+    existing = {
+        "_id_": {"key": [("_id", 1)]},
+        "slug": {"key": [("title_slug", 1)], "v": 2},  # Not unique
+        "level_1__id_1": {"key": [("level", 1), ("_id", 1)], "v": 2},
+        "title_1": {"key": [("title", 1)], "v": 2},
+    }
+
+    assert index_drift(declared, existing) == {
+        "missing": ["topics_1"],
+        "changed": ["slug"],
+        "extra": ["title_1"],
+    }
+
+async def test_reconcile_creates_only_missing_indexes(monkeypatch):
+    collection = FakeCollection("questions", {
+        "title_slug_1": {"key": [("title_slug", 1)], "unique": True, "v": 2},
+    })
+    monkeypatch.setattr(Question, "get_motor_collection", classmethod(lambda cls: collection))
+
+    report = await reconcile_indexes([Question])
+
+    assert collection.created == report["questions"]["missing"]
+    assert collection.created == ["level_1__id_1", "topics_1_level_1__id_1", "companies_1_level_1__id_1"]
+    assert report["questions"]["changed"] == report["questions"]["extra"] == []
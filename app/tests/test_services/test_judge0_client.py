@@ -0,0 +1,168 @@
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import HTTPException
+from app.api.v1.endpoints.code import judge0_callback
+from app.core.config import settings
+from app.services.judge0_callbacks import Judge0CallbackRegistry, decode_callback_payload
+from app.services.judge0_client import Judge0Client, Judge0Error, Judge0Poller
+
+pytestmark = pytest.mark.asyncio
+
+def make_client(handler, **kwargs):
+    kwargs.setdefault("central_poller", False)
+    return Judge0Client(
+        base_url="http://judge0.test",
+        poll_interval=0.001,
+        transport=httpx.MockTransport(handler),
+        **kwargs
+    )
+
+async def test_run_polls_until_finished():
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(201, json={"token": "abc"})
+        polls.append(request.url.path)
+        status_id = 2 if len(polls) < 3 else 3
+        return httpx.Response(200, json={"status": {"id": status_id}, "stdout": "3\n"})
+
+    client = make_client(handler)
+    result = await client.run({"source_code": "print(3)", "language_id": 71})
+    await client.close()
+
+    assert result["status"]["id"] == 3
+    assert polls == ["/submissions/abc"] * 3
+
+async def test_wait_for_result_gives_up():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"status": {"id": 1}})
+
+    client = make_client(handler, max_poll_attempts=2)
+    with pytest.raises(Judge0Error):
+        await client.wait_for_result("abc")
+    await client.close()
+
+async def test_http_errors_are_wrapped():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, json={"message": "Too many requests"})
+
+    client = make_client(handler)
+    with pytest.raises(Judge0Error):
+        await client.create_submission({"source_code": "", "language_id": 71})
+    await client.close()
+
+async def test_run_batch_chunks_and_keeps_order():
+    created = []
+    polled = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            body = json.loads(request.content)["submissions"]
+            created.append(len(body))
+            return httpx.Response(201, json=[
+                {"token": sub["stdin"]} if sub["stdin"] != "bad" else {"language_id": ["is invalid"]}
+                for sub in body
+            ])
+        tokens = request.url.params["tokens"].split(",")
+        polled.append(len(tokens))
+        return httpx.Response(200, json={"submissions": [
+            {"token": token, "status": {"id": 3}, "stdout": token} for token in tokens
+        ]})
+
+    client = make_client(handler, batch_size=2)
+    results = await client.run_batch([{"stdin": s} for s in ["a", "b", "bad", "c"]])
+    await client.close()
+
+    assert created == [2, 2]
+    assert polled == [2, 1]
+    assert [r.get("stdout") for r in results] == ["a", "b", None, "c"]
+    assert "error" in results[2]
+
+async def test_callback_result_skips_polling():
+    callbacks = Judge0CallbackRegistry()
+    posted = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            posted.append(json.loads(request.content))
+            # The callback can land before the create request returns
+            callbacks.resolve("abc", {"token": "abc", "status": {"id": 3}})
+            return httpx.Response(201, json={"token": "abc"})
+        raise AssertionError("should not poll")
+
+    client = make_client(handler, callback_url="http://api.test/cb", callbacks=callbacks)
+    result = await client.run({"source_code": "print(3)", "language_id": 71})
+    await client.close()
+
+    assert result["status"]["id"] == 3
+    assert posted[0]["callback_url"].startswith("http://api.test/cb")
+
+async def test_missing_callback_falls_back_to_polling():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(201, json={"token": "abc"})
+        return httpx.Response(200, json={"token": "abc", "status": {"id": 3}})
+
+    client = make_client(handler, callback_url="http://api.test/cb", callback_timeout=0.01,
+                         callbacks=Judge0CallbackRegistry())
+    result = await client.run({"source_code": "print(3)", "language_id": 71})
+    await client.close()
+
+    assert result["status"]["id"] == 3
+
+async def test_decode_callback_payload():
+    payload = {"token": "abc", "stdout": "Mwo=", "stderr": None}
+    assert decode_callback_payload(payload) == {"token": "abc", "stdout": "3\n", "stderr": None}
+
+async def test_callbacks_need_a_secret(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE0_CALLBACK_URL", "http://api.test/cb")
+    monkeypatch.setattr(settings, "JUDGE0_CALLBACK_SECRET", "")
+    assert make_client(lambda request: None).callback_url == ""
+    with pytest.raises(HTTPException) as error:
+        await judge0_callback({"token": "abc", "status": {"id": 3}}, secret="")
+    assert error.value.status_code == 404
+
+    monkeypatch.setattr(settings, "JUDGE0_CALLBACK_SECRET", "s3cret")
+    assert make_client(lambda request: None).callback_url == "http://api.test/cb"
+    with pytest.raises(HTTPException) as error:
+        await judge0_callback({"token": "abc", "status": {"id": 3}}, secret="guess")
+    assert error.value.status_code == 403
+
+async def test_central_poller_shares_batched_polls():
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        tokens = request.url.params["tokens"].split(",")
+        polls.append(tokens)
+        # Everything finishes on the second round of polling
+        status_id = 3 if len(polls) > 1 else 2
+        return httpx.Response(200, json={"submissions": [
+            {"token": token, "status": {"id": status_id}} for token in tokens
+        ]})
+
+    client = make_client(handler, central_poller=True)
+    client.poller.min_interval = 0.001
+    results = await asyncio.gather(*(client.wait_for_result(t) for t in ["a", "b", "c"]))
+    await client.close()
+
+    assert [r["token"] for r in results] == ["a", "b", "c"]
+    assert len(polls) == 2
+    assert sorted(polls[0]) == ["a", "b", "c"]
+
+async def test_central_poller_times_out_and_backs_off():
+    def handler(request: httpx.Request) -> httpx.Response:
+        tokens = request.url.params["tokens"].split(",")
+        return httpx.Response(200, json={"submissions": [
+            {"token": token, "status": {"id": 1}} for token in tokens
+        ]})
+
+    client = make_client(handler)
+    poller = Judge0Poller(client, min_interval=0.001, max_interval=0.004, backoff=2, timeout=0.05)
+    with pytest.raises(Judge0Error):
+        await poller.wait("abc")
+    await client.close()
+
+    assert poller._interval == 0.004
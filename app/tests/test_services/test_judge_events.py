@@ -0,0 +1,57 @@
+import asyncio
+import json
+import pytest
+from app.services import judge_events as judge_events_module
+from app.services.judge_events import JudgeEventBroker, progress_stream
+
+pytestmark = pytest.mark.asyncio
+
+def parse(message):
+    lines = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+def result(test_case_id, passed=True):
+    return {"test_case_id": test_case_id, "passed": passed, "execution_time": 0.01,
+            "memory_used": 1, "output": "1", "error": None, "is_hidden": False}
+
+async def test_streams_published_events_until_verdict(monkeypatch):
+    broker = JudgeEventBroker()
+    snapshot = {"status": "running", "results": [result("a")]}
+
+    async def load_progress(submission_id):
+        return snapshot
+    monkeypatch.setattr(judge_events_module, "load_progress", load_progress)
+
+    async def judge():
+        await asyncio.sleep(0.01)
+        broker.publish("s1", "result", result("a"))  # Already read from the database
+        broker.publish("s1", "result", result("b", passed=False))
+        broker.publish("s1", "verdict", {"status": "completed", "total_passed": 1, "total_tests": 2})
+
+    judging = asyncio.create_task(judge())
+    messages = [parse(m) async for m in progress_stream("s1", poll_interval=5, broker=broker)]
+    await judging
+
+    assert [(event, data.get("test_case_id") or data["status"]) for event, data in messages] == [
+        ("status", "running"),
+        ("result", "a"),
+        ("result", "b"),
+        ("verdict", "completed"),
+    ]
+    assert broker._subscribers == {}
+
+async def test_falls_back_to_the_database_when_judged_elsewhere(monkeypatch):
+    snapshots = [
+        {"status": "pending", "results": []},
+        {"status": "running", "results": []},
+        {"status": "completed", "results": [result("a")], "total_passed": 1, "total_tests": 1},
+    ]
+
+    async def load_progress(submission_id):
+        return snapshots.pop(0) if len(snapshots) > 1 else snapshots[0]
+    monkeypatch.setattr(judge_events_module, "load_progress", load_progress)
+
+    messages = [parse(m) async for m in progress_stream("s1", poll_interval=0.01, broker=JudgeEventBroker())]
+
+    assert [event for event, _ in messages] == ["status", "status", "status", "result", "verdict"]
+    assert messages[-1][1]["total_passed"] == 1
@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+from app.models.code_submission import CodeSubmission
+from app.models.judge_job import JudgeJob
+from app.services.judge_queue import JudgeQueue, wait_percentiles
+from app.services.judge_worker import JudgeWorker
+
+pytestmark = pytest.mark.asyncio
+
+class FakeCollection:
+    def __init__(self):
+        self.updates = []
+        self.claims = []
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+
+    async def find_one_and_update(self, query, update, sort, return_document):
+        self.claims.append((query, update, sort))
+        return None
+
+@pytest.fixture(autouse=True)
+def collections(monkeypatch):
+    # Documents are built and updated without a database
+    jobs, submissions = FakeCollection(), FakeCollection()
+    monkeypatch.setattr(JudgeJob, "get_motor_collection", classmethod(lambda cls: jobs))
+    monkeypatch.setattr(CodeSubmission, "get_motor_collection", classmethod(lambda cls: submissions))
+    return jobs, submissions
+
+class FakeQueue:
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.new_work = asyncio.Event()
+        self.completed = []
+        self.failed = []
+        self.lease_held = True
+
+    async def claim(self, worker_id):
+        return self.jobs.pop(0) if self.jobs else None
+
+    async def heartbeat(self, job):
+        return self.lease_held
+
+    async def complete(self, job):
+        self.completed.append(job)
+
+    async def fail(self, job, error, retry=True):
+        self.failed.append((job, error, retry))
+
+class FakeService:
+    def __init__(self, errors=None, duration=0.01):
+        self.errors = errors or {}
+        self.duration = duration
+        self.running = 0
+        self.peak = 0
+        self.fences = []
+        self.cancelled = 0
+
+    async def execute_submission(self, submission_id, claim_from=("pending",), fence=None):
+        self.fences.append(fence)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.duration)
+            if submission_id in self.errors:
+                raise self.errors[submission_id]
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+
+def make_job(**fields):
+    return JudgeJob(submission=PydanticObjectId(), worker_id="w", **fields)
+
+async def run_until_drained(worker, queue):
+    task = asyncio.create_task(worker.run())
+    while queue.jobs or worker._tasks:
+        await asyncio.sleep(0.01)
+    await worker.stop()
+    await task
+
+async def test_worker_completes_retries_and_dead_letters():
+    ok, flaky, missing = make_job(), make_job(), make_job()
+    queue = FakeQueue([ok, flaky, missing])
+    service = FakeService({
+        str(flaky.submission): RuntimeError("backend down"),
+        str(missing.submission): HTTPException(status_code=404, detail="Submission not found"),
+    })
+    worker = JudgeWorker(queue=queue, service=service, concurrency=2, poll_interval=0.01)
+
+    await run_until_drained(worker, queue)
+
+    assert queue.completed == [ok]
+    assert (flaky, "backend down", True) in queue.failed
+    assert (missing, "Submission not found", False) in queue.failed
+    assert service.peak == 2
+
+async def test_losing_the_lease_stops_judging():
+    job = make_job(attempts=2)
+    queue = FakeQueue([job])
+    queue.lease_held = False
+    service = FakeService(duration=10)
+    worker = JudgeWorker(queue=queue, service=service, poll_interval=0.01, heartbeat_interval=0.01)
+
+    await run_until_drained(worker, queue)
+
+    assert service.cancelled == 1
+    assert (queue.completed, queue.failed) == ([], [])
+    assert service.fences == [f"{worker.worker_id}:2"]
+
+async def test_failed_job_is_retried_with_backoff_then_dead_lettered(collections):
+    jobs, submissions = collections
+    queue = JudgeQueue(max_attempts=2, retry_delay=10)
+
+    await queue.fail(make_job(attempts=1), "boom")
+    query, update = jobs.updates[-1]
+    assert update["$set"]["status"] == "queued"
+    assert update["$set"]["worker_id"] is None
+    assert not submissions.updates
+
+    job = make_job(attempts=2)
+    await queue.fail(job, "boom")
+    assert jobs.updates[-1][1]["$set"]["status"] == "dead"
+    assert submissions.updates[-1][0]["_id"] == job.submission
+    assert submissions.updates[-1][1]["$set"]["status"] == "error"
+
+async def test_claims_by_priority_class_then_user_turn(collections):
+    jobs, _ = collections
+
+    assert await JudgeQueue().claim("w") is None
+
+    _, update, sort = jobs.claims[-1]
+    assert [field for field, _ in sort] == ["priority", "user_rank", "available_at"]
+    # The first claim time survives re-claims, so queue waits stay honest
+    assert update[0]["$set"]["claimed_at"]["$ifNull"][0] == "$claimed_at"
+
+async def test_wait_percentiles():
+    stats = wait_percentiles([float(ms) for ms in range(100, 0, -1)])
+
+    assert stats["claimed"] == 100
+    assert (stats["wait_p50_ms"], stats["wait_p95_ms"], stats["wait_max_ms"]) == (50, 95, 100)
@@ -0,0 +1,288 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from beanie import PydanticObjectId
+from app.core.config import settings
+from app.models.code_submission import CodeSubmission
+from app.models.question import Question
+from app.models.test_result import TestResult
+from app.services.code_service import CodeExecutionService
+from app.services.execution import ExecutionResult, ExecutionStatus
+from app.services.question_cache import question_cache
+from app.services.result_cache import ResultCache
+from app.schemas.question import TestCase
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture(autouse=True)
+def detached_test_results(monkeypatch):
+    # TestResult is a Beanie document; let it be built without a database
+    monkeypatch.setattr(TestResult, "get_motor_collection", classmethod(lambda cls: None))
+
+@pytest.fixture(autouse=True)
+def no_shared_result_cache(monkeypatch):
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+
+@pytest.fixture(autouse=True)
+def empty_question_cache():
+    question_cache.clear()
+    yield
+    question_cache.clear()
+
+class FakeJudge0:
+    """Echoes stdin back as stdout after a short delay, tracking concurrency.
+
+    Like Judge0 without an expected output, every run is accepted; the
+    checker decides the verdict.
+    """
+
+    batch_size = 20
+    base_url = "http://judge0.test"
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.runs = 0
+
+    async def run_batch(self, submissions):
+        return [await self.run(submission) for submission in submissions]
+
+    async def run(self, submission_data):
+        self.runs += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            return {
+                "status": {"id": 3, "description": "Accepted"},
+                "stdout": submission_data["stdin"],
+                "time": "0.01",
+                "memory": 1024
+            }
+        finally:
+            self.running -= 1
+
+def make_test_cases(count: int):
+    return [TestCase(input=str(i), expected_output=str(i)) for i in range(count)]
+
+async def test_concurrent_mode_keeps_order_and_caps_parallelism(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "concurrent")
+    monkeypatch.setattr(settings, "JUDGE_MAX_CONCURRENCY_PER_SUBMISSION", 3)
+    judge0 = FakeJudge0()
+    service = CodeExecutionService(judge0=judge0)
+    test_cases = make_test_cases(10)
+
+    outcomes = await service._run_test_cases("python", "print(input())", test_cases)
+
+    assert [tc for tc, _ in outcomes] == test_cases
+    assert all(result.passed for _, result in outcomes)
+    assert judge0.peak == 3
+
+async def test_fail_fast_stops_and_cancels_in_flight(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "concurrent")
+    monkeypatch.setattr(settings, "JUDGE_MAX_CONCURRENCY_PER_SUBMISSION", 2)
+    service = CodeExecutionService(judge0=FakeJudge0())
+    test_cases = make_test_cases(10)
+    test_cases[2].expected_output = "wrong"
+
+    outcomes = await service._run_test_cases("python", "print(input())", test_cases, fail_fast=True)
+
+    assert len(outcomes) < len(test_cases)
+    assert [tc for tc, _ in outcomes] == test_cases[:len(outcomes)]
+    assert not outcomes[2][1].passed
+
+async def test_batch_fail_fast_keeps_nothing_after_the_first_failure(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "batch")
+    service = CodeExecutionService(judge0=FakeJudge0())
+    assert service.result_cache is None
+    test_cases = make_test_cases(6)
+    test_cases[1].expected_output = "wrong"
+    reported = []
+
+    async def report(test_case, result):
+        reported.append(test_case)
+
+    outcomes = await service._run_test_cases(
+        "python", "print(input())", test_cases, fail_fast=True, on_result=report
+    )
+
+    assert [tc for tc, _ in outcomes] == test_cases[:2]
+    assert [result.passed for _, result in outcomes] == [True, False]
+    assert reported == test_cases[:2]
+
+async def test_fail_fast_orders_visible_tests_first():
+    service = CodeExecutionService(judge0=FakeJudge0())
+    hidden = TestCase(input="1", expected_output="1", is_hidden=True)
+    visible = TestCase(input="2", expected_output="2")
+
+    assert service._fail_fast_order([hidden, visible]) == [visible, hidden]
+
+async def test_compile_error_is_not_repeated_on_test_results():
+    service = CodeExecutionService(judge0=FakeJudge0())
+    result = ExecutionResult(
+        status=ExecutionStatus.COMPILATION_ERROR,
+        description="Compilation Error",
+        compile_output="main.cpp:1: error: expected ';'"
+    )
+
+    test_result = service._to_test_result(TestCase(input="1", expected_output="1"), result)
+
+    assert not test_result.passed
+    assert test_result.error == "Compilation Error"
+
+async def test_result_cache_runs_only_misses(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "concurrent")
+    judge0 = FakeJudge0()
+    service = CodeExecutionService(judge0=judge0, result_cache=ResultCache(persistent=False))
+    test_cases = make_test_cases(4)
+
+    await service._run_test_cases("python", "print(input())", test_cases[:2])
+    outcomes = await service._run_test_cases("python", "print(input())\r\n", test_cases)
+
+    assert judge0.runs == 4
+    assert [tc for tc, _ in outcomes] == test_cases
+    assert all(result.passed for _, result in outcomes)
+
+async def test_results_are_not_shared_across_runtimes(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "concurrent")
+    result_cache = ResultCache(persistent=False)
+    judge0 = FakeJudge0()
+    other = FakeJudge0()
+    other.base_url = "http://other-judge0.test"
+    test_cases = make_test_cases(2)
+
+    await CodeExecutionService(judge0=judge0, result_cache=result_cache)._run_test_cases(
+        "python", "print(input())", test_cases
+    )
+    await CodeExecutionService(judge0=other, result_cache=result_cache)._run_test_cases(
+        "python", "print(input())", test_cases
+    )
+
+    assert other.runs == 2
+
+async def test_cached_failure_ends_fail_fast_judging(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "sequential")
+    judge0 = FakeJudge0()
+    service = CodeExecutionService(judge0=judge0, result_cache=ResultCache(persistent=False))
+    test_cases = make_test_cases(5)
+    test_cases[1].expected_output = "wrong"
+
+    await service._run_test_cases("python", "print(input())", test_cases[1:2])
+    outcomes = await service._run_test_cases("python", "print(input())", test_cases, fail_fast=True)
+
+    assert judge0.runs == 2  # The failure itself came from the cache
+    assert [tc for tc, _ in outcomes] == test_cases[:2]
+
+async def test_results_are_reported_as_they_finish(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "concurrent")
+    service = CodeExecutionService(judge0=FakeJudge0())
+    test_cases = make_test_cases(3)
+    reported = []
+
+    async def on_result(test_case, result):
+        reported.append(test_case)
+
+    await service._run_test_cases("python", "print(input())", test_cases, on_result=on_result)
+
+    assert sorted(reported, key=test_cases.index) == test_cases
+
+class FakeSubmissions:
+    """Applies conditional updates against a single stored status"""
+
+    def __init__(self, status):
+        self.status = status
+        self.judged_by = None
+        self.updates = []
+
+    async def update_one(self, query, update):
+        expected = query["status"]
+        matched = self.status in expected["$in"] if isinstance(expected, dict) else self.status == expected
+        matched = matched and query.get("judged_by", self.judged_by) == self.judged_by
+        if matched:
+            self.updates.append(update)
+            self.status = update.get("$set", {}).get("status", self.status)
+            self.judged_by = update.get("$set", {}).get("judged_by", self.judged_by)
+        return SimpleNamespace(matched_count=int(matched))
+
+def stored_submission(monkeypatch, status, test_cases):
+    collection = FakeSubmissions(status)
+    monkeypatch.setattr(CodeSubmission, "get_motor_collection", classmethod(lambda cls: collection))
+    submission = CodeSubmission(
+        id=PydanticObjectId(),
+        user=PydanticObjectId(),
+        question=PydanticObjectId(),
+        language="python",
+        code="print(input())",
+        status=status
+    )
+
+    async def get_submission(submission_id):
+        return submission
+
+    async def get_question(question_id):
+        return SimpleNamespace(
+            id=question_id,
+            title_slug="echo",
+            test_cases=test_cases,
+            checker_mode="tokens",
+            checker_epsilon=1e-6
+        )
+
+    monkeypatch.setattr(CodeSubmission, "get", get_submission)
+    monkeypatch.setattr(Question, "get", get_question)
+    return submission, collection
+
+async def test_submission_lifecycle_uses_targeted_updates(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "sequential")
+    test_cases = make_test_cases(3)
+    test_cases[1].expected_output = "wrong"
+    submission, collection = stored_submission(monkeypatch, "pending", test_cases)
+    service = CodeExecutionService(judge0=FakeJudge0())
+
+    await service.execute_submission(str(submission.id))
+
+    claim, *pushes, verdict = collection.updates
+    assert claim["$set"]["status"] == "running"
+    assert [push["$push"]["results"]["passed"] for push in pushes] == [True, False, True]
+    assert verdict["$set"]["status"] == "completed"
+    assert verdict["$set"]["total_passed"] == 2
+    assert not any("code" in update.get("$set", {}) for update in collection.updates)
+
+async def test_submission_already_taken_is_not_judged_again(monkeypatch):
+    submission, collection = stored_submission(monkeypatch, "completed", make_test_cases(2))
+    judge0 = FakeJudge0()
+
+    await CodeExecutionService(judge0=judge0).execute_submission(str(submission.id))
+
+    assert collection.updates == []
+    assert judge0.runs == 0
+
+async def test_reclaimed_submission_ignores_the_stale_run(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "sequential")
+    submission, collection = stored_submission(monkeypatch, "pending", make_test_cases(2))
+    service = CodeExecutionService(judge0=FakeJudge0())
+
+    async def reclaim(*args, **kwargs):
+        collection.judged_by = "w2:2"  # Another worker took over the job
+        return []
+
+    monkeypatch.setattr(service, "_run_test_cases", reclaim)
+    await service.execute_submission(str(submission.id), fence="w1:1")
+
+    claim, = collection.updates
+    assert claim["$set"]["judged_by"] == "w1:1"
+    assert collection.status == "running"
+
+async def test_cached_raw_output_is_checked_again(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE_EXECUTION_MODE", "sequential")
+    judge0 = FakeJudge0()
+    service = CodeExecutionService(judge0=judge0, result_cache=ResultCache(persistent=False))
+
+    wrong = TestCase(input="7", expected_output="8")
+    fixed = TestCase(input="7", expected_output="7")
+    [(_, first)] = await service._run_test_cases("python", "print(input())", [wrong])
+    [(_, second)] = await service._run_test_cases("python", "print(input())", [fixed])
+
+    assert not first.passed and second.passed
+    assert judge0.runs == 1
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import platform
+import shutil
+import pytest
+from app.services.execution import ExecutionRequest, ExecutionStatus, LocalBackend
+from app.services.execution.compile_cache import CompileCache
+
+pytestmark = pytest.mark.asyncio
+
+ECHO_SUM = "a, b = map(int, input().split())\nprint(a + b)\n"
+
+@pytest.fixture
+def backend(tmp_path):
+    return LocalBackend(max_parallel=2, output_limit=64 * 1024, compile_cache=CompileCache(str(tmp_path)))
+
+async def test_accepted_and_wrong_answer(backend):
+    results = await backend.run_many("python", ECHO_SUM, [
+        ExecutionRequest(stdin="1 2", expected_output="3"),
+        ExecutionRequest(stdin="2 2", expected_output="5"),
+    ])
+
+    assert [r.status for r in results] == [ExecutionStatus.ACCEPTED, ExecutionStatus.WRONG_ANSWER]
+    assert results[0].stdout == "3\n"
+    assert results[0].memory > 0
+
+async def test_runtime_names_the_toolchain_version(backend):
+    assert backend.runtime("python") == f"local Python {platform.python_version()}"
+
+async def test_runtime_error(backend):
+    result = await backend.run("python", "raise ValueError('boom')", ExecutionRequest())
+
+    assert result.status == ExecutionStatus.RUNTIME_ERROR
+    assert "ValueError" in result.stderr
+
+async def test_time_limit(backend):
+    result = await backend.run("python", "while True:\n    pass\n", ExecutionRequest(time_limit=1))
+
+    assert result.status == ExecutionStatus.TIME_LIMIT_EXCEEDED
+
+async def test_memory_limit(backend):
+    code = "x = bytearray(512 * 1024 * 1024)\nprint(len(x))\n"
+    result = await backend.run("python", code, ExecutionRequest(memory_limit=128 * 1024))
+
+    assert result.status == ExecutionStatus.MEMORY_LIMIT_EXCEEDED
+
+async def test_output_limit(backend):
+    code = "import sys\nwhile True:\n    sys.stdout.write('x' * 4096)\n"
+    result = await backend.run("python", code, ExecutionRequest())
+
+    assert result.status == ExecutionStatus.OUTPUT_LIMIT_EXCEEDED
+
+@pytest.mark.skipif(shutil.which("g++") is None, reason="g++ not installed")
+async def test_cpp_compiles_once_per_source(backend):
+    code = "#include <iostream>\nint main() { int a, b; std::cin >> a >> b; std::cout << a + b; }\n"
+    assert await backend.compile("cpp", code) is None
+    results = await backend.run_many("cpp", code, [
+        ExecutionRequest(stdin="1 2", expected_output="3"),
+        ExecutionRequest(stdin="4 5", expected_output="9"),
+    ])
+    assert all(r.passed for r in results)
+    assert (backend.compile_cache.misses, backend.compile_cache.hits) == (1, 1)
+
+    error = await backend.compile("cpp", "int main() { return }")
+    assert error.status == ExecutionStatus.COMPILATION_ERROR
+    assert error.compile_output
+    rerun = await backend.run("cpp", "int main() { return }", ExecutionRequest())
+    assert rerun.compile_output == error.compile_output
+    assert backend.compile_cache.misses == 2
+
+@pytest.mark.skipif(shutil.which("javac") is None, reason="JDK not installed")
+async def test_java_compiles_and_runs(backend):
+    code = (
+        "import java.util.Scanner;\n"
+        "public class Main {\n"
+        "    public static void main(String[] args) {\n"
+        "        Scanner in = new Scanner(System.in);\n"
+        "        System.out.println(in.nextInt() + in.nextInt());\n"
+        "    }\n"
+        "}\n"
+    )
+    assert await backend.compile("java", code) is None
+    result = await backend.run("java", code, ExecutionRequest(stdin="1 2", expected_output="3"))
+
+    assert result.passed
+
+async def test_warm_worker_is_reused_and_recycled_after_limits():
+    backend = LocalBackend(max_parallel=1)
+    pool = backend.pools["python"]
+    pool.size = 1
+    try:
+        await backend.run("python", "print(1)", ExecutionRequest(expected_output="1"))
+        first = pool._idle._queue[0]
+        await backend.run("python", "print(2)", ExecutionRequest(expected_output="2"))
+        assert pool._idle._queue[0] is first
+        assert first.jobs_done == 2
+
+        await backend.run("python", "while True:\n    pass\n", ExecutionRequest(time_limit=1))
+        assert pool._idle._queue[0] is not first
+    finally:
+        await backend.close()
+
+async def test_syntax_error_on_warm_worker(backend):
+    result = await backend.run("python", "def (", ExecutionRequest())
+
+    assert result.status == ExecutionStatus.RUNTIME_ERROR
+    assert "SyntaxError" in result.stderr
+
+def is_running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            state = f.read().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return False
+    return state != "Z"
+
+async def is_killed(pid: int) -> bool:
+    """SIGKILL is delivered asynchronously; give it a moment to land"""
+    for _ in range(50):
+        if not is_running(pid):
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+def fork_grandchild(setsid: bool) -> str:
+    return (
+        "import os, time\n"
+        "pid = os.fork()\n"
+        "if pid == 0:\n"
+        f"    {'os.setsid()' if setsid else 'pass'}\n"
+        "    time.sleep(60)\n"
+        "    os._exit(0)\n"
+        "print(pid)\n"
+    )
+
+@pytest.mark.parametrize("setsid", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(os.geteuid() == 0, reason="RLIMIT_NPROC does not apply to root")),
+])
+async def test_forked_grandchild_does_not_outlive_the_run(tmp_path, setsid):
+    backend = LocalBackend(max_parallel=1, compile_cache=CompileCache(str(tmp_path)))
+    backend.pools = {}  # Run in a fresh process, not a warm worker
+
+    result = await backend.run("python", fork_grandchild(setsid), ExecutionRequest())
+
+    if result.stdout.strip():
+        assert await is_killed(int(result.stdout))
+    else:
+        assert "BlockingIOError" in result.stderr  # RLIMIT_NPROC refused the fork
+
+async def test_forked_grandchild_does_not_outlive_a_warm_worker_test():
+    backend = LocalBackend(max_parallel=1)
+    try:
+        result = await backend.run("python", fork_grandchild(setsid=True), ExecutionRequest())
+
+        if result.stdout.strip():
+            assert await is_killed(int(result.stdout))
+        else:
+            assert "BlockingIOError" in result.stderr
+    finally:
+        await backend.close()
+
+async def test_warm_worker_tests_do_not_share_files_and_memory_hits_recycle():
+    backend = LocalBackend(max_parallel=1)
+    pool = backend.pools["python"]
+    pool.size = 1
+    try:
+        await backend.run("python", "open('left.txt', 'w').write('x')", ExecutionRequest())
+        result = await backend.run("python", "import os\nprint(os.listdir('.'))", ExecutionRequest())
+        assert result.stdout == "[]\n"
+
+        first = pool._idle._queue[0]
+        code = "x = bytearray(512 * 1024 * 1024)\n"
+        result = await backend.run("python", code, ExecutionRequest(memory_limit=128 * 1024))
+        assert result.status == ExecutionStatus.MEMORY_LIMIT_EXCEEDED
+        assert pool._idle._queue[0] is not first
+    finally:
+        await backend.close()
+
+async def test_cancelled_job_does_not_leak_its_output_into_the_next():
+    backend = LocalBackend(max_parallel=1)
+    pool = backend.pools["python"]
+    pool.size = 1
+    try:
+        slow = asyncio.create_task(
+            backend.run("python", "import time\ntime.sleep(0.5)\nprint('SLOW')", ExecutionRequest())
+        )
+        await asyncio.sleep(0.2)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+
+        result = await backend.run("python", "print('FAST')", ExecutionRequest())
+        assert result.stdout == "FAST\n"
+    finally:
+        await backend.close()
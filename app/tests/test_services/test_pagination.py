@@ -0,0 +1,47 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from beanie import PydanticObjectId
+from pymongo import ASCENDING
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter, next_cursor
+from app.services.code_service import SUBMISSION_ORDER
+
+pytestmark = pytest.mark.asyncio
+
+QUESTION_ORDER = [("_id", ASCENDING)]
+
+async def test_cursors_round_trip_sort_keys():
+    values = [datetime(2024, 5, 1, 12, 30, 15, 123000), PydanticObjectId()]
+
+    cursor = encode_cursor(values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, SUBMISSION_ORDER) == values
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor([1, 2, 3]), encode_cursor({"a": 1})[:-2]])
+async def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, SUBMISSION_ORDER)
+
+async def test_keyset_filter_resumes_after_the_last_item():
+    last_id = PydanticObjectId()
+    assert keyset_filter(QUESTION_ORDER, [last_id]) == {"_id": {"$gt": last_id}}
+
+    submitted_at = datetime(2024, 5, 1)
+    assert keyset_filter(SUBMISSION_ORDER, [submitted_at, last_id]) == {"$or": [
+        {"submitted_at": {"$lt": submitted_at}},
+        {"submitted_at": submitted_at, "_id": {"$lt": last_id}},
+    ]}
+
+async def test_next_cursor_only_for_full_pages():
+    submissions = [
+        SimpleNamespace(id=PydanticObjectId(), submitted_at=datetime(2024, 5, day))
+        for day in (3, 2, 1)
+    ]
+
+    assert next_cursor(submissions, 4, SUBMISSION_ORDER) is None
+    cursor = next_cursor(submissions, 3, SUBMISSION_ORDER)
+    assert decode_cursor(cursor, SUBMISSION_ORDER) == [datetime(2024, 5, 1), submissions[-1].id]
+
+    documents = [{"_id": PydanticObjectId(), "title": "Two Sum"}]
+    assert decode_cursor(next_cursor(documents, 1, QUESTION_ORDER), QUESTION_ORDER) == [documents[0]["_id"]]
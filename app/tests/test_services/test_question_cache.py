@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from beanie import PydanticObjectId
+from app.models.question import Question
+from app.services.question_cache import QuestionCache
+
+pytestmark = pytest.mark.asyncio
+
+class FakeQuestions:
+    """Stands in for the questions collection, counting reads"""
+
+    def __init__(self, *slugs, delay: float = 0.01):
+        self.questions = [SimpleNamespace(id=PydanticObjectId(), title_slug=slug) for slug in slugs]
+        self.delay = delay
+        self.reads = 0
+
+    async def get(self, question_id):
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return next((q for q in self.questions if q.id == question_id), None)
+
+    async def find_one(self, query):
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return next((q for q in self.questions if q.title_slug == query["title_slug"]), None)
+
+@pytest.fixture
+def questions(monkeypatch):
+    questions = FakeQuestions("two_sum", "three_sum", "four_sum")
+    monkeypatch.setattr(Question, "get", questions.get)
+    monkeypatch.setattr(Question, "find_one", questions.find_one)
+    return questions
+
+async def test_concurrent_misses_share_one_read(questions):
+    cache = QuestionCache()
+    question = questions.questions[0]
+
+    loaded = await asyncio.gather(*(cache.get(question.id) for _ in range(10)))
+
+    assert all(q is question for q in loaded)
+    assert questions.reads == 1
+    assert (cache.hits, cache.misses) == (0, 10)
+    assert await cache.get(str(question.id)) is question
+    assert cache.stats()["hits"] == 1
+
+async def test_questions_are_found_by_id_and_slug(questions):
+    cache = QuestionCache()
+    question = questions.questions[1]
+
+    assert await cache.get_by_slug("three_sum") is question
+    assert await cache.get(question.id) is question
+    assert await cache.get_by_slug("three_sum") is question
+    assert questions.reads == 1
+
+    # Misses are not cached, so a question created later is found
+    assert await cache.get_by_slug("five_sum") is None
+    assert await cache.get_by_slug("five_sum") is None
+    assert questions.reads == 3
+
+async def test_entries_expire_and_least_recently_used_are_evicted(questions):
+    cache = QuestionCache(max_entries=2, ttl=0)
+    first = questions.questions[0]
+    await cache.get(first.id)
+    await cache.get(first.id)
+    assert questions.reads == 2
+
+    cache = QuestionCache(max_entries=2, ttl=60)
+    for question in questions.questions:
+        await cache.get(question.id)
+
+    assert cache.stats()["entries"] == 2
+    await cache.get_by_slug("two_sum")
+    assert questions.reads == 2 + 4
+
+async def test_invalidation_drops_both_keys_and_in_flight_loads(questions):
+    cache = QuestionCache()
+    question = questions.questions[0]
+    await cache.get(question.id)
+
+    cache.invalidate(question.id, question.title_slug)
+    assert cache.stats()["entries"] == 0
+
+    # A load that started before an invalidation may be stale; don't keep it
+    load = asyncio.create_task(cache.get_by_slug("two_sum"))
+    await asyncio.sleep(0)
+    cache.invalidate(slug="two_sum")
+    assert await load is question
+    assert cache.stats()["entries"] == 0
+
+async def test_invalidation_keeps_in_flight_loads_of_other_questions(questions):
+    cache = QuestionCache()
+    first, second = questions.questions[:2]
+
+    load = asyncio.create_task(cache.get(second.id))
+    await asyncio.sleep(0)
+    cache.invalidate(first.id, first.title_slug)
+    await load
+
+    assert await cache.get_by_slug(second.title_slug) is second
+    assert questions.reads == 1
+
+    # A load by slug is discarded when its question is invalidated by id
+    load = asyncio.create_task(cache.get_by_slug(first.title_slug))
+    await asyncio.sleep(0)
+    cache.invalidate(first.id)
+    assert await load is first
+    assert cache.stats()["entries"] == 1
+
+async def test_counters_are_updated_in_place(questions):
+    cache = QuestionCache()
+    question = questions.questions[0]
+    question.likes, question.dislikes = 3, 0
+    await cache.get(question.id)
+
+    cache.add_to_counters(question.id, {"likes": 2, "dislikes": 1})
+
+    assert await cache.get(question.id) is question
+    assert (question.likes, question.dislikes) == (5, 1)
+    assert questions.reads == 1
@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from beanie import PydanticObjectId
+from app.models.question import Question
+from app.services.question_cache import question_cache
+from app.services.question_counters import QuestionCounters
+
+pytestmark = pytest.mark.asyncio
+
+class FakeQuestions:
+    """Counters of stored questions, updated like MongoDB would"""
+
+    def __init__(self, *question_ids):
+        self.counts = {question_id: {"likes": 0, "dislikes": 0} for question_id in question_ids}
+        self.writes = 0
+        self.fail_next = False
+
+    def _inc(self, query, update):
+        counts = self.counts.get(query["_id"])
+        for field, amount in update["$inc"].items():
+            counts[field] += amount
+        return counts
+
+    async def update_one(self, query, update):
+        self.writes += 1
+        matched = query["_id"] in self.counts
+        if matched:
+            self._inc(query, update)
+        return SimpleNamespace(matched_count=int(matched))
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("primary stepped down")
+        self.writes += 1
+        for operation in operations:
+            self._inc(operation._filter, operation._doc)
+
+@pytest.fixture
+def questions(monkeypatch):
+    questions = FakeQuestions(PydanticObjectId(), PydanticObjectId())
+    monkeypatch.setattr(Question, "get_motor_collection", classmethod(lambda cls: questions))
+
+    async def cached_question(question_id):
+        question_id = PydanticObjectId(question_id)
+        return SimpleNamespace(id=question_id) if question_id in questions.counts else None
+
+    monkeypatch.setattr(question_cache, "get", cached_question)
+    return questions
+
+async def test_clicks_are_atomic_increments(questions):
+    counters = QuestionCounters(write_behind=False)
+    question_id = next(iter(questions.counts))
+
+    await asyncio.gather(*(counters.increment(str(question_id), "likes") for _ in range(20)))
+
+    assert questions.counts[question_id]["likes"] == 20
+    assert not await counters.increment(str(PydanticObjectId()), "likes")
+    with pytest.raises(ValueError):
+        await counters.increment(str(question_id), "views")
+
+async def test_write_behind_flushes_one_bulk_write(questions):
+    counters = QuestionCounters(write_behind=True)
+    first, second = questions.counts
+
+    for _ in range(50):
+        await counters.increment(str(first), "likes")
+    await counters.increment(str(first), "dislikes")
+    await counters.increment(str(second), "likes")
+    assert not await counters.increment(str(PydanticObjectId()), "likes")
+    assert questions.writes == 0
+
+    await counters.flush()
+
+    assert questions.writes == 1
+    assert questions.counts[first] == {"likes": 50, "dislikes": 1}
+    assert questions.counts[second] == {"likes": 1, "dislikes": 0}
+
+async def test_failed_flush_keeps_increments_for_the_next_one(questions):
+    counters = QuestionCounters(write_behind=True, flush_interval=0.01)
+    question_id = next(iter(questions.counts))
+    questions.fail_next = True
+
+    counters.start()
+    await counters.increment(str(question_id), "likes")
+    await asyncio.sleep(0.015)
+    await counters.increment(str(question_id), "likes")
+    await counters.stop()
+
+    assert questions.counts[question_id]["likes"] == 2
+
+async def test_cached_question_keeps_its_entry_and_gets_the_counts(questions, monkeypatch):
+    applied = []
+    monkeypatch.setattr(question_cache, "add_to_counters", lambda question_id, fields: applied.append(fields))
+    monkeypatch.setattr(question_cache, "invalidate", lambda *args, **kwargs: pytest.fail("evicted"))
+    question_id = str(next(iter(questions.counts)))
+
+    await QuestionCounters(write_behind=False).increment(question_id, "likes")
+    counters = QuestionCounters(write_behind=True)
+    await counters.increment(question_id, "dislikes")
+    await counters.increment(question_id, "dislikes")
+    await counters.flush()
+
+    assert applied == [{"likes": 1}, {"dislikes": 2}]
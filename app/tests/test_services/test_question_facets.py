@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.models.question import Question
+from app.services.question_facets import QuestionFacetCache, facet_counts, facet_key, facet_pipeline
+
+pytestmark = pytest.mark.asyncio
+
+FACET_ROW = {
+    "total": [{"count": 3}],
+    "level": [{"_id": "easy", "count": 2}, {"_id": "medium", "count": 1}],
+    "topics": [{"_id": "array", "count": 3}, {"_id": "math", "count": 1}],
+    "companies": [{"_id": "Google", "count": 2}, {"_id": None, "count": 1}],
+}
+
+class FakeQuestions:
+    def __init__(self):
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+
+        async def to_list(length):
+            await asyncio.sleep(0.01)
+            return [FACET_ROW]
+
+        return SimpleNamespace(to_list=to_list)
+
+@pytest.fixture
+def questions(monkeypatch):
+    questions = FakeQuestions()
+    monkeypatch.setattr(Question, "get_motor_collection", classmethod(lambda cls: questions))
+    return questions
+
+async def test_one_facet_stage_counts_every_facet():
+    pipeline = facet_pipeline(facet_key("easy", ["math", "array"], None))
+
+    assert pipeline[0] == {"$match": {"topics": {"$all": ["array", "math"]}}}
+    facets = pipeline[1]["$facet"]
+    # Level counts ignore the level filter; the other facets apply it
+    assert facets["level"] == [{"$sortByCount": "$level"}]
+    assert facets["topics"][0] == {"$match": {"level": "easy"}}
+    assert facets["total"][0] == {"$match": {"level": "easy"}}
+
+    assert facet_counts(FACET_ROW) == {
+        "total": 3,
+        "level": {"easy": 2, "medium": 1},
+        "topics": {"array": 3, "math": 1},
+        "companies": {"Google": 2},
+    }
+    assert facet_counts({"total": [], "level": []})["total"] == 0
+
+async def test_counts_are_cached_per_normalized_filters(questions):
+    cache = QuestionFacetCache()
+
+    first, second = await asyncio.gather(
+        cache.counts(topics=["math", "array"]),
+        cache.counts(topics=["array", "math", "array"])
+    )
+    await cache.counts(topics=["array", "math"])
+
+    assert first is second
+    assert len(questions.pipelines) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    await cache.counts("easy", topics=["array", "math"])
+    assert len(questions.pipelines) == 2
+
+async def test_question_writes_invalidate_counts(questions):
+    cache = QuestionFacetCache()
+    await cache.counts()
+
+    cache.invalidate()
+    await cache.counts()
+    assert len(questions.pipelines) == 2
+
+    # Counts computed across an invalidation are returned, not kept
+    cache.invalidate()
+    load = asyncio.create_task(cache.counts())
+    await asyncio.sleep(0)
+    cache.invalidate()
+    await load
+    await cache.counts()
+    assert len(questions.pipelines) == 4
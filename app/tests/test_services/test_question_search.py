@@ -0,0 +1,116 @@
+import random
+import time
+from types import SimpleNamespace
+import pytest
+from beanie import PydanticObjectId
+from app.models.question import Question
+from app.services.question_search import QuestionSearchIndex
+
+pytestmark = pytest.mark.asyncio
+
+def make_question(title, content="", topics=(), companies=(), level="easy"):
+    return SimpleNamespace(
+        id=PydanticObjectId(),
+        title=title,
+        title_slug="_".join(title.lower().split()),
+        level=level,
+        topics=list(topics),
+        companies=list(companies),
+        content=content
+    )
+
+@pytest.fixture
+def index():
+    index = QuestionSearchIndex()
+    for question in [
+        make_question("Two Sum", "<p>Given an array of integers, return indices of the two numbers.</p>", ["array", "hash-table"], ["Google"]),
+        make_question("Climbing Stairs", "Count distinct ways to climb; classic dynamic programming.", ["dynamic-programming"], ["Amazon"]),
+        make_question("Longest Increasing Subsequence", "Use dynamic programming or patience sorting on the array.", ["dynamic-programming", "binary-search"], level="medium"),
+    ]:
+        index.upsert(question)
+    return index
+
+async def test_results_are_ranked_by_relevance(index):
+    hits = index.search("array")
+
+    assert [hit["title"] for hit in hits] == ["Two Sum", "Longest Increasing Subsequence"]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert index.search("google")[0]["title"] == "Two Sum"
+    assert index.search("the of") == []
+
+async def test_words_match_as_prefixes(index):
+    titles = {hit["title"] for hit in index.search("dynam")}
+
+    assert titles == {"Climbing Stairs", "Longest Increasing Subsequence"}
+    # An exact word outranks a word it is only a prefix of
+    exact = make_question("Sum", "sum")
+    index.upsert(exact)
+    assert index.search("sum")[0]["title"] == "Sum"
+
+async def test_hits_carry_escaped_highlighted_snippets(index):
+    hit = index.search("indices")[0]
+
+    assert hit["highlights"]["title"] == "Two Sum"
+    assert "<mark>indices</mark>" in hit["highlights"]["content"]
+    assert "<p>" not in hit["highlights"]["content"]
+
+    index.upsert(make_question("Compare <b> tags", "x " * 200 + "compare a < b " + "y " * 200))
+    hit = index.search("compar")[0]
+    assert hit["highlights"]["title"] == "<mark>Compare</mark> &lt;b&gt; tags"
+    assert hit["highlights"]["content"].startswith("…")
+    assert "<mark>compare</mark> a &lt; b" in hit["highlights"]["content"]
+
+async def test_writes_update_the_index_incrementally(index):
+    question = index.search("stairs")[0]
+    updated = make_question("Climbing Ladders", topics=["math"])
+    updated.id = PydanticObjectId(question["_id"])
+
+    index.upsert(updated)
+    assert index.search("stairs") == []
+    assert index.search("ladders")[0]["_id"] == question["_id"]
+
+    index.remove(updated.id)
+    assert index.search("ladders") == []
+    assert "ladders" not in index._terms
+    assert index.stats()["questions"] == 2
+
+async def test_rebuild_keeps_writes_made_while_it_runs(monkeypatch):
+    index = QuestionSearchIndex()
+    stored = make_question("Merge Intervals", topics=["sorting"])
+    late = make_question("Meeting Rooms", topics=["sorting"])
+
+    class FakeCursor:
+        def __aiter__(self):
+            return self.documents()
+
+        async def documents(self):
+            yield {"_id": stored.id, **{k: v for k, v in vars(stored).items() if k != "id"}}
+            # Created by this process while the rebuild reads
+            index.upsert(late)
+
+    monkeypatch.setattr(Question, "get_motor_collection", classmethod(
+        lambda cls: SimpleNamespace(find=lambda query, projection: FakeCursor())
+    ))
+
+    await index.ensure_current()
+
+    assert {hit["title"] for hit in index.search("sorting")} == {"Merge Intervals", "Meeting Rooms"}
+
+async def test_searching_a_large_catalog_is_fast():
+    rng = random.Random(7)
+    words = [f"word{i}" for i in range(3000)] + ["graph", "tree", "array", "string", "dynamic", "greedy"]
+    index = QuestionSearchIndex()
+    for i in range(10000):
+        index.upsert(make_question(
+            " ".join(rng.choices(words, k=4)),
+            " ".join(rng.choices(words, k=120)),
+            rng.choices(["graph", "tree", "array", "string"], k=2),
+            rng.choices(["google", "amazon", "meta"], k=1)
+        ))
+
+    start = time.perf_counter()
+    for query in ("graph", "dyn", "word12 tree", "greedy string", "word2999"):
+        assert index.search(query)
+    per_query = (time.perf_counter() - start) / 5
+
+    assert per_query < 0.05
@@ -0,0 +1,175 @@
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from app.core.config import settings
+from app.middleware import rate_limit
+from app.middleware.rate_limit import RateLimiter, SlidingWindowCounter
+from app.middleware.rate_limit_store import (
+    MemoryRateLimitStore,
+    MongoRateLimitStore,
+    RateLimitStore,
+    SharedRateLimiter
+)
+from app.models.rate_limit_bucket import RateLimitBucket
+
+pytestmark = pytest.mark.asyncio
+
+async def test_requests_over_the_limit_are_refused():
+    counter = SlidingWindowCounter(60.0)
+
+    allowed = [counter.acquire("a", 600.0 + i, 5)[0] for i in range(7)]
+
+    assert allowed == [True] * 5 + [False] * 2
+    assert counter.acquire("b", 606.0, 5)[0]
+
+async def test_previous_window_counts_by_its_overlap():
+    counter = SlidingWindowCounter(60.0)
+    for _ in range(10):
+        counter.acquire("a", 610.0, 100)
+
+    # 45s into the next window, a quarter of the previous one still counts
+    allowed, estimate = counter.acquire("a", 705.0, 100)
+    assert allowed
+    assert estimate == pytest.approx(2.5)
+
+    # A window later than that, nothing carries over
+    assert counter.acquire("a", 900.0, 100)[1] == 0
+
+async def test_idle_and_least_recent_clients_are_evicted():
+    counter = SlidingWindowCounter(60.0, max_clients=3)
+    for client_id in ("a", "b", "c"):
+        counter.acquire(client_id, 600.0, 10)
+    counter.acquire("a", 601.0, 10)
+
+    counter.acquire("d", 602.0, 10)
+    assert list(counter.clients) == ["c", "a", "d"]
+
+    # Two windows on, the others have nothing left to count
+    counter.acquire("e", 730.0, 10)
+    assert list(counter.clients) == ["e"]
+
+async def test_middleware_answers_429_with_headers(monkeypatch):
+    # Mid-window, so the requests cannot straddle a window boundary
+    monkeypatch.setattr(rate_limit.time, "time", lambda: 630.0)
+    app = FastAPI()
+    app.add_middleware(RateLimiter, requests_per_minute=2, burst_limit=100)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        responses = [await client.get("/ping") for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert [r.headers["X-RateLimit-Remaining"] for r in responses] == ["1", "0", "0"]
+    assert responses[2].json() == {"detail": "Rate limit exceeded"}
+
+async def test_judge0_callbacks_are_not_limited():
+    app = FastAPI()
+    app.add_middleware(RateLimiter, requests_per_minute=2, burst_limit=100)
+
+    @app.put(f"{settings.API_V1_STR}/code/judge0/callback")
+    async def callback():
+        return {"ok": True}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        responses = [await client.put(f"{settings.API_V1_STR}/code/judge0/callback") for _ in range(5)]
+
+    assert [r.status_code for r in responses] == [200] * 5
+
+async def test_store_without_add_cannot_be_created():
+    with pytest.raises(TypeError):
+        RateLimitStore(60.0)
+
+class CountingStore(MemoryRateLimitStore):
+    """In-process store that records round trips and can be made to fail"""
+
+    def __init__(self):
+        super().__init__(60.0)
+        self.calls = 0
+        self.down = False
+
+    async def add(self, key, window, amount, with_previous=False):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("no primary")
+        return await super().add(key, window, amount, with_previous)
+
+async def test_processes_sharing_a_store_share_the_limit():
+    store = CountingStore()
+    processes = [SharedRateLimiter(store, lease_size=5) for _ in range(3)]
+
+    allowed = [
+        (await processes[i % 3].acquire("a", 630.0, 30))[0]
+        for i in range(45)
+    ]
+
+    assert sum(allowed) == 30
+    assert allowed[:30] == [True] * 30
+    assert store.counts[("a", 10)] == 30
+
+async def test_leases_spare_the_store_round_trips():
+    store = CountingStore()
+    limiter = SharedRateLimiter(store, lease_size=10)
+
+    for _ in range(100):
+        assert (await limiter.acquire("a", 630.0, 1000))[0]
+
+    assert store.calls == 10
+
+    # Refused clients are refused locally until the block ends
+    for _ in range(1000):
+        await limiter.acquire("b", 640.0, 5)
+    calls = store.calls
+    for _ in range(50):
+        assert not (await limiter.acquire("b", 640.5, 5))[0]
+    assert store.calls == calls
+
+async def test_previous_window_is_read_from_the_store():
+    store = MemoryRateLimitStore(60.0)
+    other, limiter = SharedRateLimiter(store, lease_size=1), SharedRateLimiter(store, lease_size=1)
+    for _ in range(10):
+        await other.acquire("a", 610.0, 100)
+
+    # 45s into the next window, a quarter of the other process's count still counts
+    allowed, estimate = await limiter.acquire("a", 705.0, 100)
+    assert allowed
+    assert estimate == pytest.approx(2.5)
+
+async def test_store_failure_falls_back_to_the_local_limit():
+    store = CountingStore()
+    store.down = True
+    limiter = SharedRateLimiter(store, lease_size=5)
+
+    allowed = [(await limiter.acquire("a", 630.0, 3))[0] for _ in range(5)]
+
+    assert allowed == [True] * 3 + [False] * 2
+
+class FakeBuckets:
+    """Rate limit buckets, updated like MongoDB would"""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def find_one_and_update(self, query, update, upsert, return_document):
+        document = self.documents.setdefault(query["_id"], {"_id": query["_id"], "requests": 0})
+        for field, value in update["$setOnInsert"].items():
+            document.setdefault(field, value)
+        document["requests"] += update["$inc"]["requests"]
+        return dict(document)
+
+    async def find_one(self, query, projection):
+        return self.documents.get(query["_id"])
+
+async def test_mongo_store_increments_expiring_buckets(monkeypatch):
+    buckets = FakeBuckets()
+    monkeypatch.setattr(RateLimitBucket, "get_motor_collection", classmethod(lambda cls: buckets))
+    store = MongoRateLimitStore(60.0)
+
+    await store.add("a", 10, 4)
+    assert await store.add("a", 11, 3, with_previous=True) == (4, 3)
+    assert await store.add("a", 11, -1) == (0, 2)
+
+    assert buckets.documents["a:11"]["expires_at"] == datetime.utcfromtimestamp(780)
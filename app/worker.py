@@ -0,0 +1,51 @@
+"""Judge worker process.
+
+Run any number of these, on any node that can reach MongoDB and the
+execution backend:
+
+    python -m app.worker
+
+Set ``JUDGE_EMBEDDED_WORKER=False`` on the API once dedicated workers run,
+so that the API only enqueues. Workers serve no HTTP, so they poll Judge0
+for results even when the API receives Judge0 callbacks.
+"""
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.core.database import init_db
+from app.services.execution import get_execution_backend
+from app.services.execution.checker import shutdown_checker_pool
+from app.services.judge0_client import judge0_client
+from app.services.judge_worker import JudgeWorker
+
+logging.basicConfig(
+    level=logging.INFO if not settings.DEBUG else logging.DEBUG,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+async def main():
+    await init_db()
+    # Judge0 callbacks reach an API process, not this one, so poll instead
+    judge0_client.callback_url = ""
+    await judge0_client.start()
+    await get_execution_backend().start()
+
+    worker = JudgeWorker()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, lambda: asyncio.create_task(worker.stop()))
+
+    try:
+        await worker.run()
+    finally:
+        await worker.stop()
+        await get_execution_backend().close()
+        await judge0_client.close()
+        shutdown_checker_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""Per-request cost and memory of the rate limiter as distinct clients grow.
+
+Usage: python -m scripts.bench_rate_limiter [requests]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from app.middleware.rate_limit import SlidingWindowCounter
+
+CLIENT_COUNTS = [1_000, 10_000, 100_000]
+
+
+def bench(clients: int, requests: int):
+    counter = SlidingWindowCounter(60.0, max_clients=clients)
+    rng = random.Random(clients)
+    client_ids = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(clients)]
+
+    # Warm up: every client seen once, as in steady state
+    tracemalloc.start()
+    now = 1_000_000.0
+    for client_id in client_ids:
+        counter.acquire(client_id, now, 60)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    picks = [rng.choice(client_ids) for _ in range(requests)]
+    start = time.perf_counter()
+    for i, client_id in enumerate(picks):
+        # Requests spread over two minutes, so windows roll and idle clients expire
+        counter.acquire(client_id, now + i * 120 / requests, 60)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / requests * 1e9, memory / clients, len(counter.clients)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    print(f"{'clients':>10} {'ns/request':>12} {'bytes/client':>14} {'tracked':>10}")
+    for clients in CLIENT_COUNTS:
+        per_request, per_client, tracked = bench(clients, requests)
+        print(f"{clients:>10} {per_request:>12.0f} {per_client:>14.0f} {tracked:>10}")
+
+
+if __name__ == "__main__":
+    main()